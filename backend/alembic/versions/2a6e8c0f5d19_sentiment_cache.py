@@ -0,0 +1,34 @@
+"""sentiment cache
+
+Revision ID: 2a6e8c0f5d19
+Revises: 9f3c6b1d8e24
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2a6e8c0f5d19'
+down_revision: Union[str, None] = '9f3c6b1d8e24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('sentiment_cache',
+    sa.Column('key', sa.String(length=64), nullable=False),
+    sa.Column('backend_version', sa.String(length=255), nullable=False),
+    sa.Column('result', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+    op.create_index('ix_sentiment_cache_created', 'sentiment_cache', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sentiment_cache_created', table_name='sentiment_cache')
+    op.drop_table('sentiment_cache')
@@ -0,0 +1,47 @@
+"""post engagement counters
+
+Revision ID: 3b9d2f6c1a47
+Revises: fac7cf36dd19
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9d2f6c1a47'
+down_revision: Union[str, None] = 'fac7cf36dd19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+REACTION_TYPES = ('like', 'love', 'haha', 'wow', 'sad', 'angry')
+
+
+def upgrade() -> None:
+    op.add_column('posts', sa.Column('likes_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('posts', sa.Column('comments_count', sa.Integer(), server_default='0', nullable=False))
+    for reaction_type in REACTION_TYPES:
+        op.add_column('posts', sa.Column(f'{reaction_type}_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from existing rows
+    op.execute(
+        "UPDATE posts SET "
+        "likes_count = (SELECT COUNT(*) FROM reactions r WHERE r.post_id = posts.id), "
+        "comments_count = (SELECT COUNT(*) FROM comments c WHERE c.post_id = posts.id)"
+    )
+    for reaction_type in REACTION_TYPES:
+        op.execute(
+            f"UPDATE posts SET {reaction_type}_count = ("
+            f"SELECT COUNT(*) FROM reactions r "
+            f"WHERE r.post_id = posts.id AND r.reaction_type = '{reaction_type}')"
+        )
+
+
+def downgrade() -> None:
+    for reaction_type in reversed(REACTION_TYPES):
+        op.drop_column('posts', f'{reaction_type}_count')
+    op.drop_column('posts', 'comments_count')
+    op.drop_column('posts', 'likes_count')
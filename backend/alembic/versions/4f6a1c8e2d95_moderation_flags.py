@@ -0,0 +1,59 @@
+"""moderation flags
+
+Revision ID: 4f6a1c8e2d95
+Revises: e3b8d4f1a6c2
+Create Date: 2026-10-18 17:00:00.000000
+
+Existing content is flagged the next time it is scored.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f6a1c8e2d95'
+down_revision: Union[str, None] = 'e3b8d4f1a6c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('moderation_flags',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('target_type', sa.String(length=20), nullable=False),
+    sa.Column('post_id', sa.BigInteger(), nullable=True),
+    sa.Column('comment_id', sa.BigInteger(), nullable=True),
+    sa.Column('author_id', sa.BigInteger(), nullable=False),
+    sa.Column('status', sa.String(length=20), server_default='open', nullable=False),
+    sa.Column('sentiment_label', sa.String(length=20), nullable=False),
+    sa.Column('confidence', sa.Float(), nullable=False),
+    sa.Column('toxicity', sa.String(length=20), nullable=False),
+    sa.Column('toxicity_score', sa.Float(), nullable=False),
+    sa.Column('flag_count', sa.Integer(), server_default='1', nullable=False),
+    sa.Column('moderator_id', sa.BigInteger(), nullable=True),
+    sa.Column('action', sa.String(length=50), nullable=True),
+    sa.Column('reason', sa.Text(), nullable=True),
+    sa.Column('resolved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.CheckConstraint('(post_id IS NOT NULL AND comment_id IS NULL) OR (post_id IS NULL AND comment_id IS NOT NULL)', name='ck_moderation_flags_single_target'),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['comment_id'], ['comments.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['author_id'], ['users.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['moderator_id'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('post_id'),
+    sa.UniqueConstraint('comment_id')
+    )
+    op.create_index(op.f('ix_moderation_flags_id'), 'moderation_flags', ['id'], unique=False)
+    op.create_index('ix_moderation_flags_open', 'moderation_flags', ['created_at', 'id'], unique=False, postgresql_where=sa.text("status = 'open'"))
+    op.create_index('ix_moderation_flags_open_type', 'moderation_flags', ['target_type', 'created_at', 'id'], unique=False, postgresql_where=sa.text("status = 'open'"))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_moderation_flags_open_type', table_name='moderation_flags')
+    op.drop_index('ix_moderation_flags_open', table_name='moderation_flags')
+    op.drop_index(op.f('ix_moderation_flags_id'), table_name='moderation_flags')
+    op.drop_table('moderation_flags')
@@ -0,0 +1,63 @@
+"""home timelines
+
+Revision ID: 5d8a2e7f41b3
+Revises: c4a7e913d2f0
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d8a2e7f41b3'
+down_revision: Union[str, None] = 'c4a7e913d2f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('user_feeds',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('user_id', sa.BigInteger(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id')
+    )
+    op.create_index(op.f('ix_user_feeds_id'), 'user_feeds', ['id'], unique=False)
+
+    op.create_table('user_feed_posts',
+    sa.Column('feed_id', sa.BigInteger(), nullable=False),
+    sa.Column('post_id', sa.BigInteger(), nullable=False),
+    sa.Column('author_id', sa.BigInteger(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['feed_id'], ['user_feeds.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('feed_id', 'post_id')
+    )
+    op.create_index('ix_user_feed_posts_feed_created', 'user_feed_posts', ['feed_id', 'created_at', 'post_id'], unique=False)
+    op.create_index('ix_user_feed_posts_feed_author', 'user_feed_posts', ['feed_id', 'author_id'], unique=False)
+
+    op.create_index('ix_follows_following_follower', 'follows', ['following_id', 'follower_id'], unique=False)
+
+    # The profile counters decide which authors are fanned out;
+    # they were never maintained, so recompute them from `follows`.
+    op.execute(
+        "UPDATE profiles SET "
+        "followers_count = (SELECT COUNT(*) FROM follows WHERE follows.following_id = profiles.user_id), "
+        "following_count = (SELECT COUNT(*) FROM follows WHERE follows.follower_id = profiles.user_id)"
+    )
+
+    # Timelines are built lazily on a user's first feed read.
+
+
+def downgrade() -> None:
+    op.drop_index('ix_follows_following_follower', table_name='follows')
+    op.drop_index('ix_user_feed_posts_feed_author', table_name='user_feed_posts')
+    op.drop_index('ix_user_feed_posts_feed_created', table_name='user_feed_posts')
+    op.drop_table('user_feed_posts')
+    op.drop_index(op.f('ix_user_feeds_id'), table_name='user_feeds')
+    op.drop_table('user_feeds')
@@ -0,0 +1,56 @@
+"""daily rollups
+
+Revision ID: 7c2e5a9b3f60
+Revises: 2a6e8c0f5d19
+Create Date: 2026-10-18 15:00:00.000000
+
+Populate existing history afterwards with `python backfill_rollups.py`.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e5a9b3f60'
+down_revision: Union[str, None] = '2a6e8c0f5d19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _counter(name: str) -> sa.Column:
+    return sa.Column(name, sa.Integer(), server_default='0', nullable=False)
+
+
+def upgrade() -> None:
+    op.create_table('daily_user_metrics',
+    sa.Column('user_id', sa.BigInteger(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    _counter('posts'),
+    _counter('comments'),
+    _counter('reactions_received'),
+    _counter('comments_received'),
+    _counter('positive_posts'),
+    _counter('negative_posts'),
+    _counter('neutral_posts'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'day')
+    )
+    op.create_table('daily_metrics',
+    sa.Column('day', sa.Date(), nullable=False),
+    _counter('posts'),
+    _counter('comments'),
+    _counter('reactions'),
+    _counter('new_users'),
+    _counter('positive'),
+    _counter('negative'),
+    _counter('neutral'),
+    sa.PrimaryKeyConstraint('day')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('daily_metrics')
+    op.drop_table('daily_user_metrics')
@@ -0,0 +1,48 @@
+"""trending posts
+
+Revision ID: 8e41c07d5b2a
+Revises: 3b9d2f6c1a47
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e41c07d5b2a'
+down_revision: Union[str, None] = '3b9d2f6c1a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('trending_posts',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('post_id', sa.BigInteger(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('scored_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=True),
+    sa.Column('date', sa.Date(), nullable=True),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('post_id')
+    )
+    op.create_index(op.f('ix_trending_posts_id'), 'trending_posts', ['id'], unique=False)
+    op.create_index('ix_trending_posts_rank', 'trending_posts', ['rank'], unique=False)
+
+    # Seed from the engagement counters as if all of it happened when the
+    # post was created; the first refresh decays and prunes old posts.
+    op.execute(
+        "INSERT INTO trending_posts (post_id, score, scored_at) "
+        "SELECT id, likes_count + 2 * comments_count, created_at FROM posts "
+        "WHERE likes_count + comments_count > 0"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_trending_posts_rank', table_name='trending_posts')
+    op.drop_index(op.f('ix_trending_posts_id'), table_name='trending_posts')
+    op.drop_table('trending_posts')
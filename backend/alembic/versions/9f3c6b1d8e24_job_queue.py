@@ -0,0 +1,48 @@
+"""job queue
+
+Revision ID: 9f3c6b1d8e24
+Revises: 5d8a2e7f41b3
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f3c6b1d8e24'
+down_revision: Union[str, None] = '5d8a2e7f41b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('job_queue',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('job_type', sa.String(length=100), nullable=False),
+    sa.Column('target_type', sa.String(length=100), nullable=False),
+    sa.Column('status', sa.String(length=50), server_default='pending', nullable=False),
+    sa.Column('post_id', sa.BigInteger(), nullable=True),
+    sa.Column('comment_id', sa.BigInteger(), nullable=True),
+    sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.CheckConstraint('(post_id IS NOT NULL AND comment_id IS NULL) OR (post_id IS NULL AND comment_id IS NOT NULL)', name='ck_job_queue_single_target'),
+    sa.ForeignKeyConstraint(['comment_id'], ['comments.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_job_queue_id'), 'job_queue', ['id'], unique=False)
+    op.create_index('ix_job_queue_status_id', 'job_queue', ['status', 'id'], unique=False)
+    op.create_index('ix_job_queue_finished', 'job_queue', ['finished_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_job_queue_finished', table_name='job_queue')
+    op.drop_index('ix_job_queue_status_id', table_name='job_queue')
+    op.drop_index(op.f('ix_job_queue_id'), table_name='job_queue')
+    op.drop_table('job_queue')
@@ -0,0 +1,68 @@
+"""keep moderation flags
+
+Revision ID: a8d3f5c2e7b9
+Revises: f2c9a4e7b1d3
+Create Date: 2026-10-19 10:00:00.000000
+
+Flags are no longer deleted with their post or comment: the foreign
+keys are set to NULL instead and target_id keeps what was flagged.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d3f5c2e7b9'
+down_revision: Union[str, None] = 'f2c9a4e7b1d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('moderation_flags', sa.Column('target_id', sa.BigInteger(), nullable=True))
+    op.execute('UPDATE moderation_flags SET target_id = COALESCE(post_id, comment_id)')
+    op.alter_column('moderation_flags', 'target_id', nullable=False)
+
+    op.drop_constraint('ck_moderation_flags_single_target', 'moderation_flags', type_='check')
+    op.create_check_constraint(
+        'ck_moderation_flags_single_target', 'moderation_flags',
+        'post_id IS NULL OR comment_id IS NULL'
+    )
+
+    op.drop_constraint('moderation_flags_post_id_fkey', 'moderation_flags', type_='foreignkey')
+    op.drop_constraint('moderation_flags_comment_id_fkey', 'moderation_flags', type_='foreignkey')
+    op.create_foreign_key(
+        'moderation_flags_post_id_fkey', 'moderation_flags', 'posts',
+        ['post_id'], ['id'], ondelete='SET NULL'
+    )
+    op.create_foreign_key(
+        'moderation_flags_comment_id_fkey', 'moderation_flags', 'comments',
+        ['comment_id'], ['id'], ondelete='SET NULL'
+    )
+
+
+def downgrade() -> None:
+    # Flags whose content is gone cannot point at it again
+    op.execute('DELETE FROM moderation_flags WHERE post_id IS NULL AND comment_id IS NULL')
+
+    op.drop_constraint('moderation_flags_comment_id_fkey', 'moderation_flags', type_='foreignkey')
+    op.drop_constraint('moderation_flags_post_id_fkey', 'moderation_flags', type_='foreignkey')
+    op.create_foreign_key(
+        'moderation_flags_comment_id_fkey', 'moderation_flags', 'comments',
+        ['comment_id'], ['id'], ondelete='CASCADE'
+    )
+    op.create_foreign_key(
+        'moderation_flags_post_id_fkey', 'moderation_flags', 'posts',
+        ['post_id'], ['id'], ondelete='CASCADE'
+    )
+
+    op.drop_constraint('ck_moderation_flags_single_target', 'moderation_flags', type_='check')
+    op.create_check_constraint(
+        'ck_moderation_flags_single_target', 'moderation_flags',
+        '(post_id IS NOT NULL AND comment_id IS NULL) OR (post_id IS NULL AND comment_id IS NOT NULL)'
+    )
+
+    op.drop_column('moderation_flags', 'target_id')
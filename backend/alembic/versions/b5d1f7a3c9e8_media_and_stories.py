@@ -0,0 +1,58 @@
+"""media and stories
+
+Revision ID: b5d1f7a3c9e8
+Revises: 4f6a1c8e2d95
+Create Date: 2026-10-18 19:00:00.000000
+
+Current-schema tables for standalone media uploads and stories.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d1f7a3c9e8'
+down_revision: Union[str, None] = '4f6a1c8e2d95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('media',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('user_id', sa.BigInteger(), nullable=False),
+    sa.Column('file_url', sa.String(length=500), nullable=False),
+    sa.Column('file_type', sa.String(length=20), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_media_id'), 'media', ['id'], unique=False)
+    op.create_index(op.f('ix_media_user_id'), 'media', ['user_id'], unique=False)
+
+    op.create_table('stories',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('user_id', sa.BigInteger(), nullable=False),
+    sa.Column('media_url', sa.String(length=500), nullable=False),
+    sa.Column('media_type', sa.String(length=20), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_stories_id'), 'stories', ['id'], unique=False)
+    op.create_index('ix_stories_user_expires', 'stories', ['user_id', 'expires_at'], unique=False)
+    op.create_index('ix_stories_expires', 'stories', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_stories_expires', table_name='stories')
+    op.drop_index('ix_stories_user_expires', table_name='stories')
+    op.drop_index(op.f('ix_stories_id'), table_name='stories')
+    op.drop_table('stories')
+    op.drop_index(op.f('ix_media_user_id'), table_name='media')
+    op.drop_index(op.f('ix_media_id'), table_name='media')
+    op.drop_table('media')
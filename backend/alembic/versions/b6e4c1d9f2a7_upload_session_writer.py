@@ -0,0 +1,29 @@
+"""upload session writer
+
+Revision ID: b6e4c1d9f2a7
+Revises: a8d3f5c2e7b9
+Create Date: 2026-10-19 11:00:00.000000
+
+A chunk PUT claims the session's offset before writing so concurrent
+writers at the same offset can't interleave in the part file.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e4c1d9f2a7'
+down_revision: Union[str, None] = 'a8d3f5c2e7b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('upload_sessions', sa.Column('writer', sa.String(length=32), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('upload_sessions', 'writer')
@@ -0,0 +1,34 @@
+"""keyset pagination indexes
+
+Revision ID: c4a7e913d2f0
+Revises: 8e41c07d5b2a
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a7e913d2f0'
+down_revision: Union[str, None] = '8e41c07d5b2a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_posts_visibility_created', 'posts', ['visibility', 'created_at', 'id'], unique=False)
+    op.create_index('ix_follows_follower_created', 'follows', ['follower_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_follows_following_created', 'follows', ['following_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_notifications_recipient_created', 'notifications', ['recipient_id', 'created_at', 'id'], unique=False)
+    op.create_index('idx_bookmarks_user_created', 'bookmarks', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_bookmarks_user_created', table_name='bookmarks')
+    op.drop_index('ix_notifications_recipient_created', table_name='notifications')
+    op.drop_index('ix_follows_following_created', table_name='follows')
+    op.drop_index('ix_follows_follower_created', table_name='follows')
+    op.drop_index('ix_posts_visibility_created', table_name='posts')
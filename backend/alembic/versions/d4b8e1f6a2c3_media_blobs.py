@@ -0,0 +1,49 @@
+"""media blobs
+
+Revision ID: d4b8e1f6a2c3
+Revises: c7e2a9d4f1b6
+Create Date: 2026-10-18 23:00:00.000000
+
+Content-addressed media store with reference counts.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4b8e1f6a2c3'
+down_revision: Union[str, None] = 'c7e2a9d4f1b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('media_blobs',
+    sa.Column('file_url', sa.String(length=500), nullable=False),
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('file_type', sa.String(length=20), nullable=False),
+    sa.Column('size', sa.BigInteger(), nullable=False),
+    sa.Column('ref_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('uploads', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('file_url')
+    )
+    op.create_index(op.f('ix_media_blobs_sha256'), 'media_blobs', ['sha256'], unique=False)
+    op.create_index('ix_media_blobs_refs_updated', 'media_blobs', ['ref_count', 'updated_at'], unique=False)
+    # Reference lookups by URL during reconciliation
+    op.create_index('ix_post_media_file_url', 'post_media', ['file_url'], unique=False)
+    op.create_index('ix_media_file_url', 'media', ['file_url'], unique=False)
+    op.create_index('ix_stories_media_url', 'stories', ['media_url'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_stories_media_url', table_name='stories')
+    op.drop_index('ix_media_file_url', table_name='media')
+    op.drop_index('ix_post_media_file_url', table_name='post_media')
+    op.drop_index('ix_media_blobs_refs_updated', table_name='media_blobs')
+    op.drop_index(op.f('ix_media_blobs_sha256'), table_name='media_blobs')
+    op.drop_table('media_blobs')
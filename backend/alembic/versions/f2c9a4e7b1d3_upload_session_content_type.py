@@ -0,0 +1,29 @@
+"""upload session content type
+
+Revision ID: f2c9a4e7b1d3
+Revises: d4b8e1f6a2c3
+Create Date: 2026-10-18 23:30:00.000000
+
+Completed resumable uploads are stored under the extension of their
+validated content type instead of the client's filename.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c9a4e7b1d3'
+down_revision: Union[str, None] = 'd4b8e1f6a2c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('upload_sessions', sa.Column('content_type', sa.String(length=100), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('upload_sessions', 'content_type')
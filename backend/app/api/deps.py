@@ -1,13 +1,17 @@
 # app/api/deps.py
 
-from typing import Optional
-from fastapi import Depends, HTTPException, status
+import hashlib
+import hmac
+import time
+from typing import Optional, Tuple
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from jose import JWTError
 
-from app.database import get_db
-from app.models import User
+from app.config import settings
+from app.database import async_read_session, get_async_db, get_db, read_session
+from app.core.identity import UserSnapshot, load_identity, load_identity_async
 from app.core.jwt import decode_token
 
 security = HTTPBearer(auto_error=False)
@@ -16,11 +20,13 @@ security = HTTPBearer(auto_error=False)
 # =========================================================
 # Core JWT User Resolver
 # =========================================================
+# Resolvers return a cached UserSnapshot (see app.core.identity), not a
+# session-bound User: load the row explicitly before modifying it.
 
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db),
-) -> User:
+) -> UserSnapshot:
     if credentials is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -28,36 +34,28 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    try:
-        token = credentials.credentials
-        payload = decode_token(token)
-
-        if not payload:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token",
-            )
+    payload = decode_token(credentials.credentials)
 
-        if payload.get("type") != "access":
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token type",
-            )
+    if not payload:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token",
+        )
 
-        user_id = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token payload",
-            )
+    if payload.get("type") != "access":
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token type",
+        )
 
-    except JWTError:
+    user_id = payload.get("sub")
+    if user_id is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token decode error",
+            detail="Invalid token payload",
         )
 
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    user = load_identity(db, int(user_id), payload.get("iat"))
 
     if not user:
         raise HTTPException(
@@ -71,49 +69,68 @@ def get_current_user(
 # =========================================================
 # Required Auth (Most Endpoints)
 # =========================================================
-def get_current_active_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
-) -> User:
+# Each resolver has an async twin on get_async_db for `async def`
+# endpoints, so those never wait on the sync threadpool.
+
+def _access_claims(credentials: Optional[HTTPAuthorizationCredentials]) -> Tuple[int, Optional[int]]:
+    """(user id, iat) of a valid access token, else 401"""
     if credentials is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Not authenticated",
         )
 
-    try:
-        payload = decode_token(credentials.credentials)
-        user_id = payload.get("sub")
+    # decode_token returns None for anything it can't verify
+    payload = decode_token(credentials.credentials)
 
-        if user_id is None:
-            raise HTTPException(status_code=401, detail="Invalid token")
+    if not payload or payload.get("type") != "access":
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    user_id = payload.get("sub")
 
-    except JWTError:
+    if user_id is None:
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    user = db.query(User).filter(User.id == user_id).first()
+    return int(user_id), payload.get("iat")
 
+
+def _require_active(user: Optional[UserSnapshot]) -> UserSnapshot:
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
+    if not user.is_active:
+        raise HTTPException(status_code=403, detail="Inactive user")
+
     return user
 
 
+def get_current_active_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db),
+) -> UserSnapshot:
+    user_id, issued_at = _access_claims(credentials)
+    return _require_active(load_identity(db, user_id, issued_at))
+
+
+async def get_current_active_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db),
+) -> UserSnapshot:
+    user_id, issued_at = _access_claims(credentials)
+    return _require_active(await load_identity_async(db, user_id, issued_at))
+
+
 
 # =========================================================
 # Optional Auth (Feed, Trending, Public Pages)
 # =========================================================
 
-def get_optional_user(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: Session = Depends(get_db),
-) -> Optional[User]:
+def _optional_claims(credentials: Optional[HTTPAuthorizationCredentials]) -> Optional[Tuple[int, Optional[int]]]:
     if credentials is None:
         return None
 
     try:
-        token = credentials.credentials
-        payload = decode_token(token)
+        payload = decode_token(credentials.credentials)
 
         if not payload or payload.get("type") != "access":
             return None
@@ -122,7 +139,109 @@ def get_optional_user(
         if user_id is None:
             return None
 
-        return db.query(User).filter(User.id == int(user_id)).first()
+        return int(user_id), payload.get("iat")
+
+    except Exception:
+        return None
+
+
+def get_optional_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    db: Session = Depends(get_db),
+) -> Optional[UserSnapshot]:
+    claims = _optional_claims(credentials)
+    if claims is None:
+        return None
+
+    try:
+        return load_identity(db, *claims)
+    except Exception:
+        return None
+
+
+async def get_optional_user_async(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    db: AsyncSession = Depends(get_async_db),
+) -> Optional[UserSnapshot]:
+    claims = _optional_claims(credentials)
+    if claims is None:
+        return None
 
+    try:
+        return await load_identity_async(db, *claims)
     except Exception:
         return None
+
+
+# =========================================================
+# Read Sessions (GET endpoints)
+# =========================================================
+# After a successful mutation the write-tracking middleware in app.main
+# hands the user a signed "<user id>:<unix time>" marker, as the
+# LAST_WRITE_COOKIE cookie and the LAST_WRITE_HEADER response header.
+# Sent back (either way), it routes the user's reads to the primary on
+# any worker for REPLICA_STICKY_SECONDS.
+
+LAST_WRITE_COOKIE = "last_write_at"
+LAST_WRITE_HEADER = "X-Last-Write-At"
+
+
+def request_writer(request: Request) -> Optional[int]:
+    """User id behind the request's bearer token, if valid"""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+
+    claims = _optional_claims(HTTPAuthorizationCredentials(scheme=scheme, credentials=token))
+    return claims[0] if claims else None
+
+
+def _marker_signature(value: str) -> str:
+    return hmac.new(
+        settings.SECRET_KEY.encode(), f"last-write:{value}".encode(), hashlib.sha256
+    ).hexdigest()
+
+
+def write_marker(writer: int, written_at: Optional[float] = None) -> str:
+    """Signed record that `writer` wrote at `written_at` (now by default)"""
+    value = f"{writer}:{time.time() if written_at is None else written_at:.3f}"
+    return f"{value}:{_marker_signature(value)}"
+
+
+def request_last_write(request: Request) -> Optional[float]:
+    """When the requesting user last wrote, if the request carries a valid marker"""
+    marker = request.headers.get(LAST_WRITE_HEADER) or request.cookies.get(LAST_WRITE_COOKIE)
+    if not marker:
+        return None
+
+    value, _, signature = marker.rpartition(":")
+    writer, _, written_at = value.partition(":")
+    if not hmac.compare_digest(signature, _marker_signature(value)):
+        return None
+
+    # Another user's marker (a shared browser) says nothing about this reader
+    if writer != str(request_writer(request)):
+        return None
+
+    try:
+        return float(written_at)
+    except ValueError:
+        return None
+
+
+def get_read_db(request: Request):
+    """
+    Read-only session for GET endpoints: a replica, or the primary
+    while the requesting user's recent write may not have replicated.
+    """
+    db = read_session(request_last_write(request))
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request):
+    """get_read_db() for `async def` endpoints"""
+    async with async_read_session(request_last_write(request)) as db:
+        yield db
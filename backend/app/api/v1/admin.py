@@ -1,25 +1,30 @@
 # app/v1/admin.py
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, desc
+from sqlalchemy import func
 from typing import List, Optional
-from datetime import date, datetime, timedelta
+from datetime import timedelta
 
 from app.database import get_db
-from app.models import User, Post, Comment, Sentiment
+from app.models import User, Post, Comment, Profile
 from app.schemas.admin import (
-    ModerationAction, FlaggedContent, UserManagement,
-    SystemStats, UserDetail
+    ModerationAction, FlaggedContent, FlaggedContentPage, UserManagement,
+    SystemStats, UserDetail, MediaStorageReport
 )
 from app.api.deps import get_current_active_user
+from app.core.identity import UserSnapshot, invalidate_user
+from app.services.media_store import storage_report
+from app.services.moderation import open_flags, resolve_flag
+from app.services.removal import delete_comment_thread, delete_post
+from app.services.rollups import global_series, utc_today
+from app.services.system_stats import system_stats
 
 router = APIRouter()
 
 
-def verify_admin(current_user: User):
+def verify_admin(current_user: UserSnapshot):
     """Verify user has admin privileges"""
-    # Check role field (added in fixed User model)
-    if not current_user.is_admin:
+    if current_user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin access required"
@@ -28,102 +33,73 @@ def verify_admin(current_user: User):
 
 @router.get("/stats", response_model=SystemStats)
 def get_system_stats(
+        exact: bool = False,
         db: Session = Depends(get_db),
-        current_user: User = Depends(get_current_active_user)
+        current_user: UserSnapshot = Depends(get_current_active_user)
 ):
-    """Get system-wide statistics - Requires admin privileges"""
-    verify_admin(current_user)
-
-    today = date.today()
-
-    total_users = db.query(User).count()
-    active_users_today = db.query(func.count(func.distinct(Post.user_id))).filter(
-        Post.Post_date == today
-    ).scalar() or 0
+    """
+    Get system-wide statistics - Requires admin privileges
 
-    total_posts = db.query(Post).count()
-    posts_today = db.query(Post).filter(Post.Post_date == today).count()
+    Totals come from a snapshot at most SYSTEM_STATS_MAX_AGE_SECONDS old
+    (see `as_of`); **exact** forces a recount.
+    """
+    verify_admin(current_user)
 
-    total_comments = db.query(Comment).count()
-    comments_today = db.query(Comment).filter(Comment.Comment_date == today).count()
+    return SystemStats(**system_stats(db, exact=exact))
 
-    flagged_content = db.query(Sentiment).filter(
-        Sentiment.Sentiment_Label == 'negative'
-    ).count()
 
-    suspended_users = db.query(User).filter(User.status == 'suspended').count()
+@router.get("/media-storage", response_model=MediaStorageReport)
+def get_media_storage(
+        db: Session = Depends(get_db),
+        current_user: UserSnapshot = Depends(get_current_active_user)
+):
+    """Media store size and bytes saved by deduplication - Requires admin privileges"""
+    verify_admin(current_user)
 
-    return SystemStats(
-        total_users=total_users,
-        active_users_today=active_users_today,
-        total_posts=total_posts,
-        posts_today=posts_today,
-        total_comments=total_comments,
-        comments_today=comments_today,
-        flagged_content_count=flagged_content,
-        suspended_users_count=suspended_users
-    )
+    return MediaStorageReport(**storage_report(db))
 
 
-@router.get("/flagged-content", response_model=List[FlaggedContent])
+@router.get("/flagged-content", response_model=FlaggedContentPage)
 def get_flagged_content(
         content_type: Optional[str] = Query(None, pattern="^(post|comment|all)$"),
+        cursor: Optional[str] = None,
         limit: int = Query(50, ge=1, le=200),
         db: Session = Depends(get_db),
-        current_user: User = Depends(get_current_active_user)
+        current_user: UserSnapshot = Depends(get_current_active_user)
 ):
-    """Get flagged content for moderation"""
+    """
+    Get flagged content for moderation
+
+    Open moderation flags across posts and comments, newest first.
+    Pass `next_cursor` from the previous response as `cursor` to continue.
+    """
     verify_admin(current_user)
 
-    flagged_items = []
-
-    if content_type in [None, 'all', 'post']:
-        toxic_posts = db.query(Post, Sentiment, User).join(
-            Sentiment, Sentiment.Post_Id == Post.post_id
-        ).join(
-            User, User.User_id == Post.user_id
-        ).filter(
-            Sentiment.Sentiment_Label == 'negative'
-        ).order_by(desc(Post.Post_date)).limit(limit).all()
-
-        for post, sentiment, user in toxic_posts:
-            flagged_items.append(FlaggedContent(
-                content_id=post.post_id,
-                content_type='post',
-                content_text=post.Content[:200] + '...' if len(post.Content) > 200 else post.Content,
-                author_id=user.User_id,
-                author_username=user.Username,
-                sentiment_label=sentiment.Sentiment_Label,
-                toxicity_level='high',
-                flag_count=1,
-                created_at=datetime.combine(post.Post_date, datetime.min.time())
-            ))
-
-    if content_type in [None, 'all', 'comment']:
-        toxic_comments = db.query(Comment, Sentiment, User).join(
-            Sentiment, Sentiment.comment_id == Comment.Comment_id
-        ).join(
-            User, User.User_id == Comment.User_id
-        ).filter(
-            Sentiment.Sentiment_Label == 'negative'
-        ).order_by(desc(Comment.Comment_date)).limit(limit).all()
-
-        for comment, sentiment, user in toxic_comments:
-            flagged_items.append(FlaggedContent(
-                content_id=comment.Comment_id,
-                content_type='comment',
-                content_text=comment.Comment_Text[:200] + '...' if len(
-                    comment.Comment_Text) > 200 else comment.Comment_Text,
-                author_id=user.User_id,
-                author_username=user.Username,
-                sentiment_label=sentiment.Sentiment_Label,
-                toxicity_level='medium',
-                flag_count=1,
-                created_at=datetime.combine(comment.Comment_date, datetime.min.time())
-            ))
-
-    flagged_items.sort(key=lambda x: x.created_at, reverse=True)
-    return flagged_items[:limit]
+    rows, next_cursor = open_flags(db, content_type, cursor, limit)
+
+    items = [
+        FlaggedContent(
+            flag_id=flag.id,
+            content_id=flag.target_id,
+            content_type=flag.target_type,
+            content_text=content[:200] + '...' if len(content) > 200 else content,
+            author_id=flag.author_id,
+            author_username=username,
+            sentiment_label=flag.sentiment_label,
+            toxicity_level=flag.toxicity,
+            toxicity_score=flag.toxicity_score,
+            flag_count=flag.flag_count,
+            created_at=flag.created_at
+        )
+        for flag, username, content in rows
+    ]
+
+    return FlaggedContentPage(
+        items=items,
+        page_size=limit,
+        has_more=next_cursor is not None,
+        next_cursor=next_cursor
+    )
 
 
 @router.post("/moderate/{content_type}/{content_id}")
@@ -132,13 +108,13 @@ def moderate_content(
         content_id: int,
         action_data: ModerationAction,
         db: Session = Depends(get_db),
-        current_user: User = Depends(get_current_active_user)
+        current_user: UserSnapshot = Depends(get_current_active_user)
 ):
     """Take moderation action on content"""
     verify_admin(current_user)
 
     if content_type == 'post':
-        content = db.query(Post).filter(Post.post_id == content_id).first()
+        content = db.query(Post).filter(Post.id == content_id).first()
         if not content:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -146,35 +122,50 @@ def moderate_content(
             )
         author_id = content.user_id
     elif content_type == 'comment':
-        content = db.query(Comment).filter(Comment.Comment_id == content_id).first()
+        content = db.query(Comment).filter(Comment.id == content_id).first()
         if not content:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Comment not found"
             )
-        author_id = content.User_id
+        author_id = content.user_id
     else:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid content type"
         )
 
+    resolve_flag(
+        db=db,
+        target_type=content_type,
+        target_id=content_id,
+        moderator_id=current_user.id,
+        action=action_data.action,
+        reason=action_data.reason
+    )
+
     if action_data.action == 'remove':
-        db.delete(content)
+        if content_type == 'post':
+            delete_post(db=db, post=content)
+        else:
+            delete_comment_thread(db=db, comment=content)
         db.commit()
         message = f"{content_type.capitalize()} removed successfully"
 
     elif action_data.action == 'approve':
+        db.commit()
         message = f"{content_type.capitalize()} approved"
 
     elif action_data.action == 'suspend_user':
-        user = db.query(User).filter(User.User_id == author_id).first()
+        user = db.query(User).filter(User.id == author_id).first()
         if user:
-            user.status = 'suspended'
-            db.commit()
+            user.is_active = False
+        db.commit()
+        invalidate_user(author_id)
         message = f"User suspended"
 
     elif action_data.action == 'warn':
+        db.commit()
         message = f"Warning sent to user"
 
     return {
@@ -192,44 +183,52 @@ def get_all_users(
         page_size: int = Query(50, ge=1, le=200),
         search: Optional[str] = None,
         db: Session = Depends(get_db),
-        current_user: User = Depends(get_current_active_user)
+        current_user: UserSnapshot = Depends(get_current_active_user)
 ):
     """Get all users with detailed information"""
     verify_admin(current_user)
 
     offset = (page - 1) * page_size
 
-    query = db.query(User)
+    query = db.query(User, Profile).outerjoin(Profile, Profile.user_id == User.id)
 
     if search:
         search_term = f"%{search}%"
         query = query.filter(
-            (User.Username.ilike(search_term)) | (User.Email.ilike(search_term))
+            (User.username.ilike(search_term)) | (User.email.ilike(search_term))
         )
 
-    users = query.offset(offset).limit(page_size).all()
-
-    users_detail = []
-    for user in users:
-        posts_count = db.query(Post).filter(Post.user_id == user.User_id).count()
-        comments_count = db.query(Comment).filter(Comment.User_id == user.User_id).count()
-
-        users_detail.append(UserDetail(
-            User_id=user.User_id,
-            Username=user.Username,
-            Email=user.Email,
-            Date_Joined=user.Date_Joined,
-            Country=user.Country,
-            role=user.role,
-            status=user.status,
-            posts_count=posts_count,
-            comments_count=comments_count,
-            followers_count=user.followers_count,
-            following_count=user.following_count,
+    rows = query.order_by(User.id).offset(offset).limit(page_size).all()
+    user_ids = [user.id for user, _ in rows]
+
+    posts_counts = dict(
+        db.query(Post.user_id, func.count(Post.id))
+        .filter(Post.user_id.in_(user_ids))
+        .group_by(Post.user_id)
+    ) if user_ids else {}
+    comments_counts = dict(
+        db.query(Comment.user_id, func.count(Comment.id))
+        .filter(Comment.user_id.in_(user_ids))
+        .group_by(Comment.user_id)
+    ) if user_ids else {}
+
+    return [
+        UserDetail(
+            id=user.id,
+            username=user.username,
+            email=user.email,
+            created_at=user.created_at,
+            country=profile.country if profile else None,
+            role=user.role or "user",
+            is_active=user.is_active is not False,
+            posts_count=posts_counts.get(user.id, 0),
+            comments_count=comments_counts.get(user.id, 0),
+            followers_count=(profile.followers_count if profile else 0) or 0,
+            following_count=(profile.following_count if profile else 0) or 0,
             flags_received=0
-        ))
-
-    return users_detail
+        )
+        for user, profile in rows
+    ]
 
 
 @router.post("/users/{user_id}/manage")
@@ -237,12 +236,12 @@ def manage_user(
         user_id: int,
         action_data: UserManagement,
         db: Session = Depends(get_db),
-        current_user: User = Depends(get_current_active_user)
+        current_user: UserSnapshot = Depends(get_current_active_user)
 ):
     """Manage user account"""
     verify_admin(current_user)
 
-    user = db.query(User).filter(User.User_id == user_id).first()
+    user = db.query(User).filter(User.id == user_id).first()
 
     if not user:
         raise HTTPException(
@@ -250,7 +249,7 @@ def manage_user(
             detail="User not found"
         )
 
-    if user_id == current_user.User_id:
+    if user_id == current_user.id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot manage your own account"
@@ -262,12 +261,12 @@ def manage_user(
         message = "User deleted successfully"
 
     elif action_data.action == 'suspend':
-        user.status = 'suspended'
+        user.is_active = False
         db.commit()
         message = "User suspended"
 
     elif action_data.action == 'unsuspend':
-        user.status = 'active'
+        user.is_active = True
         db.commit()
         message = "User unsuspended"
 
@@ -281,6 +280,8 @@ def manage_user(
         db.commit()
         message = "Admin privileges removed"
 
+    invalidate_user(user_id)
+
     return {
         "message": message,
         "user_id": user_id,
@@ -293,27 +294,26 @@ def manage_user(
 def get_activity_log(
         days: int = Query(7, ge=1, le=90),
         db: Session = Depends(get_db),
-        current_user: User = Depends(get_current_active_user)
+        current_user: UserSnapshot = Depends(get_current_active_user)
 ):
     """Get system activity log"""
     verify_admin(current_user)
 
-    start_date = date.today() - timedelta(days=days)
+    start_date = utc_today() - timedelta(days=days - 1)
+    series = global_series(db, start_date, utc_today())
 
     daily_stats = []
 
     for i in range(days):
         check_date = start_date + timedelta(days=i)
-
-        posts_count = db.query(Post).filter(Post.Post_date == check_date).count()
-        comments_count = db.query(Comment).filter(Comment.Comment_date == check_date).count()
-        new_users = db.query(User).filter(User.Date_Joined == check_date).count()
+        row = series.get(check_date)
 
         daily_stats.append({
             "date": check_date.isoformat(),
-            "posts": posts_count,
-            "comments": comments_count,
-            "new_users": new_users
+            "posts": row.posts if row else 0,
+            "comments": row.comments if row else 0,
+            "reactions": row.reactions if row else 0,
+            "new_users": row.new_users if row else 0
         })
 
     return {
@@ -1,22 +1,23 @@
 # app/v1/analytics.py
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import func, desc
-from typing import List, Dict
-from datetime import date, datetime, timedelta
+from datetime import date, timedelta
 
-from app.database import get_db
-from app.models import User, Post, Comment, Reaction, Sentiment
-from app.api.deps import get_current_active_user
+from app.models import User, Post, Comment, Reaction, Sentiment, Follow, Profile
+from app.api.deps import get_current_active_user, get_read_db
+from app.core.identity import UserSnapshot
+from app.services.analytics import user_dashboard
+from app.services.rollups import user_series, utc_today
 
 router = APIRouter()
 
 
 @router.get("/dashboard")
 def get_user_analytics_dashboard(
-        db: Session = Depends(get_db),
-        current_user: User = Depends(get_current_active_user)
+        db: Session = Depends(get_read_db),
+        current_user: UserSnapshot = Depends(get_current_active_user)
 ):
     """
     Get personalized analytics dashboard for current user
@@ -27,90 +28,16 @@ def get_user_analytics_dashboard(
     - Sentiment analysis trends
     - Top performing posts
     """
-
-    # Total posts
-    total_posts = db.query(Post).filter(Post.user_id == current_user.User_id).count()
-
-    # Total comments
-    total_comments = db.query(Comment).filter(Comment.User_id == current_user.User_id).count()
-
-    # Total likes received
-    total_likes = db.query(Reaction).join(
-        Reaction.posts
-    ).filter(Post.user_id == current_user.User_id).count()
-
-    # Average engagement per post
-    avg_engagement = 0
-    if total_posts > 0:
-        avg_engagement = total_likes / total_posts
-
-    # Sentiment distribution
-    sentiments = db.query(
-        Sentiment.Sentiment_Label,
-        func.count(Sentiment.Sentiment_id).label('count')
-    ).join(
-        Post, Post.post_id == Sentiment.Post_Id
-    ).filter(
-        Post.user_id == current_user.User_id
-    ).group_by(Sentiment.Sentiment_Label).all()
-
-    sentiment_distribution = {s.Sentiment_Label: s.count for s in sentiments}
-
-    # Top performing posts
-    user_posts = db.query(Post).filter(Post.user_id == current_user.User_id).all()
-    posts_with_engagement = []
-
-    for post in user_posts:
-        likes = db.query(Reaction).join(Reaction.posts).filter(
-            Post.post_id == post.post_id
-        ).count()
-        comments = db.query(Comment).filter(Comment.Post_id == post.post_id).count()
-        engagement = likes + (comments * 2)
-
-        posts_with_engagement.append({
-            "post_id": post.post_id,
-            "content": post.Content[:100] + "..." if len(post.Content) > 100 else post.Content,
-            "likes": likes,
-            "comments": comments,
-            "engagement_score": engagement,
-            "date": post.Post_date.isoformat()
-        })
-
-    # Sort by engagement
-    posts_with_engagement.sort(key=lambda x: x['engagement_score'], reverse=True)
-    top_posts = posts_with_engagement[:5]
-
-    return {
-        "overview": {
-            "total_posts": total_posts,
-            "total_comments": total_comments,
-            "total_likes_received": total_likes,
-            "average_engagement": round(avg_engagement, 2),
-            "followers": current_user.followers_count,
-            "following": current_user.following_count
-        },
-        "sentiment_analysis": {
-            "distribution": sentiment_distribution,
-            "positive_percentage": round(
-                (sentiment_distribution.get('positive', 0) / max(total_posts, 1)) * 100, 1
-            ),
-            "negative_percentage": round(
-                (sentiment_distribution.get('negative', 0) / max(total_posts, 1)) * 100, 1
-            ),
-            "neutral_percentage": round(
-                (sentiment_distribution.get('neutral', 0) / max(total_posts, 1)) * 100, 1
-            )
-        },
-        "top_posts": top_posts,
-        "engagement_trend": "increasing"  # Placeholder - would calculate trend
-    }
+    dashboard = user_dashboard(db, current_user.id)
+    dashboard["engagement_trend"] = "increasing"  # Placeholder - would calculate trend
+    return dashboard
 
 
 @router.get("/posts/performance")
 def get_posts_performance(
         days: int = Query(30, ge=1, le=365),
-        db: Session = Depends(get_db),
-        current_user: User = Depends(get_current_active_user)
+        db: Session = Depends(get_read_db),
+        current_user: UserSnapshot = Depends(get_current_active_user)
 ):
     """
     Get posts performance over time
@@ -120,29 +47,20 @@ def get_posts_performance(
     Returns daily post counts and engagement metrics
     """
 
-    start_date = date.today() - timedelta(days=days)
-
-    # Get posts by date
-    posts_by_date = db.query(
-        Post.Post_date,
-        func.count(Post.post_id).label('count')
-    ).filter(
-        Post.user_id == current_user.User_id,
-        Post.Post_date >= start_date
-    ).group_by(Post.Post_date).all()
-
-    # Convert to dict
-    posts_dict = {p.Post_date: p.count for p in posts_by_date}
+    start_date = utc_today() - timedelta(days=days - 1)
+    series = user_series(db, current_user.id, start_date, utc_today())
 
     # Build daily data
     daily_data = []
     for i in range(days):
         check_date = start_date + timedelta(days=i)
-        post_count = posts_dict.get(check_date, 0)
+        row = series.get(check_date)
 
         daily_data.append({
             "date": check_date.isoformat(),
-            "posts": post_count
+            "posts": row.posts if row else 0,
+            "reactions": row.reactions_received if row else 0,
+            "comments": row.comments_received if row else 0
         })
 
     return {
@@ -156,8 +74,8 @@ def get_posts_performance(
 @router.get("/sentiment/trends")
 def get_sentiment_trends(
         days: int = Query(30, ge=1, le=365),
-        db: Session = Depends(get_db),
-        current_user: User = Depends(get_current_active_user)
+        db: Session = Depends(get_read_db),
+        current_user: UserSnapshot = Depends(get_current_active_user)
 ):
     """
     Get sentiment trends over time
@@ -165,37 +83,20 @@ def get_sentiment_trends(
     Shows how your content sentiment has changed
     """
 
-    start_date = date.today() - timedelta(days=days)
-
-    # Get posts with sentiments
-    posts_with_sentiment = db.query(
-        Post.Post_date,
-        Sentiment.Sentiment_Label
-    ).join(
-        Sentiment, Sentiment.Post_Id == Post.post_id
-    ).filter(
-        Post.user_id == current_user.User_id,
-        Post.Post_date >= start_date
-    ).all()
-
-    # Organize by date
-    sentiment_by_date = {}
-    for post_date, sentiment_label in posts_with_sentiment:
-        if post_date not in sentiment_by_date:
-            sentiment_by_date[post_date] = {'positive': 0, 'negative': 0, 'neutral': 0}
-        sentiment_by_date[post_date][sentiment_label] += 1
+    start_date = utc_today() - timedelta(days=days - 1)
+    series = user_series(db, current_user.id, start_date, utc_today())
 
     # Build daily data
     daily_sentiment = []
     for i in range(days):
         check_date = start_date + timedelta(days=i)
-        sentiments = sentiment_by_date.get(check_date, {'positive': 0, 'negative': 0, 'neutral': 0})
+        row = series.get(check_date)
 
         daily_sentiment.append({
             "date": check_date.isoformat(),
-            "positive": sentiments['positive'],
-            "negative": sentiments['negative'],
-            "neutral": sentiments['neutral']
+            "positive": row.positive_posts if row else 0,
+            "negative": row.negative_posts if row else 0,
+            "neutral": row.neutral_posts if row else 0
         })
 
     return {
@@ -206,8 +107,8 @@ def get_sentiment_trends(
 
 @router.get("/engagement/breakdown")
 def get_engagement_breakdown(
-        db: Session = Depends(get_db),
-        current_user: User = Depends(get_current_active_user)
+        db: Session = Depends(get_read_db),
+        current_user: UserSnapshot = Depends(get_current_active_user)
 ):
     """
     Get detailed engagement breakdown
@@ -217,24 +118,24 @@ def get_engagement_breakdown(
 
     # Get reaction breakdown
     reactions = db.query(
-        Reaction.Reaction_Type,
-        func.count(Reaction.Reaction_id).label('count')
+        Reaction.reaction_type,
+        func.count(Reaction.id).label('count')
     ).join(
-        Reaction.posts
+        Post, Post.id == Reaction.post_id
     ).filter(
-        Post.user_id == current_user.User_id
-    ).group_by(Reaction.Reaction_Type).all()
+        Post.user_id == current_user.id
+    ).group_by(Reaction.reaction_type).all()
 
-    reaction_breakdown = {r.Reaction_Type: r.count for r in reactions}
+    reaction_breakdown = {r.reaction_type: r.count for r in reactions}
 
     # Get comments breakdown
-    total_comments = db.query(Comment).filter(Comment.User_id == current_user.User_id).count()
+    total_comments = db.query(Comment).filter(Comment.user_id == current_user.id).count()
 
-    comments_received = db.query(Comment).join(
-        Post, Post.post_id == Comment.Post_id
+    comments_received = db.query(
+        func.coalesce(func.sum(Post.comments_count), 0)
     ).filter(
-        Post.user_id == current_user.User_id
-    ).count()
+        Post.user_id == current_user.id
+    ).scalar()
 
     return {
         "reactions": {
@@ -251,46 +152,37 @@ def get_engagement_breakdown(
 
 @router.get("/audience/insights")
 def get_audience_insights(
-        db: Session = Depends(get_db),
-        current_user: User = Depends(get_current_active_user)
+        db: Session = Depends(get_read_db),
+        current_user: UserSnapshot = Depends(get_current_active_user)
 ):
     """
     Get insights about your audience
 
     Shows who engages with your content most
     """
+    followers_count = db.query(Profile.followers_count).filter(
+        Profile.user_id == current_user.id
+    ).scalar() or 0
 
-    # Get top engagers (users who like/comment most)
-    user_posts = db.query(Post.post_id).filter(Post.user_id == current_user.User_id).all()
-    post_ids = [p.post_id for p in user_posts]
-
-    if not post_ids:
-        return {
-            "followers_growth": 0,
-            "engagement_rate": 0,
-            "top_engagers": [],
-            "geographic_distribution": {}
-        }
-
-    # Get users who reacted to posts
+    # Get users who reacted to posts most
     top_engagers = db.query(
-        User.User_id,
-        User.Username,
-        func.count(Reaction.Reaction_id).label('engagement_count')
+        User.id,
+        User.username,
+        func.count(Reaction.id).label('engagement_count')
     ).join(
-        Reaction, Reaction.User_id == User.User_id
+        Reaction, Reaction.user_id == User.id
     ).join(
-        Reaction.posts
+        Post, Post.id == Reaction.post_id
     ).filter(
-        Post.post_id.in_(post_ids)
+        Post.user_id == current_user.id
     ).group_by(
-        User.User_id, User.Username
+        User.id, User.username
     ).order_by(desc('engagement_count')).limit(10).all()
 
     top_engagers_list = [
         {
-            "user_id": e.User_id,
-            "username": e.Username,
+            "user_id": e.id,
+            "username": e.username,
             "engagement_count": e.engagement_count
         }
         for e in top_engagers
@@ -298,17 +190,19 @@ def get_audience_insights(
 
     # Geographic distribution of followers
     follower_countries = db.query(
-        User.Country,
-        func.count(User.User_id).label('count')
+        Profile.country,
+        func.count(Follow.id).label('count')
+    ).join(
+        Profile, Profile.user_id == Follow.follower_id
     ).filter(
-        User.User_id.in_([f.User_id for f in current_user.followers])
-    ).group_by(User.Country).all()
+        Follow.following_id == current_user.id
+    ).group_by(Profile.country).all()
 
-    geo_distribution = {c.Country or 'Unknown': c.count for c in follower_countries}
+    geo_distribution = {c.country or 'Unknown': c.count for c in follower_countries}
 
     return {
-        "total_followers": current_user.followers_count,
-        "engagement_rate": round((len(top_engagers) / max(current_user.followers_count, 1)) * 100, 2),
+        "total_followers": followers_count,
+        "engagement_rate": round((len(top_engagers) / max(followers_count, 1)) * 100, 2),
         "top_engagers": top_engagers_list,
         "geographic_distribution": geo_distribution
     }
@@ -316,8 +210,8 @@ def get_audience_insights(
 
 @router.get("/content/recommendations")
 def get_content_recommendations(
-        db: Session = Depends(get_db),
-        current_user: User = Depends(get_current_active_user)
+        db: Session = Depends(get_read_db),
+        current_user: UserSnapshot = Depends(get_current_active_user)
 ):
     """
     Get AI-powered content recommendations
@@ -327,15 +221,15 @@ def get_content_recommendations(
 
     # Analyze past performance
     posts_with_sentiment = db.query(
-        Sentiment.Sentiment_Label,
-        func.avg(func.cast(Sentiment.Sentiment_Score, Float)).label('avg_score')
+        Sentiment.label,
+        func.avg(Sentiment.score).label('avg_score')
     ).join(
-        Post, Post.post_id == Sentiment.Post_Id
+        Post, Post.id == Sentiment.post_id
     ).filter(
-        Post.user_id == current_user.User_id
-    ).group_by(Sentiment.Sentiment_Label).all()
+        Post.user_id == current_user.id
+    ).group_by(Sentiment.label).all()
 
-    sentiment_performance = {s.Sentiment_Label: float(s.avg_score or 0) for s in posts_with_sentiment}
+    sentiment_performance = {s.label: float(s.avg_score or 0) for s in posts_with_sentiment}
 
     # Generate recommendations
     recommendations = []
@@ -347,7 +241,11 @@ def get_content_recommendations(
             "confidence": "high"
         })
 
-    if current_user.followers_count < 100:
+    followers_count = db.query(Profile.followers_count).filter(
+        Profile.user_id == current_user.id
+    ).scalar() or 0
+
+    if followers_count < 100:
         recommendations.append({
             "type": "growth",
             "recommendation": "Engage more with others by commenting and reacting to build your network.",
@@ -356,8 +254,8 @@ def get_content_recommendations(
 
     # Post frequency
     recent_posts = db.query(Post).filter(
-        Post.user_id == current_user.User_id,
-        Post.Post_date >= date.today() - timedelta(days=7)
+        Post.user_id == current_user.id,
+        Post.created_at >= date.today() - timedelta(days=7)
     ).count()
 
     if recent_posts < 3:
@@ -370,4 +268,4 @@ def get_content_recommendations(
     return {
         "recommendations": recommendations,
         "sentiment_performance": sentiment_performance
-    }
\ No newline at end of file
+    }
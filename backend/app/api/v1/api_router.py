@@ -7,7 +7,14 @@ from app.api.v1 import (
     profiles,
     comments,
     follows,
-    notifications
+    notifications,
+    bookmarks,
+    feed,
+    analytics,
+    admin,
+    media,
+    stories,
+    uploads
 )
 
 api_router = APIRouter()
@@ -17,6 +24,13 @@ api_router.include_router(users.router, prefix="/users", tags=["Users"])
 api_router.include_router(posts.router, prefix="/posts", tags=["Posts"])
 api_router.include_router(profiles.router, prefix="/profiles", tags=["Profiles"])
 api_router.include_router(follows.router, prefix="/follows", tags=["Follows"])
+api_router.include_router(feed.router, prefix="/feed", tags=["Feed"])
+api_router.include_router(analytics.router, prefix="/analytics", tags=["Analytics"])
+api_router.include_router(admin.router, prefix="/admin", tags=["Admin"])
+api_router.include_router(media.router, prefix="/media", tags=["Media"])
+api_router.include_router(stories.router, prefix="/stories", tags=["Stories"])
+api_router.include_router(uploads.router, prefix="/uploads", tags=["Uploads"])
 api_router.include_router(comments.router)
+api_router.include_router(bookmarks.router)
 api_router.include_router(notifications.router,prefix="/notifications",tags=["Notifications"]
 )
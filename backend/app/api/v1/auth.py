@@ -2,29 +2,50 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.database import get_db
 from app.models import User, Profile
 from app.schemas.auth import UserSignup, UserLogin, Token
-from app.core.security import hash_password, verify_password
+from app.core.security import (
+    PasswordHasherBusy,
+    hash_password_async,
+    verify_password_async
+)
 from app.core.jwt import create_access_token, create_refresh_token
+from app.services.rollups import bump, utc_today
 
 
 
 router = APIRouter()
 
-@router.post("/signup", response_model=Token, status_code=status.HTTP_201_CREATED)
-def signup(payload: UserSignup, db: Session = Depends(get_db)):
+
+# Hashing runs on the bounded password pool; only the short DB work goes
+# through the shared threadpool, so a login burst cannot starve other routes.
+
+def _hashing_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many authentication requests, please retry",
+        headers={"Retry-After": "1"}
+    )
+
+
+def _check_available(db: Session, payload: UserSignup) -> None:
     if db.query(User).filter(User.email == payload.email).first():
         raise HTTPException(status_code=400, detail="Email already registered")
 
     if db.query(User).filter(User.username == payload.username).first():
         raise HTTPException(status_code=400, detail="Username already taken")
 
+    db.rollback()  # hand the connection back while the password hashes
+
+
+def _create_user(db: Session, payload: UserSignup, password_hash: str) -> int:
     user = User(
         username=payload.username,
         email=payload.email,
-        password_hash=hash_password(payload.password),
+        password_hash=password_hash,
     )
 
     db.add(user)
@@ -37,16 +58,37 @@ def signup(payload: UserSignup, db: Session = Depends(get_db)):
     )
 
     db.add(profile)
+    bump(db=db, day=utc_today(), new_users=1)
     db.commit()
 
+    return user.id
+
+
+def _password_hash_for(db: Session, email: str):
+    user = db.query(User.id, User.password_hash).filter(User.email == email).first()
+    db.rollback()  # hand the connection back while the password verifies
+    return user
+
+
+@router.post("/signup", response_model=Token, status_code=status.HTTP_201_CREATED)
+async def signup(payload: UserSignup, db: Session = Depends(get_db)):
+    await run_in_threadpool(_check_available, db, payload)
+
+    try:
+        password_hash = await hash_password_async(payload.password)
+    except PasswordHasherBusy:
+        raise _hashing_busy()
+
+    user_id = await run_in_threadpool(_create_user, db, payload, password_hash)
+
     return Token(
-        access_token=create_access_token(user.id),
-        refresh_token=create_refresh_token(user.id),
+        access_token=create_access_token(user_id),
+        refresh_token=create_refresh_token(user_id),
     )
 
 @router.post("/login", response_model=Token)
-def login(payload: UserLogin, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == payload.email).first()
+async def login(payload: UserLogin, db: Session = Depends(get_db)):
+    user = await run_in_threadpool(_password_hash_for, db, payload.email)
 
     if not user:
         raise HTTPException(
@@ -54,7 +96,12 @@ def login(payload: UserLogin, db: Session = Depends(get_db)):
             detail="Invalid email or password"
         )
 
-    if not verify_password(payload.password, user.password_hash):
+    try:
+        valid = await verify_password_async(payload.password, user.password_hash)
+    except PasswordHasherBusy:
+        raise _hashing_busy()
+
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid email or password"
@@ -66,4 +113,4 @@ def login(payload: UserLogin, db: Session = Depends(get_db)):
     return Token(
         access_token=access_token,
         refresh_token=refresh_token
-    )
\ No newline at end of file
+    )
@@ -3,9 +3,11 @@ from sqlalchemy.orm import Session, selectinload
 from typing import Optional
 
 from app.database import get_db
-from app.models import Bookmark, Post, User
-from app.api.deps import get_current_active_user
-from app.api.v1.posts import build_post_response
+from app.models import Bookmark, Post
+from app.api.deps import get_current_active_user, get_read_db
+from app.core.identity import UserSnapshot
+from app.api.v1.posts import build_post_responses
+from app.utils.pagination import keyset_page
 
 router = APIRouter(prefix="/bookmarks", tags=["Bookmarks"])
 
@@ -18,7 +20,7 @@ router = APIRouter(prefix="/bookmarks", tags=["Bookmarks"])
 def toggle_bookmark(
     post_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserSnapshot = Depends(get_current_active_user),
 ):
     post = db.query(Post).filter(Post.id == post_id).first()
     if not post:
@@ -53,13 +55,12 @@ def toggle_bookmark(
 
 @router.get("", status_code=status.HTTP_200_OK)
 def get_my_bookmarks(
-    page: int = Query(1, ge=1),
+    cursor: Optional[str] = None,
     page_size: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    include_total: bool = False,
+    db: Session = Depends(get_read_db),
+    current_user: UserSnapshot = Depends(get_current_active_user),
 ):
-    offset = (page - 1) * page_size
-
     query = (
         db.query(Bookmark)
         .options(
@@ -67,27 +68,22 @@ def get_my_bookmarks(
             .selectinload(Post.user)
         )
         .filter(Bookmark.user_id == current_user.id)
-        .order_by(Bookmark.created_at.desc())
     )
 
-    total = query.count()
-
-    bookmarks = (
-        query
-        .offset(offset)
-        .limit(page_size)
-        .all()
+    bookmarks, next_cursor = keyset_page(
+        query, Bookmark.created_at, Bookmark.id, cursor, page_size
     )
 
-    posts = [
-        build_post_response(b.post, db, current_user)
-        for b in bookmarks
-    ]
+    posts = build_post_responses(
+        [b.post for b in bookmarks],
+        db,
+        current_user
+    )
 
     return {
         "posts": posts,
-        "total": total,
-        "page": page,
+        "total": query.count() if include_total else None,
         "page_size": page_size,
-        "has_more": (offset + page_size) < total
+        "has_more": next_cursor is not None,
+        "next_cursor": next_cursor
     }
@@ -1,13 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, selectinload
 from typing import List
 
 from app.database import get_db
-from app.models import Comment, Post, Sentiment, User
+from app.models import Comment, Post, User
 from app.schemas.comments import CommentCreate, CommentResponse, CommentAuthor
-from app.api.deps import get_current_active_user
-from app.utils.sentiment import analyze_sentiment
+from app.api.deps import get_current_active_user, get_async_read_db
+from app.core.identity import UserSnapshot
 from app.services.notifications import create_notification
+from app.services.removal import delete_comment_thread
+from app.services import engagement, rollups, trending
+from app.services.sentiment_jobs import score_or_enqueue
 
 router = APIRouter(prefix="/comments", tags=["Comments"])
 
@@ -62,7 +67,7 @@ def create_comment(
     post_id: int,
     data: CommentCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: UserSnapshot = Depends(get_current_active_user)
 ):
     post = db.query(Post).filter(Post.id == post_id).first()
     if not post:
@@ -89,14 +94,15 @@ def create_comment(
     db.add(comment)
     db.flush()
 
-    sentiment_result = analyze_sentiment(data.content)
+    engagement.add_comments(db=db, post_id=post_id)
+    trending.record_engagement(
+        db=db, post_id=post_id, weight=trending.COMMENT_WEIGHT
+    )
+    rollups.record_comment(
+        db=db, user_id=current_user.id, post_author_id=post.user_id
+    )
 
-    db.add(Sentiment(
-        comment_id=comment.id,
-        label=sentiment_result["label"],
-        score=sentiment_result["score"],
-        target_type="comment"
-    ))
+    score_or_enqueue(db=db, content=comment.content, comment_id=comment.id)
 
     if post.user_id != current_user.id:
         create_notification(
@@ -122,23 +128,24 @@ def create_comment(
     "/posts/{post_id}",
     response_model=List[CommentResponse]
 )
-def list_comments(
+async def list_comments(
     post_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    comments = (
-        db.query(Comment)
+    comments = (await db.scalars(
+        select(Comment)
         .options(
-            selectinload(Comment.user),
-            selectinload(Comment.replies).selectinload(Comment.user)
+            selectinload(Comment.user).selectinload(User.profile),
+            selectinload(Comment.replies)
+            .selectinload(Comment.user)
+            .selectinload(User.profile)
         )
-        .filter(
+        .where(
             Comment.post_id == post_id,
             Comment.parent_id.is_(None)
         )
         .order_by(Comment.created_at.asc())
-        .all()
-    )
+    )).all()
 
     return [build_comment_response(c) for c in comments]
 
@@ -151,7 +158,7 @@ def list_comments(
 def delete_comment(
     comment_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: UserSnapshot = Depends(get_current_active_user)
 ):
     comment = db.query(Comment).filter(Comment.id == comment_id).first()
 
@@ -161,12 +168,8 @@ def delete_comment(
     if comment.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not allowed")
 
-    # Explicit sentiment cleanup (safe for DB project)
-    db.query(Sentiment).filter(
-        Sentiment.comment_id == comment.id
-    ).delete()
-
-    db.delete(comment)
+    # The whole reply thread goes with the comment
+    delete_comment_thread(db=db, comment=comment)
     db.commit()
 
     return None
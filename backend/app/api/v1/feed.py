@@ -1,43 +1,38 @@
 # app/api/v1/feed.py
 
+from typing import Optional
+
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.models import Post, Follow, User
-from app.schemas.posts import PostResponse
-from app.api.deps import get_current_active_user
+from app.database import get_async_db
+from app.schemas.posts import FeedResponse
+from app.api.deps import get_current_active_user_async
+from app.core.identity import UserSnapshot
+from app.api.v1.posts import build_post_responses_async
+from app.services.timeline import read_timeline
 
 router = APIRouter()
 
 
-@router.get("/", response_model=list[PostResponse])
-def get_feed(
-    page: int = Query(1, ge=1),
-    limit: int = Query(20, le=100),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+@router.get("/", response_model=FeedResponse)
+async def get_feed(
+    cursor: Optional[str] = None,
+    page_size: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSnapshot = Depends(get_current_active_user_async),
 ):
-    offset = (page - 1) * limit
-
-    followed_subquery = (
-        db.query(Follow.following_id)
-        .filter(Follow.follower_id == current_user.id)
+    """
+    Home timeline (own and followed users' posts), newest first.
+    Pass `next_cursor` from the previous response as `cursor` to continue.
+    """
+    posts, next_cursor = await db.run_sync(
+        read_timeline, current_user.id, cursor, page_size
     )
 
-    posts = (
-        db.query(Post)
-        .filter(
-            or_(
-                Post.user_id.in_(followed_subquery),
-                Post.user_id == current_user.id
-            )
-        )
-        .order_by(Post.created_at.desc())
-        .offset(offset)
-        .limit(limit)
-        .all()
+    return FeedResponse(
+        posts=await build_post_responses_async(posts, db, current_user),
+        page_size=page_size,
+        has_more=next_cursor is not None,
+        next_cursor=next_cursor
     )
-
-    return posts
@@ -1,12 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from typing import List, Optional
 
 from app.database import get_db
 from app.models import User, Follow
 from app.schemas.follow import FollowResponse, FollowUser
-from app.api.deps import get_current_active_user
+from app.api.deps import (
+    get_current_active_user,
+    get_current_active_user_async,
+    get_async_read_db
+)
+from app.core.identity import UserSnapshot
 from app.services.notifications import create_notification
+from app.services import timeline
+from app.utils.pagination import keyset_page_async
 
 router = APIRouter(prefix="/follows", tags=["Follows"])
 
@@ -18,8 +27,9 @@ router = APIRouter(prefix="/follows", tags=["Follows"])
 @router.post("/{user_id}", response_model=FollowResponse)
 def follow_user(
     user_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: UserSnapshot = Depends(get_current_active_user)
 ):
     if user_id == current_user.id:
         raise HTTPException(
@@ -47,6 +57,13 @@ def follow_user(
 
     db.add(follow)
 
+    timeline.adjust_follow_counts(
+        db=db,
+        follower_id=current_user.id,
+        following_id=user_id,
+        delta=1
+    )
+
     create_notification(
         db=db,
         recipient_id=user_id,
@@ -59,6 +76,8 @@ def follow_user(
     db.commit()
     db.refresh(follow)
 
+    background_tasks.add_task(timeline.backfill_follow, current_user.id, user_id)
+
     return follow
 
 
@@ -71,7 +90,7 @@ def follow_user(
 def unfollow_user(
     user_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: UserSnapshot = Depends(get_current_active_user)
 ):
     follow = db.query(Follow).filter(
         Follow.follower_id == current_user.id,
@@ -85,6 +104,15 @@ def unfollow_user(
         )
 
     db.delete(follow)
+
+    timeline.adjust_follow_counts(
+        db=db,
+        follower_id=current_user.id,
+        following_id=user_id,
+        delta=-1
+    )
+    timeline.remove_author(db=db, user_id=current_user.id, author_id=user_id)
+
     db.commit()
 
     return None
@@ -95,105 +123,101 @@ def unfollow_user(
 # =========================================================
 
 @router.get("/{user_id}/followers")
-def get_followers(
+async def get_followers(
     user_id: int,
-    page: int = Query(1, ge=1),
+    cursor: Optional[str] = None,
     page_size: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    include_total: bool = False,
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
+    if await db.get(User, user_id) is None:
         raise HTTPException(status_code=404, detail="User not found")
 
-    offset = (page - 1) * page_size
-
-    query = (
-        db.query(User)
-        .join(Follow, Follow.follower_id == User.id)
-        .filter(Follow.following_id == user_id)
+    stmt = (
+        select(Follow)
+        .options(selectinload(Follow.follower).selectinload(User.profile))
+        .where(Follow.following_id == user_id)
     )
 
-    total = query.count()
-
-    users = (
-        query
-        .offset(offset)
-        .limit(page_size)
-        .all()
+    follows, next_cursor = await keyset_page_async(
+        db, stmt, Follow.created_at, Follow.id, cursor, page_size
     )
 
+    total = None
+    if include_total:
+        total = await db.scalar(
+            select(func.count()).select_from(Follow).where(Follow.following_id == user_id)
+        )
+
     return {
         "total": total,
-        "page": page,
         "page_size": page_size,
-        "has_more": (offset + page_size) < total,
+        "has_more": next_cursor is not None,
+        "next_cursor": next_cursor,
         "users": [
             FollowUser(
-                id=u.id,
-                username=u.username,
-                profile_pic_url=getattr(u.profile, "profile_pic_url", None)
+                id=f.follower.id,
+                username=f.follower.username,
+                profile_pic_url=getattr(f.follower.profile, "profile_pic_url", None)
             )
-            for u in users
+            for f in follows
         ]
     }
 
 
-# =========================================================
-# Get Following
-# =========================================================
-
 @router.get("/{user_id}/following")
-def get_following(
+async def get_following(
     user_id: int,
-    page: int = Query(1, ge=1),
+    cursor: Optional[str] = None,
     page_size: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    include_total: bool = False,
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
+    if await db.get(User, user_id) is None:
         raise HTTPException(status_code=404, detail="User not found")
 
-    offset = (page - 1) * page_size
-
-    query = (
-        db.query(User)
-        .join(Follow, Follow.following_id == User.id)
-        .filter(Follow.follower_id == user_id)
+    stmt = (
+        select(Follow)
+        .options(selectinload(Follow.following).selectinload(User.profile))
+        .where(Follow.follower_id == user_id)
     )
 
-    total = query.count()
-
-    users = (
-        query
-        .offset(offset)
-        .limit(page_size)
-        .all()
+    follows, next_cursor = await keyset_page_async(
+        db, stmt, Follow.created_at, Follow.id, cursor, page_size
     )
 
+    total = None
+    if include_total:
+        total = await db.scalar(
+            select(func.count()).select_from(Follow).where(Follow.follower_id == user_id)
+        )
+
     return {
         "total": total,
-        "page": page,
         "page_size": page_size,
-        "has_more": (offset + page_size) < total,
+        "has_more": next_cursor is not None,
+        "next_cursor": next_cursor,
         "users": [
             FollowUser(
-                id=u.id,
-                username=u.username,
-                profile_pic_url=getattr(u.profile, "profile_pic_url", None)
+                id=f.following.id,
+                username=f.following.username,
+                profile_pic_url=getattr(f.following.profile, "profile_pic_url", None)
             )
-            for u in users
+            for f in follows
         ]
     }
 
 @router.get("/{user_id}/status")
-def follow_status(
+async def follow_status(
     user_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: UserSnapshot = Depends(get_current_active_user_async)
 ):
-    is_following = db.query(Follow).filter(
-        Follow.follower_id == current_user.id,
-        Follow.following_id == user_id
-    ).first() is not None
+    is_following = await db.scalar(
+        select(Follow.id).where(
+            Follow.follower_id == current_user.id,
+            Follow.following_id == user_id
+        )
+    ) is not None
 
     return {"is_following": is_following}
@@ -1,16 +1,19 @@
 # app/v1/media.py
 
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Path, status, UploadFile, File
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
-from datetime import datetime
 
-from app.database import get_db
-from app.models import User, Post, Media
+from app.database import get_async_db, get_db
+from app.models import Post, PostMedia, Media
 from app.schemas.posts import MediaResponse
-from app.api.deps import get_current_active_user
+from app.api.deps import get_current_active_user, get_current_active_user_async, get_read_db
+from app.core.identity import UserSnapshot
+from app.services.media_store import acquire_blob, add_references, release_blob
+from app.services.media_variants import FORMATS, MEDIA_TYPES, VARIANTS, variant_file
 from app.utils.file_handler import file_handler
-from app.config import settings
 
 router = APIRouter()
 
@@ -19,8 +22,8 @@ router = APIRouter()
 async def upload_media(
         file: UploadFile = File(...),
         media_type: str = "image",
-        db: Session = Depends(get_db),
-        current_user: User = Depends(get_current_active_user)
+        db: AsyncSession = Depends(get_async_db),
+        current_user: UserSnapshot = Depends(get_current_active_user_async)
 ):
     """
     Upload a media file (image or video)
@@ -40,27 +43,25 @@ async def upload_media(
 
     # Upload file
     if media_type == 'image':
-        media_url, file_path = await file_handler.save_image(file, 'posts')
+        stored = await file_handler.save_image(file)
     else:
-        media_url, file_path = await file_handler.save_video(file, 'posts')
+        stored = await file_handler.save_video(file)
 
     # Create media record
     new_media = Media(
-        Media_type=media_type,
-        Media_url=media_url,
-        Uploaded_at=datetime.utcnow()
+        user_id=current_user.id,
+        file_url=stored.url,
+        file_type=media_type
     )
 
     db.add(new_media)
-    db.commit()
-    db.refresh(new_media)
-
-    return MediaResponse(
-        Media_id=new_media.Media_id,
-        Media_type=new_media.Media_type,
-        Media_url=new_media.Media_url,
-        Uploaded_at=new_media.Uploaded_at
+    await db.run_sync(
+        lambda session: acquire_blob(db=session, stored=stored, file_type=media_type)
     )
+    await db.commit()
+    await db.refresh(new_media)
+
+    return MediaResponse.from_orm(new_media)
 
 
 @router.post("/posts/{post_id}/attach")
@@ -68,7 +69,7 @@ def attach_media_to_post(
         post_id: int,
         media_ids: List[int],
         db: Session = Depends(get_db),
-        current_user: User = Depends(get_current_active_user)
+        current_user: UserSnapshot = Depends(get_current_active_user)
 ):
     """
     Attach uploaded media to a post
@@ -78,7 +79,7 @@ def attach_media_to_post(
     """
 
     # Get post
-    post = db.query(Post).filter(Post.post_id == post_id).first()
+    post = db.query(Post).filter(Post.id == post_id).first()
 
     if not post:
         raise HTTPException(
@@ -87,32 +88,42 @@ def attach_media_to_post(
         )
 
     # Check ownership
-    if post.user_id != current_user.User_id:
+    if post.user_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You can only attach media to your own posts"
         )
 
-    # Get media objects
-    media_objects = db.query(Media).filter(Media.Media_id.in_(media_ids)).all()
+    # Get media objects (only the user's own uploads)
+    media_objects = db.query(Media).filter(
+        Media.id.in_(media_ids),
+        Media.user_id == current_user.id
+    ).all()
 
-    if len(media_objects) != len(media_ids):
+    if len(media_objects) != len(set(media_ids)):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="One or more media items not found"
         )
 
     # Attach media to post
+    attached = {m.file_url for m in post.media}
     for media in media_objects:
-        if media not in post.media:
-            post.media.append(media)
+        if media.file_url not in attached:
+            db.add(PostMedia(
+                post_id=post.id,
+                file_url=media.file_url,
+                file_type=media.file_type
+            ))
+            add_references(db=db, file_url=media.file_url)
+            attached.add(media.file_url)
 
     db.commit()
 
     return {
         "message": "Media attached successfully",
         "post_id": post_id,
-        "media_count": len(post.media)
+        "media_count": len(attached)
     }
 
 
@@ -120,15 +131,16 @@ def attach_media_to_post(
 def delete_media(
         media_id: int,
         db: Session = Depends(get_db),
-        current_user: User = Depends(get_current_active_user)
+        current_user: UserSnapshot = Depends(get_current_active_user)
 ):
     """
-    Delete a media file
+    Delete an uploaded media item
 
-    Note: This will remove the media from all posts it's attached to
+    Posts it was attached to keep the file; stored files are removed
+    once nothing references them (see app.services.media_store).
     """
 
-    media = db.query(Media).filter(Media.Media_id == media_id).first()
+    media = db.query(Media).filter(Media.id == media_id).first()
 
     if not media:
         raise HTTPException(
@@ -136,11 +148,14 @@ def delete_media(
             detail="Media not found"
         )
 
-    # Delete file from disk
-    file_path = settings.UPLOAD_DIR + media.Media_url.replace('/uploads', '')
-    file_handler.delete_file(file_path)
+    if media.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You can only delete your own media"
+        )
 
     # Delete from database
+    release_blob(db=db, file_url=media.file_url)
     db.delete(media)
     db.commit()
 
@@ -150,11 +165,11 @@ def delete_media(
 @router.get("/{media_id}", response_model=MediaResponse)
 def get_media(
         media_id: int,
-        db: Session = Depends(get_db)
+        db: Session = Depends(get_read_db)
 ):
     """Get media information by ID"""
 
-    media = db.query(Media).filter(Media.Media_id == media_id).first()
+    media = db.query(Media).filter(Media.id == media_id).first()
 
     if not media:
         raise HTTPException(
@@ -162,9 +177,41 @@ def get_media(
             detail="Media not found"
         )
 
-    return MediaResponse(
-        Media_id=media.Media_id,
-        Media_type=media.Media_type,
-        Media_url=media.Media_url,
-        Uploaded_at=media.Uploaded_at
-    )
\ No newline at end of file
+    return MediaResponse.from_orm(media)
+
+
+@router.get("/variants/{sha256}/{variant}.{image_format}", response_class=FileResponse)
+async def get_media_variant(
+        variant: str,
+        image_format: str,
+        sha256: str = Path(..., pattern="^[0-9a-f]{64}$")
+):
+    """
+    A resized rendition of a stored image, generated on first request
+
+    - **sha256**: name of the stored file (/uploads/media/<ab>/<sha256>.jpg)
+    - **variant**: 'thumb' (320px), 'feed' (1080px) or 'full' (2048px)
+    - **image_format**: 'webp' or 'jpg'
+
+    Renditions never change, so they are cacheable forever.
+    """
+
+    if variant not in VARIANTS or image_format not in FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Unknown image variant"
+        )
+
+    try:
+        path = await variant_file(sha256, variant, image_format)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Image not found"
+        )
+
+    return FileResponse(
+        path,
+        media_type=MEDIA_TYPES[image_format],
+        headers={"Cache-Control": "public, max-age=31536000, immutable"}
+    )
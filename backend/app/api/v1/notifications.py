@@ -1,56 +1,71 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from typing import Optional
 
 from app.database import get_db
 from app.models import Notification, User
-from app.schemas.notifications import NotificationResponse, NotificationActor
-from app.api.deps import get_current_active_user
+from app.schemas.notifications import (
+    NotificationResponse,
+    NotificationActor,
+    NotificationListResponse
+)
+from app.api.deps import (
+    get_current_active_user,
+    get_current_active_user_async,
+    get_async_read_db
+)
+from app.core.identity import UserSnapshot
+from app.utils.pagination import keyset_page_async
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
-@router.get("", response_model=List[NotificationResponse])
-def list_notifications(
-    page: int = Query(1, ge=1),
+@router.get("", response_model=NotificationListResponse)
+async def list_notifications(
+    cursor: Optional[str] = None,
     page_size: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: UserSnapshot = Depends(get_current_active_user_async)
 ):
-    offset = (page - 1) * page_size
-
-    notifications = (
-        db.query(Notification)
-        .filter(Notification.recipient_id == current_user.id)
-        .order_by(Notification.created_at.desc())
-        .offset(offset)
-        .limit(page_size)
-        .all()
+    stmt = (
+        select(Notification)
+        .options(selectinload(Notification.actor).selectinload(User.profile))
+        .where(Notification.recipient_id == current_user.id)
+    )
+
+    notifications, next_cursor = await keyset_page_async(
+        db, stmt, Notification.created_at, Notification.id, cursor, page_size
     )
 
-    return [
-        NotificationResponse(
-            id=n.id,
-            type=n.type,
-            object_id=n.object_id,
-            object_type=n.object_type,
-            is_read=n.is_read,
-            created_at=n.created_at,
-            actor=NotificationActor(
-                id=n.actor.id,
-                username=n.actor.username,
-                profile_pic_url=getattr(
-                    n.actor.profile, "profile_pic_url", None
+    return NotificationListResponse(
+        notifications=[
+            NotificationResponse(
+                id=n.id,
+                type=n.type,
+                object_id=n.object_id,
+                object_type=n.object_type,
+                is_read=n.is_read,
+                created_at=n.created_at,
+                actor=NotificationActor(
+                    id=n.actor.id,
+                    username=n.actor.username,
+                    profile_pic_url=getattr(
+                        n.actor.profile, "profile_pic_url", None
+                    )
                 )
             )
-        )
-        for n in notifications
-    ]
+            for n in notifications
+        ],
+        has_more=next_cursor is not None,
+        next_cursor=next_cursor
+    )
 
 @router.patch("/{notification_id}/read", status_code=status.HTTP_204_NO_CONTENT)
 def mark_notification_read(
     notification_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: UserSnapshot = Depends(get_current_active_user)
 ):
     notification = db.query(Notification).filter(
         Notification.id == notification_id,
@@ -69,7 +84,7 @@ def mark_notification_read(
 def mark_notification_read(
     notification_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: UserSnapshot = Depends(get_current_active_user)
 ):
     notification = db.query(Notification).filter(
         Notification.id == notification_id,
@@ -85,14 +100,18 @@ def mark_notification_read(
     return None
 
 @router.get("/unread-count")
-def unread_count(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+async def unread_count(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: UserSnapshot = Depends(get_current_active_user_async)
 ):
-    count = db.query(Notification).filter(
-        Notification.recipient_id == current_user.id,
-        Notification.is_read == False
-    ).count()
+    count = await db.scalar(
+        select(func.count())
+        .select_from(Notification)
+        .where(
+            Notification.recipient_id == current_user.id,
+            Notification.is_read == False
+        )
+    )
 
     return {"unread": count}
 
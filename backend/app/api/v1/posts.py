@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from typing import Optional
+from sqlalchemy import desc, func, select
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional
 
 from app.database import get_db
-from app.models import User, Post, Reaction, Sentiment, Comment, Bookmark
+from app.models import User, Post, Profile, Reaction, Sentiment, Comment, Bookmark, TrendingPost, Job
 from app.schemas.posts import (
     PostCreate,
     PostUpdate,
@@ -16,9 +18,17 @@ from app.schemas.posts import (
     SentimentAnalysis,
     MediaResponse
 )
-from app.api.deps import get_current_active_user, get_optional_user
-from app.utils.sentiment import analyze_sentiment
+from app.api.deps import (
+    get_current_active_user,
+    get_optional_user_async,
+    get_async_read_db
+)
+from app.core.identity import UserSnapshot
 from app.services.notifications import create_notification
+from app.services import engagement, rollups, timeline, trending
+from app.services.sentiment_jobs import score_or_enqueue
+from app.services.sentiment_cache import normalize_content
+from app.utils.pagination import keyset_page_async
 
 router = APIRouter(tags=["Posts"])
 
@@ -27,69 +37,122 @@ router = APIRouter(tags=["Posts"])
 # Helpers
 # =========================================================
 
+def build_post_responses(
+    posts: List[Post],
+    db: Session,
+    current_user: Optional[UserSnapshot] = None
+) -> List[dict]:
+    """
+    Hydrates a page of posts with sentiment, author info and viewer
+    flags using a fixed number of grouped queries, independent of how
+    many posts are on the page. Engagement counts come from the
+    denormalized counters on Post.
+    """
+    if not posts:
+        return []
+
+    post_ids = [p.id for p in posts]
+    author_ids = {p.user_id for p in posts}
+
+    # An edit queues a re-score; the old result stays visible (but not
+    # ready) until it runs
+    rescoring = select(Job.id).where(
+        Job.post_id == Sentiment.post_id,
+        Job.status.in_(["pending", "processing"])
+    ).exists()
+
+    sentiments = {}
+    rescoring_ids = set()
+    for s, is_rescoring in db.query(Sentiment, rescoring).filter(Sentiment.post_id.in_(post_ids)):
+        sentiments[s.post_id] = s
+        if is_rescoring:
+            rescoring_ids.add(s.post_id)
+
+    profiles = {
+        p.user_id: p
+        for p in db.query(Profile).filter(Profile.user_id.in_(author_ids))
+    }
+
+    liked_ids = set()
+    saved_ids = set()
+
+    if current_user:
+        liked_ids = {
+            post_id for (post_id,) in db.query(Reaction.post_id).filter(
+                Reaction.user_id == current_user.id,
+                Reaction.post_id.in_(post_ids)
+            )
+        }
+
+        saved_ids = {
+            post_id for (post_id,) in db.query(Bookmark.post_id).filter(
+                Bookmark.user_id == current_user.id,
+                Bookmark.post_id.in_(post_ids)
+            )
+        }
+
+    responses = []
+
+    for post in posts:
+        sentiment = None
+        post_sentiment = sentiments.get(post.id)
+        if post_sentiment:
+            sentiment = SentimentAnalysis(
+                label=post_sentiment.label,
+                score=float(post_sentiment.score),
+                confidence=0.9,
+                toxicity="none"
+            )
+
+        author = PostAuthor(
+            id=post.user.id,
+            username=post.user.username,
+            profile_pic_url=getattr(profiles.get(post.user_id), "profile_pic_url", None)
+        )
+
+        responses.append({
+            "id": post.id,
+            "user_id": post.user_id,
+            "author": author,
+            "content": post.content,
+            "visibility": post.visibility,
+            "location": post.location,
+            "platform": post.platform,
+            "created_at": post.created_at,
+            "updated_at": post.updated_at,
+            "likes_count": post.likes_count,
+            "comments_count": post.comments_count,
+            "shares_count": 0,
+            "sentiment": sentiment,
+            "sentiment_status": (
+                "ready" if sentiment and post.id not in rescoring_ids else "pending"
+            ),
+            "media": [MediaResponse.from_orm(m) for m in post.media],
+            "is_liked": post.id in liked_ids,
+            "is_saved": post.id in saved_ids
+        })
+
+    return responses
+
+
 def build_post_response(
     post: Post,
     db: Session,
-    current_user: Optional[User] = None
+    current_user: Optional[UserSnapshot] = None
 ) -> dict:
-    likes_count = db.query(Reaction).filter(
-        Reaction.post_id == post.id
-    ).count()
-
-    comments_count = db.query(Comment).filter(
-        Comment.post_id == post.id
-    ).count()
-
-    sentiment = None
-    if post.sentiment:
-        sentiment = SentimentAnalysis(
-            label=post.sentiment.label,
-            score=float(post.sentiment.score),
-            confidence=0.9,
-            toxicity="none"
-        )
+    return build_post_responses([post], db, current_user)[0]
 
-    is_liked = False
-    is_saved = False
 
-    if current_user:
-        is_liked = db.query(Reaction).filter(
-            Reaction.user_id == current_user.id,
-            Reaction.post_id == post.id
-        ).first() is not None
-
-        is_saved = db.query(Bookmark).filter(
-            Bookmark.user_id == current_user.id,
-            Bookmark.post_id == post.id
-        ).first() is not None
-
-    media = [MediaResponse.from_orm(m) for m in post.media]
-
-    author = PostAuthor(
-        id=post.user.id,
-        username=post.user.username,
-        profile_pic_url=getattr(post.user.profile, "profile_pic_url", None)
+async def build_post_responses_async(
+    posts: List[Post],
+    db: AsyncSession,
+    current_user: Optional[UserSnapshot] = None
+) -> List[dict]:
+    """build_post_responses() on an async session"""
+    return await db.run_sync(
+        lambda session: build_post_responses(posts, session, current_user)
     )
 
-    return {
-        "id": post.id,
-        "user_id": post.user_id,
-        "author": author,
-        "content": post.content,
-        "visibility": post.visibility,
-        "location": post.location,
-        "platform": post.platform,
-        "created_at": post.created_at,
-        "updated_at": post.updated_at,
-        "likes_count": likes_count,
-        "comments_count": comments_count,
-        "shares_count": 0,
-        "sentiment": sentiment,
-        "media": media,
-        "is_liked": is_liked,
-        "is_saved": is_saved
-    }
-
 
 # =========================================================
 # Create Post
@@ -98,11 +161,10 @@ def build_post_response(
 @router.post("", response_model=PostResponse, status_code=status.HTTP_201_CREATED)
 def create_post(
     post_data: PostCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: UserSnapshot = Depends(get_current_active_user)
 ):
-    sentiment_result = analyze_sentiment(post_data.content)
-
     post = Post(
         user_id=current_user.id,
         content=post_data.content,
@@ -112,16 +174,14 @@ def create_post(
     db.add(post)
     db.flush()
 
-    db.add(Sentiment(
-        post_id=post.id,
-        label=sentiment_result["label"],
-        score=sentiment_result["score"],
-        target_type="post"
-    ))
+    rollups.record_post(db=db, user_id=current_user.id)
+    score_or_enqueue(db=db, content=post.content, post_id=post.id)
 
     db.commit()
     db.refresh(post)
 
+    background_tasks.add_task(timeline.fan_out_post, post.id)
+
     return build_post_response(post, db, current_user)
 
 
@@ -130,25 +190,67 @@ def create_post(
 # =========================================================
 
 @router.get("/feed", response_model=FeedResponse)
-def get_feed(
+async def get_feed(
+    cursor: Optional[str] = None,
+    page_size: int = Query(20, ge=1, le=100),
+    include_total: bool = False,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Optional[UserSnapshot] = Depends(get_optional_user_async)
+):
+    """
+    Public feed, newest first. Pass `next_cursor` from the previous
+    response as `cursor` to continue; `include_total` adds an exact
+    (slower) count.
+    """
+    stmt = select(Post).where(Post.visibility == "public")
+
+    posts, next_cursor = await keyset_page_async(
+        db, stmt, Post.created_at, Post.id, cursor, page_size
+    )
+
+    total = None
+    if include_total:
+        total = await db.scalar(select(func.count()).select_from(stmt.subquery()))
+
+    return FeedResponse(
+        posts=await build_post_responses_async(posts, db, current_user),
+        total=total,
+        page_size=page_size,
+        has_more=next_cursor is not None,
+        next_cursor=next_cursor
+    )
+
+
+# =========================================================
+# Trending
+# =========================================================
+
+@router.get("/trending", response_model=FeedResponse)
+async def trending_posts(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_optional_user)
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Optional[UserSnapshot] = Depends(get_optional_user_async)
 ):
+    """
+    Ranked page from the materialized trending table
+    (refreshed every TRENDING_REFRESH_INTERVAL_SECONDS).
+    """
     offset = (page - 1) * page_size
 
-    query = (
-        db.query(Post)
-        .filter(Post.visibility == "public")
-        .order_by(desc(Post.created_at))
-    )
+    ranked = (await db.scalars(
+        select(Post)
+        .join(TrendingPost, TrendingPost.post_id == Post.id)
+        .where(TrendingPost.rank.isnot(None))
+        .order_by(TrendingPost.rank)
+        .offset(offset)
+        .limit(page_size)
+    )).all()
 
-    total = query.count()
-    posts = query.offset(offset).limit(page_size).all()
+    total = await db.scalar(select(func.max(TrendingPost.rank))) or 0
 
     return FeedResponse(
-        posts=[build_post_response(p, db, current_user) for p in posts],
+        posts=await build_post_responses_async(ranked, db, current_user),
         total=total,
         page=page,
         page_size=page_size,
@@ -161,12 +263,12 @@ def get_feed(
 # =========================================================
 
 @router.get("/{post_id}", response_model=PostResponse)
-def get_post(
+async def get_post(
     post_id: int,
-    db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_optional_user)
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Optional[UserSnapshot] = Depends(get_optional_user_async)
 ):
-    post = db.query(Post).filter(Post.id == post_id).first()
+    post = await db.get(Post, post_id)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
 
@@ -174,7 +276,7 @@ def get_post(
         if not current_user or post.user_id != current_user.id:
             raise HTTPException(status_code=403, detail="Access denied")
 
-    return build_post_response(post, db, current_user)
+    return (await build_post_responses_async([post], db, current_user))[0]
 
 
 # =========================================================
@@ -186,7 +288,7 @@ def update_post(
     post_id: int,
     post_update: PostUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: UserSnapshot = Depends(get_current_active_user)
 ):
     post = db.query(Post).filter(Post.id == post_id).first()
     if not post:
@@ -196,19 +298,10 @@ def update_post(
         raise HTTPException(status_code=403, detail="Not allowed")
 
     if post_update.content:
+        # Unchanged or whitespace-only edits keep the current sentiment
+        if normalize_content(post_update.content) != normalize_content(post.content):
+            score_or_enqueue(db=db, content=post_update.content, post_id=post.id)
         post.content = post_update.content
-        sentiment_result = analyze_sentiment(post_update.content)
-
-        if post.sentiment:
-            post.sentiment.label = sentiment_result["label"]
-            post.sentiment.score = sentiment_result["score"]
-        else:
-            db.add(Sentiment(
-                post_id=post.id,
-                label=sentiment_result["label"],
-                score=sentiment_result["score"],
-                target_type="post"
-            ))
 
     if post_update.visibility:
         post.visibility = post_update.visibility
@@ -228,7 +321,7 @@ def toggle_reaction(
     post_id: int,
     reaction_data: ReactionCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: UserSnapshot = Depends(get_current_active_user)
 ):
     post = db.query(Post).filter(Post.id == post_id).first()
     if not post:
@@ -239,110 +332,110 @@ def toggle_reaction(
         Reaction.post_id == post_id
     ).first()
 
+    user_reaction = None
+
     if reaction:
-        if reaction.reaction_type == reaction_data.reaction_type:
-            db.delete(reaction)
+        old_type = reaction.reaction_type
+
+        if old_type == reaction_data.reaction_type:
+            # Only the request that actually removed the row adjusts
+            # the counters, so concurrent double-toggles stay correct.
+            removed = db.query(Reaction).filter(
+                Reaction.id == reaction.id
+            ).delete(synchronize_session=False)
+
+            if removed:
+                engagement.remove_reaction(
+                    db=db, post_id=post_id, reaction_type=old_type
+                )
+                trending.record_engagement(
+                    db=db, post_id=post_id, weight=-trending.REACTION_WEIGHT
+                )
+                rollups.record_reaction(
+                    db=db,
+                    post_author_id=post.user_id,
+                    delta=-1,
+                    created_at=reaction.created_at
+                )
         else:
-            reaction.reaction_type = reaction_data.reaction_type
+            changed = db.query(Reaction).filter(
+                Reaction.id == reaction.id,
+                Reaction.reaction_type == old_type
+            ).update(
+                {Reaction.reaction_type: reaction_data.reaction_type},
+                synchronize_session=False
+            )
+
+            if changed:
+                engagement.change_reaction(
+                    db=db,
+                    post_id=post_id,
+                    old_type=old_type,
+                    new_type=reaction_data.reaction_type
+                )
+
+            user_reaction = reaction_data.reaction_type
     else:
-        db.add(Reaction(
-            user_id=current_user.id,
-            post_id=post_id,
-            reaction_type=reaction_data.reaction_type
-        ))
-
-        create_notification(
-            db=db,
-            recipient_id=post.user_id,
-            actor_id=current_user.id,
-            type="like",
-            object_id=post_id,
-            object_type="post"
-        )
+        try:
+            with db.begin_nested():
+                db.add(Reaction(
+                    user_id=current_user.id,
+                    post_id=post_id,
+                    reaction_type=reaction_data.reaction_type
+                ))
+        except IntegrityError:
+            # A concurrent request already inserted this user's reaction
+            pass
+        else:
+            engagement.add_reaction(
+                db=db,
+                post_id=post_id,
+                reaction_type=reaction_data.reaction_type
+            )
+            trending.record_engagement(
+                db=db, post_id=post_id, weight=trending.REACTION_WEIGHT
+            )
+            rollups.record_reaction(db=db, post_author_id=post.user_id)
+
+            create_notification(
+                db=db,
+                recipient_id=post.user_id,
+                actor_id=current_user.id,
+                type="like",
+                object_id=post_id,
+                object_type="post"
+            )
+
+        user_reaction = reaction_data.reaction_type
 
     db.commit()
-
-    reactions = db.query(Reaction).filter(
-        Reaction.post_id == post_id
-    ).all()
-
-    breakdown = {}
-    for r in reactions:
-        breakdown[r.reaction_type] = breakdown.get(r.reaction_type, 0) + 1
-
-    user_reaction = db.query(Reaction).filter(
-        Reaction.user_id == current_user.id,
-        Reaction.post_id == post_id
-    ).first()
+    db.refresh(post)
 
     return ReactionResponse(
-        total=len(reactions),
-        breakdown=breakdown,
-        user_reaction=user_reaction.reaction_type if user_reaction else None
+        total=post.likes_count,
+        breakdown=engagement.reaction_breakdown(post),
+        user_reaction=user_reaction
     )
 
 
-# =========================================================
-# Trending
-# =========================================================
-
-@router.get("/trending", response_model=FeedResponse)
-def trending_posts(
-    page: int = Query(1, ge=1),
-    page_size: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_optional_user)
-):
-    offset = (page - 1) * page_size
-
-    posts = db.query(Post).filter(
-        Post.visibility == "public"
-    ).all()
-
-    scored = []
-    for post in posts:
-        likes = db.query(Reaction).filter(
-            Reaction.post_id == post.id
-        ).count()
-
-        comments = db.query(Comment).filter(
-            Comment.post_id == post.id
-        ).count()
-
-        scored.append((post, likes + comments * 2))
-
-    scored.sort(key=lambda x: x[1], reverse=True)
-
-    paginated = scored[offset: offset + page_size]
-    result_posts = [p[0] for p in paginated]
-
-    return FeedResponse(
-        posts=[build_post_response(p, db, current_user) for p in result_posts],
-        total=len(scored),
-        page=page,
-        page_size=page_size,
-        has_more=(offset + page_size) < len(scored)
-    )
-
 # =========================================================
 # Get Posts By User (Profile)
 # =========================================================
 
 @router.get("/user/{user_id}", response_model=FeedResponse)
-def get_posts_by_user(
+async def get_posts_by_user(
     user_id: int,
-    db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_optional_user)
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Optional[UserSnapshot] = Depends(get_optional_user_async)
 ):
-    posts = (
-        db.query(Post)
-        .filter(Post.user_id == user_id)
+    posts = (await db.scalars(
+        select(Post)
+        .where(Post.user_id == user_id)
         .order_by(desc(Post.created_at))
-        .all()
-    )
+    )).all()
 
     return FeedResponse(
-        posts=[build_post_response(p, db, current_user) for p in posts],
+        posts=await build_post_responses_async(posts, db, current_user),
         total=len(posts),
         page=1,
         page_size=len(posts),
@@ -4,9 +4,10 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.models import Profile, User
+from app.models import Profile
 from app.schemas.profiles import ProfileResponse, ProfileUpdate
-from app.api.deps import get_current_active_user
+from app.api.deps import get_current_active_user, get_read_db
+from app.core.identity import UserSnapshot, invalidate_user
 
 router = APIRouter()
 
@@ -14,7 +15,7 @@ router = APIRouter()
 @router.get("/{user_id}", response_model=ProfileResponse)
 def get_profile_by_user_id(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     profile = db.query(Profile).filter(Profile.user_id == user_id).first()
 
@@ -27,8 +28,8 @@ def get_profile_by_user_id(
 # 🔒 AUTH TODO — WILL WORK LATER
 @router.get("/me", response_model=ProfileResponse)
 def get_my_profile(
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_active_user),
+    db: Session = Depends(get_read_db),
 ):
     profile = db.query(Profile).filter(Profile.user_id == current_user.id).first()
 
@@ -41,7 +42,7 @@ def get_my_profile(
 @router.put("/me", response_model=ProfileResponse)
 def update_my_profile(
     payload: ProfileUpdate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserSnapshot = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
     profile = db.query(Profile).filter(Profile.user_id == current_user.id).first()
@@ -54,5 +55,6 @@ def update_my_profile(
 
     db.commit()
     db.refresh(profile)
+    invalidate_user(current_user.id)
 
     return profile
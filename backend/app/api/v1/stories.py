@@ -1,30 +1,114 @@
 # app/v1/stories.py
 
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_
+from sqlalchemy import desc
 from typing import List, Optional
-from datetime import datetime, timedelta
-
-from app.database import get_db
-from app.models import User, Story
-from app.schemas.stories import StoryCreate, StoryResponse, StoryAuthor, StoriesListResponse
-from app.api.deps import get_current_active_user, get_optional_user
-from app.utils.file_handler import file_handler
-from app.config import settings
+from datetime import datetime, timedelta, timezone
+
+from app.database import get_async_db, get_db
+from app.models import User, Story, Follow
+from app.schemas.stories import StoryResponse, StoryAuthor, StoriesListResponse
+from app.api.deps import (
+    get_current_active_user,
+    get_current_active_user_async,
+    get_optional_user,
+    get_read_db
+)
+from app.core.identity import UserSnapshot
+from app.services.media_store import acquire_blob, release_blob
+from app.utils.file_handler import StoredFile, file_handler
 
 router = APIRouter()
 
+STORY_LIFETIME = timedelta(hours=24)
+
 # Story table to track views (in-memory for now, should be in DB)
 story_views = {}  # {story_id: [user_id1, user_id2, ...]}
 
 
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _aware(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes even for timezone-aware columns
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+# =========================================================
+# Helpers
+# =========================================================
+
+def build_story_responses(
+    stories: List[Story],
+    current_user: Optional[UserSnapshot] = None
+) -> List[StoryResponse]:
+    now = _utcnow()
+    responses = []
+
+    for story in stories:
+        viewers = story_views.get(story.id, [])
+
+        responses.append(StoryResponse(
+            id=story.id,
+            user_id=story.user_id,
+            author=StoryAuthor(
+                id=story.author.id,
+                username=story.author.username,
+                profile_pic_url=getattr(story.author.profile, "profile_pic_url", None)
+            ),
+            media_url=story.media_url,
+            media_type=story.media_type,
+            created_at=story.created_at,
+            expires_at=story.expires_at,
+            is_expired=_aware(story.expires_at) <= now,
+            views_count=len(viewers),
+            is_viewed=current_user is not None and current_user.id in viewers
+        ))
+
+    return responses
+
+
+def story_for(user_id: int, stored: StoredFile, media_type: str) -> Story:
+    """A new story for an upload, expiring STORY_LIFETIME from now"""
+    created_at = _utcnow()
+    return Story(
+        user_id=user_id,
+        media_url=stored.url,
+        media_type=media_type,
+        created_at=created_at,
+        expires_at=created_at + STORY_LIFETIME
+    )
+
+
+def created_story_response(story: Story, author: UserSnapshot) -> StoryResponse:
+    return StoryResponse(
+        id=story.id,
+        user_id=story.user_id,
+        author=StoryAuthor(
+            id=author.id,
+            username=author.username
+        ),
+        media_url=story.media_url,
+        media_type=story.media_type,
+        created_at=story.created_at,
+        expires_at=story.expires_at,
+        is_expired=False
+    )
+
+
+# =========================================================
+# Create Story
+# =========================================================
+
 @router.post("", response_model=StoryResponse, status_code=status.HTTP_201_CREATED)
 async def create_story(
         media_type: str,
         file: UploadFile = File(...),
-        db: Session = Depends(get_db),
-        current_user: User = Depends(get_current_active_user)
+        db: AsyncSession = Depends(get_async_db),
+        current_user: UserSnapshot = Depends(get_current_active_user_async)
 ):
     """
     Create a new story (24-hour expiry)
@@ -44,52 +128,29 @@ async def create_story(
 
     # Upload media
     if media_type == 'image':
-        media_url, file_path = await file_handler.save_image(file, 'stories')
+        stored = await file_handler.save_image(file)
     else:
-        media_url, file_path = await file_handler.save_video(file, 'stories')
-
-    # Calculate expiry time (24 hours from now)
-    created_at = datetime.utcnow()
-    expired_at = created_at + timedelta(hours=24)
-
-    # Create story
-    new_story = Story(
-        user_id=current_user.User_id,
-        Media_Url=media_url,
-        MediaType=media_type,
-        Created_at=created_at,
-        Expired_at=expired_at
-    )
+        stored = await file_handler.save_video(file)
 
-    db.add(new_story)
-    db.commit()
-    db.refresh(new_story)
+    new_story = story_for(current_user.id, stored, media_type)
 
-    # Build response
-    author = StoryAuthor(
-        User_id=current_user.User_id,
-        Username=current_user.Username,
-        Profile_pic_url=current_user.Profile_pic_url
+    db.add(new_story)
+    await db.run_sync(
+        lambda session: acquire_blob(db=session, stored=stored, file_type=media_type)
     )
+    await db.commit()
 
-    return StoryResponse(
-        Story_id=new_story.Story_id,
-        user_id=new_story.user_id,
-        author=author,
-        Media_Url=new_story.Media_Url,
-        MediaType=new_story.MediaType,
-        Created_at=new_story.Created_at,
-        Expired_at=new_story.Expired_at,
-        is_expired=False,
-        views_count=0,
-        is_viewed=False
-    )
+    return created_story_response(new_story, current_user)
 
 
+# =========================================================
+# Read Stories
+# =========================================================
+
 @router.get("", response_model=StoriesListResponse)
 def get_active_stories(
-        db: Session = Depends(get_db),
-        current_user: Optional[User] = Depends(get_optional_user)
+        db: Session = Depends(get_read_db),
+        current_user: Optional[UserSnapshot] = Depends(get_optional_user)
 ):
     """
     Get all active (non-expired) stories from followed users
@@ -97,80 +158,70 @@ def get_active_stories(
     Stories are grouped by user and ordered by recency
     """
 
-    # Get current time
-    now = datetime.utcnow()
+    now = _utcnow()
 
     # Get stories from followed users + own stories
     if current_user:
-        followed_ids = [u.User_id for u in current_user.following]
-        followed_ids.append(current_user.User_id)
+        author_ids = [current_user.id] + [
+            following_id for (following_id,) in
+            db.query(Follow.following_id).filter(Follow.follower_id == current_user.id)
+        ]
 
         stories = db.query(Story).filter(
-            and_(
-                Story.user_id.in_(followed_ids),
-                Story.Expired_at > now
-            )
-        ).order_by(desc(Story.Created_at)).all()
+            Story.user_id.in_(author_ids),
+            Story.expires_at > now
+        ).order_by(desc(Story.created_at)).all()
     else:
         # Public stories (for non-authenticated users)
         stories = db.query(Story).filter(
-            Story.Expired_at > now
-        ).order_by(desc(Story.Created_at)).limit(50).all()
+            Story.expires_at > now
+        ).order_by(desc(Story.created_at)).limit(50).all()
 
-    # Build response
-    stories_response = []
-    has_unviewed = False
+    responses = build_story_responses(stories, current_user)
 
-    for story in stories:
-        # Check if expired
-        is_expired = story.Expired_at <= now
-
-        # Get views count
-        views_count = len(story_views.get(story.Story_id, []))
-
-        # Check if current user viewed
-        is_viewed = False
-        if current_user:
-            is_viewed = current_user.User_id in story_views.get(story.Story_id, [])
-            if not is_viewed:
-                has_unviewed = True
-
-        # Get author
-        author = StoryAuthor(
-            User_id=story.author.User_id,
-            Username=story.author.Username,
-            Profile_pic_url=story.author.Profile_pic_url
+    return StoriesListResponse(
+        stories=responses,
+        total=len(responses),
+        has_unviewed=current_user is not None and any(
+            not r.is_viewed for r in responses
         )
+    )
 
-        stories_response.append(StoryResponse(
-            Story_id=story.Story_id,
-            user_id=story.user_id,
-            author=author,
-            Media_Url=story.Media_Url,
-            MediaType=story.MediaType,
-            Created_at=story.Created_at,
-            Expired_at=story.Expired_at,
-            is_expired=is_expired,
-            views_count=views_count,
-            is_viewed=is_viewed
-        ))
 
-    return StoriesListResponse(
-        stories=stories_response,
-        total=len(stories_response),
-        has_unviewed=has_unviewed
-    )
+@router.get("/user/{user_id}", response_model=List[StoryResponse])
+def get_user_stories(
+        user_id: int,
+        db: Session = Depends(get_read_db),
+        current_user: Optional[UserSnapshot] = Depends(get_optional_user)
+):
+    """
+    Get all active stories from a specific user
+    """
+
+    # Verify user exists
+    if db.query(User.id).filter(User.id == user_id).first() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+
+    stories = db.query(Story).filter(
+        Story.user_id == user_id,
+        Story.expires_at > _utcnow()
+    ).order_by(desc(Story.created_at)).all()
+
+    return build_story_responses(stories, current_user)
 
 
 @router.get("/{story_id}", response_model=StoryResponse)
 def get_story(
         story_id: int,
-        db: Session = Depends(get_db),
-        current_user: Optional[User] = Depends(get_optional_user)
+        db: Session = Depends(get_read_db),
+        current_user: Optional[UserSnapshot] = Depends(get_optional_user)
 ):
     """Get a specific story by ID"""
 
-    story = db.query(Story).filter(Story.Story_id == story_id).first()
+    story = db.query(Story).filter(Story.id == story_id).first()
 
     if not story:
         raise HTTPException(
@@ -178,42 +229,18 @@ def get_story(
             detail="Story not found"
         )
 
-    # Check if expired
-    now = datetime.utcnow()
-    is_expired = story.Expired_at <= now
+    return build_story_responses([story], current_user)[0]
 
-    # Get views
-    views_count = len(story_views.get(story_id, []))
-    is_viewed = False
-    if current_user:
-        is_viewed = current_user.User_id in story_views.get(story_id, [])
-
-    # Get author
-    author = StoryAuthor(
-        User_id=story.author.User_id,
-        Username=story.author.Username,
-        Profile_pic_url=story.author.Profile_pic_url
-    )
-
-    return StoryResponse(
-        Story_id=story.Story_id,
-        user_id=story.user_id,
-        author=author,
-        Media_Url=story.Media_Url,
-        MediaType=story.MediaType,
-        Created_at=story.Created_at,
-        Expired_at=story.Expired_at,
-        is_expired=is_expired,
-        views_count=views_count,
-        is_viewed=is_viewed
-    )
 
+# =========================================================
+# Views & Deletion
+# =========================================================
 
 @router.post("/{story_id}/view")
 def mark_story_viewed(
         story_id: int,
         db: Session = Depends(get_db),
-        current_user: User = Depends(get_current_active_user)
+        current_user: UserSnapshot = Depends(get_current_active_user)
 ):
     """
     Mark a story as viewed by current user
@@ -221,24 +248,20 @@ def mark_story_viewed(
     This increments the view count and marks the story as seen
     """
 
-    story = db.query(Story).filter(Story.Story_id == story_id).first()
-
-    if not story:
+    if db.query(Story.id).filter(Story.id == story_id).first() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Story not found"
         )
 
     # Add user to viewers list
-    if story_id not in story_views:
-        story_views[story_id] = []
-
-    if current_user.User_id not in story_views[story_id]:
-        story_views[story_id].append(current_user.User_id)
+    viewers = story_views.setdefault(story_id, [])
+    if current_user.id not in viewers:
+        viewers.append(current_user.id)
 
     return {
         "message": "Story marked as viewed",
-        "views_count": len(story_views[story_id])
+        "views_count": len(viewers)
     }
 
 
@@ -246,13 +269,13 @@ def mark_story_viewed(
 def delete_story(
         story_id: int,
         db: Session = Depends(get_db),
-        current_user: User = Depends(get_current_active_user)
+        current_user: UserSnapshot = Depends(get_current_active_user)
 ):
     """
     Delete a story. Only the author can delete their story.
     """
 
-    story = db.query(Story).filter(Story.Story_id == story_id).first()
+    story = db.query(Story).filter(Story.id == story_id).first()
 
     if not story:
         raise HTTPException(
@@ -261,80 +284,18 @@ def delete_story(
         )
 
     # Check ownership
-    if story.user_id != current_user.User_id:
+    if story.user_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You can only delete your own stories"
         )
 
-    # Delete media file
-    file_path = settings.UPLOAD_DIR + story.Media_Url.replace('/uploads', '')
-    file_handler.delete_file(file_path)
-
-    # Delete from views tracking
-    if story_id in story_views:
-        del story_views[story_id]
-
-    # Delete story
+    # Delete story; the file goes once nothing references it
+    release_blob(db=db, file_url=story.media_url)
     db.delete(story)
     db.commit()
 
-    return None
-
-
-@router.get("/user/{user_id}", response_model=List[StoryResponse])
-def get_user_stories(
-        user_id: int,
-        db: Session = Depends(get_db),
-        current_user: Optional[User] = Depends(get_optional_user)
-):
-    """
-    Get all active stories from a specific user
-    """
-
-    # Verify user exists
-    user = db.query(User).filter(User.User_id == user_id).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
-
-    # Get active stories
-    now = datetime.utcnow()
-    stories = db.query(Story).filter(
-        and_(
-            Story.user_id == user_id,
-            Story.Expired_at > now
-        )
-    ).order_by(desc(Story.Created_at)).all()
-
-    # Build response
-    stories_response = []
-    for story in stories:
-        is_expired = story.Expired_at <= now
-        views_count = len(story_views.get(story.Story_id, []))
-        is_viewed = False
-        if current_user:
-            is_viewed = current_user.User_id in story_views.get(story.Story_id, [])
-
-        author = StoryAuthor(
-            User_id=user.User_id,
-            Username=user.Username,
-            Profile_pic_url=user.Profile_pic_url
-        )
-
-        stories_response.append(StoryResponse(
-            Story_id=story.Story_id,
-            user_id=story.user_id,
-            author=author,
-            Media_Url=story.Media_Url,
-            MediaType=story.MediaType,
-            Created_at=story.Created_at,
-            Expired_at=story.Expired_at,
-            is_expired=is_expired,
-            views_count=views_count,
-            is_viewed=is_viewed
-        ))
+    # Delete from views tracking
+    story_views.pop(story_id, None)
 
-    return stories_response
\ No newline at end of file
+    return None
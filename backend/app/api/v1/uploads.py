@@ -0,0 +1,346 @@
+# app/v1/uploads.py
+
+"""
+Resumable uploads for large media.
+
+    POST /uploads                      open a session (declares type and size)
+    PUT  /uploads/{id}?offset=N        append the request body at byte N
+    GET  /uploads/{id}                 how many bytes have arrived
+    POST /uploads/{id}/complete        create the media item or story
+
+A dropped chunk is resumed by asking for the offset and sending the rest
+from there. Chunks must be sent in order; one chunk is written at a time.
+"""
+
+import os
+import uuid
+from contextlib import suppress
+from datetime import datetime, timedelta, timezone
+from typing import Union
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy import delete, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_active_user_async
+from app.core.identity import UserSnapshot
+from app.api.v1.stories import created_story_response, story_for
+from app.config import settings
+from app.database import get_async_db
+from app.models import Media, UploadSession
+from app.schemas.posts import MediaResponse
+from app.schemas.stories import StoryResponse
+from app.schemas.uploads import UploadSessionCreate, UploadSessionResponse
+from app.services.media_store import acquire_blob
+from app.services.uploads import (
+    claimed_path,
+    final_digest,
+    forget_digest,
+    record_digest,
+    running_digest,
+    session_path
+)
+from app.utils.file_handler import file_handler
+
+router = APIRouter()
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _aware(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes even for timezone-aware columns
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _session_response(upload: UploadSession) -> UploadSessionResponse:
+    return UploadSessionResponse(
+        id=upload.id,
+        purpose=upload.purpose,
+        media_type=upload.media_type,
+        total_size=upload.total_size,
+        offset=upload.received,
+        complete=upload.received == upload.total_size,
+        expires_at=_aware(upload.updated_at) + timedelta(seconds=settings.UPLOAD_SESSION_TTL_SECONDS)
+    )
+
+
+async def _owned_session(db: AsyncSession, upload_id: str, user: UserSnapshot) -> UploadSession:
+    upload = await db.get(UploadSession, upload_id)
+
+    if upload is None or upload.user_id != user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload not found"
+        )
+
+    return upload
+
+
+def _offset_conflict(expected: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"Next chunk must start at offset {expected}",
+        headers={"Upload-Offset": str(expected)}
+    )
+
+
+# =========================================================
+# Sessions
+# =========================================================
+
+@router.post("", response_model=UploadSessionResponse, status_code=status.HTTP_201_CREATED)
+async def create_upload(
+        payload: UploadSessionCreate,
+        db: AsyncSession = Depends(get_async_db),
+        current_user: UserSnapshot = Depends(get_current_active_user_async)
+):
+    """
+    Start a resumable upload
+
+    - **purpose**: 'media' (like /media/upload) or 'story' (like POST /stories)
+    - **media_type**: 'image' or 'video'
+    - **total_size**: exact size of the file in bytes
+    """
+
+    is_valid, error_msg = file_handler.validate_content_type(payload.content_type, payload.media_type)
+    if not is_valid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=error_msg
+        )
+
+    max_size = file_handler.max_size(payload.media_type)
+    if payload.total_size > max_size:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{payload.media_type.capitalize()} size exceeds maximum of {max_size / 1024 / 1024}MB"
+        )
+
+    upload = UploadSession(
+        id=uuid.uuid4().hex,
+        user_id=current_user.id,
+        purpose=payload.purpose,
+        media_type=payload.media_type,
+        filename=payload.filename,
+        content_type=payload.content_type,
+        total_size=payload.total_size,
+        received=0,
+        updated_at=_utcnow()
+    )
+
+    path = session_path(upload.id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.touch()
+
+    db.add(upload)
+    await db.commit()
+
+    return _session_response(upload)
+
+
+@router.get("/{upload_id}", response_model=UploadSessionResponse)
+async def get_upload(
+        upload_id: str,
+        db: AsyncSession = Depends(get_async_db),
+        current_user: UserSnapshot = Depends(get_current_active_user_async)
+):
+    """Upload progress; resume by sending the next chunk at `offset`"""
+    return _session_response(await _owned_session(db, upload_id, current_user))
+
+
+@router.put("/{upload_id}", response_model=UploadSessionResponse)
+async def upload_chunk(
+        upload_id: str,
+        request: Request,
+        offset: int = Query(..., ge=0),
+        db: AsyncSession = Depends(get_async_db),
+        current_user: UserSnapshot = Depends(get_current_active_user_async)
+):
+    """
+    Append the raw request body at `offset`
+
+    `offset` must equal the bytes received so far (409 with an
+    Upload-Offset header otherwise). Any chunk size is accepted; the body
+    is streamed to disk.
+    """
+
+    upload = await _owned_session(db, upload_id, current_user)
+    received, total_size = upload.received, upload.total_size
+
+    if offset != received:
+        raise _offset_conflict(received)
+
+    # Claim the offset before touching the file; a claim left by a
+    # writer that died is taken over once the session looks idle
+    writer = uuid.uuid4().hex
+    abandoned = _utcnow() - timedelta(seconds=settings.UPLOAD_SESSION_TTL_SECONDS)
+    claim = await db.execute(
+        update(UploadSession)
+        .where(
+            UploadSession.id == upload_id,
+            UploadSession.received == offset,
+            or_(UploadSession.writer.is_(None), UploadSession.updated_at < abandoned)
+        )
+        .values(writer=writer, updated_at=_utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    # Don't hold a connection while the body streams in
+    await db.commit()
+
+    if claim.rowcount != 1:
+        await db.refresh(upload)
+        if upload.received == offset:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"A chunk at offset {offset} is already being written",
+                headers={"Upload-Offset": str(offset)}
+            )
+        raise _offset_conflict(upload.received)
+
+    async def release() -> None:
+        await db.execute(
+            update(UploadSession)
+            .where(UploadSession.id == upload_id, UploadSession.writer == writer)
+            .values(writer=None)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+    path = session_path(upload_id)
+    if not path.exists():
+        await release()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Upload is being completed"
+        )
+
+    digest = running_digest(upload_id, offset)
+    try:
+        # Drop whatever a failed writer left past the committed offset
+        os.truncate(path, offset)
+        written = await file_handler.append_chunk(
+            request.stream(), path, offset, total_size - offset, digest
+        )
+    except Exception:
+        with suppress(FileNotFoundError):
+            os.truncate(path, offset)
+        forget_digest(upload_id)
+        await release()
+        raise
+
+    result = await db.execute(
+        update(UploadSession)
+        .where(UploadSession.id == upload_id, UploadSession.writer == writer)
+        .values(received=offset + written, writer=None, updated_at=_utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+    if result.rowcount != 1:
+        # Our claim was taken over; the new writer owns the file now
+        forget_digest(upload_id)
+        await db.refresh(upload)
+        raise _offset_conflict(upload.received)
+
+    record_digest(upload_id, offset + written, digest)
+    await db.refresh(upload)
+
+    return _session_response(upload)
+
+
+@router.post(
+    "/{upload_id}/complete",
+    response_model=Union[MediaResponse, StoryResponse],
+    status_code=status.HTTP_201_CREATED
+)
+async def complete_upload(
+        upload_id: str,
+        db: AsyncSession = Depends(get_async_db),
+        current_user: UserSnapshot = Depends(get_current_active_user_async)
+):
+    """
+    Finish an upload: the file is moved into place (images are
+    transcoded) and the media item or story is created, exactly as the
+    single-request endpoints would.
+    """
+
+    upload = await _owned_session(db, upload_id, current_user)
+
+    if upload.received != upload.total_size:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Upload incomplete: {upload.received} of {upload.total_size} bytes received",
+            headers={"Upload-Offset": str(upload.received)}
+        )
+
+    # Claim the part file so concurrent completions can't both use it
+    claimed = claimed_path(upload_id)
+    try:
+        os.replace(session_path(upload_id), claimed)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Upload is already being completed"
+        )
+    os.utime(claimed)  # keep the sweeper off it
+    await db.commit()
+
+    try:
+        stored = await file_handler.store_file(
+            claimed,
+            upload.media_type,
+            upload.content_type,
+            upload.total_size,
+            final_digest(upload_id, upload.total_size)
+        )
+    except HTTPException as exc:
+        if exc.status_code == status.HTTP_503_SERVICE_UNAVAILABLE:
+            # Busy: hand the file back so the client can retry completion
+            os.replace(claimed, session_path(upload_id))
+        else:
+            # The content itself was rejected
+            await db.execute(delete(UploadSession).where(UploadSession.id == upload_id))
+            await db.commit()
+            forget_digest(upload_id)
+        raise
+    finally:
+        file_handler.delete_file(str(claimed))
+
+    if upload.purpose == 'media':
+        created = Media(user_id=current_user.id, file_url=stored.url, file_type=upload.media_type)
+    else:
+        created = story_for(current_user.id, stored, upload.media_type)
+
+    db.add(created)
+    await db.run_sync(
+        lambda session: acquire_blob(db=session, stored=stored, file_type=upload.media_type)
+    )
+    await db.execute(delete(UploadSession).where(UploadSession.id == upload_id))
+    await db.commit()
+    forget_digest(upload_id)
+
+    if upload.purpose == 'media':
+        await db.refresh(created)
+        return MediaResponse.from_orm(created)
+    return created_story_response(created, current_user)
+
+
+@router.delete("/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def cancel_upload(
+        upload_id: str,
+        db: AsyncSession = Depends(get_async_db),
+        current_user: UserSnapshot = Depends(get_current_active_user_async)
+):
+    """Abandon an upload and discard the bytes received"""
+
+    upload = await _owned_session(db, upload_id, current_user)
+
+    await db.delete(upload)
+    await db.commit()
+
+    forget_digest(upload_id)
+    file_handler.delete_file(str(session_path(upload_id)))
+
+    return None
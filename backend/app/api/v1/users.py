@@ -5,14 +5,15 @@ from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models import User
 from app.schemas.users import UserResponse, UserUpdate
-from app.api.deps import get_current_active_user
+from app.api.deps import get_current_active_user, get_read_db
+from app.core.identity import UserSnapshot, invalidate_user
 
 router = APIRouter()
 
 
 @router.get("/me", response_model=UserResponse)
 def read_current_user(
-    current_user: User = Depends(get_current_active_user)
+    current_user: UserSnapshot = Depends(get_current_active_user)
 ):
     return current_user
 
@@ -20,7 +21,7 @@ def read_current_user(
 @router.get("/{user_id}", response_model=UserResponse)
 def get_user_by_id(
     user_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     user = db.query(User).filter(User.id == user_id).first()
 
@@ -37,15 +38,18 @@ def get_user_by_id(
 def update_current_user(
     data: UserUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserSnapshot = Depends(get_current_active_user),
 ):
+    user = db.query(User).filter(User.id == current_user.id).first()
+
     if data.username:
-        current_user.username = data.username
+        user.username = data.username
 
     if data.email:
-        current_user.email = data.email
+        user.email = data.email
 
     db.commit()
-    db.refresh(current_user)
+    db.refresh(user)
+    invalidate_user(user.id)
 
-    return current_user
+    return user
@@ -0,0 +1,91 @@
+# app/core/identity.py
+
+"""
+In-process cache of authenticated identities.
+
+Resolving a bearer token normally costs a `SELECT users` per request; the
+auth dependencies instead keep a small immutable snapshot of the user,
+keyed by user id and the token's `iat`, for AUTH_USER_CACHE_TTL_SECONDS.
+Writes that change what the snapshot holds (account updates, role or
+suspension changes, profile updates) call invalidate_user(); other
+workers pick the change up within the TTL.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import User
+from app.utils.cache import LRUCache
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """Detached, read-only view of a User for request handling"""
+
+    id: int
+    username: str
+    email: str
+    role: str
+    is_active: bool
+    created_at: Optional[datetime]
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserSnapshot":
+        return cls(
+            id=user.id,
+            username=user.username,
+            email=user.email,
+            role=user.role or "user",
+            is_active=user.is_active is not False,
+            created_at=user.created_at
+        )
+
+
+identity_cache = LRUCache(
+    max_entries=settings.AUTH_USER_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.AUTH_USER_CACHE_TTL_SECONDS
+)
+
+
+def load_identity(db: Session, user_id: int, issued_at: Optional[int] = None) -> Optional[UserSnapshot]:
+    """The user's snapshot, from the cache or one primary-key lookup"""
+    key = (user_id, issued_at)
+
+    snapshot = identity_cache.get(key)
+    if snapshot is None:
+        user = db.query(User).filter(User.id == user_id).first()
+        if user is None:
+            return None
+        snapshot = UserSnapshot.from_user(user)
+        identity_cache.set(key, snapshot)
+
+    return snapshot
+
+
+async def load_identity_async(
+    db: AsyncSession,
+    user_id: int,
+    issued_at: Optional[int] = None
+) -> Optional[UserSnapshot]:
+    """load_identity() for async sessions"""
+    key = (user_id, issued_at)
+
+    snapshot = identity_cache.get(key)
+    if snapshot is None:
+        user = await db.get(User, user_id)
+        if user is None:
+            return None
+        snapshot = UserSnapshot.from_user(user)
+        identity_cache.set(key, snapshot)
+
+    return snapshot
+
+
+def invalidate_user(user_id: int) -> None:
+    """Forget every cached snapshot of the user (all tokens)"""
+    identity_cache.discard_where(lambda key: key[0] == user_id)
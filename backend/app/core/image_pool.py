@@ -0,0 +1,121 @@
+# app/core/image_pool.py
+
+"""
+Image transcoding pool.
+
+Pillow decoding, resampling and JPEG optimization hold the GIL for
+hundreds of milliseconds on large uploads, so they run in a pool of
+IMAGE_WORKERS processes and the event loop only awaits the result.
+At most IMAGE_MAX_QUEUE jobs wait for a free worker; beyond that
+ImageProcessorBusy is raised right away. A job that takes longer than
+IMAGE_JOB_TIMEOUT_SECONDS is abandoned with ImageProcessingTimeout; its
+worker slot is only given back once the process has actually finished.
+"""
+
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+
+
+class ImageProcessorBusy(RuntimeError):
+    """All image workers are busy and the wait queue is full"""
+
+
+class ImageProcessingTimeout(TimeoutError):
+    """An image job exceeded IMAGE_JOB_TIMEOUT_SECONDS"""
+
+
+class ImageProcessor:
+    """Bounded process pool for CPU-heavy image work with an async API"""
+
+    def __init__(self, workers: int, max_queue: int, timeout: float):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn: forking a process that runs threads can deadlock
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._pool
+
+    def _release(self, _future=None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    async def run(self, func: Callable, *args):
+        """
+        Run picklable `func(*args)` in a worker process.
+        Raises ImageProcessorBusy or ImageProcessingTimeout.
+        """
+        if self.workers <= 0:
+            # Pool disabled: process on the shared request threadpool
+            return await run_in_threadpool(func, *args)
+
+        with self._lock:
+            if self._in_flight >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise ImageProcessorBusy("Image processing is saturated")
+            self._in_flight += 1
+
+        try:
+            future = self._executor().submit(func, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory): start a fresh pool
+            self._release()
+            self.shutdown()
+            raise
+        except BaseException:
+            self._release()
+            raise
+
+        future.add_done_callback(self._release)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise ImageProcessingTimeout(
+                f"Image processing took longer than {self.timeout}s"
+            )
+        except BrokenProcessPool:
+            self.shutdown()
+            raise
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._in_flight,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out
+        }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+
+image_processor = ImageProcessor(
+    workers=settings.IMAGE_WORKERS,
+    max_queue=settings.IMAGE_MAX_QUEUE,
+    timeout=settings.IMAGE_JOB_TIMEOUT_SECONDS
+)
@@ -1,10 +1,17 @@
 # app/core/jwt.py
 
+import hashlib
+import logging
+import threading
+import time
 from typing import Optional, Dict
 from datetime import datetime, timedelta
 from jose import jwt, JWTError
 
 from app.config import settings
+from app.utils.cache import LRUCache
+
+logger = logging.getLogger(__name__)
 
 ALGORITHM = settings.ALGORITHM
 
@@ -45,13 +52,66 @@ def create_refresh_token(
     return jwt.encode(payload, settings.SECRET_KEY, algorithm=ALGORITHM)
 
 
+# =========================================================
+# Verification
+# =========================================================
+# Clients resend the same token on every request, so verified payloads
+# are kept (by token digest) until the earlier of their `exp` and
+# JWT_DECODE_CACHE_TTL_SECONDS. Rejected tokens are never cached.
+
+_verified = LRUCache(
+    max_entries=settings.JWT_DECODE_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.JWT_DECODE_CACHE_TTL_SECONDS
+)
+
+_rejections: Dict[str, list] = {}  # reason -> [last logged at, suppressed since]
+_rejections_lock = threading.Lock()
+
+
+def _log_rejection(error: JWTError) -> None:
+    """Log a rejected token at most once per reason per JWT_ERROR_LOG_INTERVAL_SECONDS"""
+    reason = type(error).__name__
+    now = time.monotonic()
+
+    with _rejections_lock:
+        last_logged, suppressed = _rejections.get(reason, [None, 0])
+        if last_logged is not None and now - last_logged < settings.JWT_ERROR_LOG_INTERVAL_SECONDS:
+            _rejections[reason] = [last_logged, suppressed + 1]
+            return
+        _rejections[reason] = [now, 0]
+
+    logger.warning(
+        "JWT rejected: %s (%s); %d similar rejections suppressed",
+        reason, error, suppressed,
+        extra={"jwt_error": reason, "suppressed": suppressed}
+    )
+
+
 def decode_token(token: str) -> Optional[Dict]:
+    """Verified claims of `token`, or None if it is invalid or expired"""
+    key = hashlib.sha256(token.encode()).digest()
+    now = time.time()
+
+    payload = _verified.get(key)
+    if payload is not None:
+        if payload.get("exp", now + 1) > now:
+            return dict(payload)
+        _verified.pop(key)
+
     try:
-        return jwt.decode(
+        payload = jwt.decode(
             token,
             settings.SECRET_KEY,
             algorithms=[ALGORITHM]
         )
     except JWTError as e:
-        print("JWT ERROR:", e)
+        _log_rejection(e)
         return None
+
+    ttl = settings.JWT_DECODE_CACHE_TTL_SECONDS
+    if "exp" in payload:
+        ttl = min(ttl, payload["exp"] - now)
+    if ttl > 0:
+        _verified.set(key, payload, ttl=ttl)
+
+    return dict(payload)
@@ -0,0 +1,87 @@
+# app/core/scheduler.py
+
+"""
+In-process periodic jobs (counter reconciliation, cache refreshes, ...).
+
+Each job runs on its own daemon thread with a fresh database session per
+run. Jobs must be idempotent: with several API workers every worker runs
+its own copy.
+"""
+
+import logging
+import threading
+from typing import Callable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicJob:
+    """Runs `func(db)` every `interval_seconds` until stopped"""
+
+    def __init__(self, name: str, interval_seconds: float, func: Callable[[Session], object]):
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self.func = func
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def run_once(self) -> None:
+        db = SessionLocal()
+        try:
+            self.func(db)
+        except Exception:
+            db.rollback()
+            logger.exception("Periodic job %s failed", self.name)
+        finally:
+            db.close()
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            self.run_once()
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._loop,
+            name=f"job-{self.name}",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+
+_jobs: List[PeriodicJob] = []
+
+
+def register_job(
+    name: str,
+    interval_seconds: float,
+    func: Callable[[Session], object]
+) -> Optional[PeriodicJob]:
+    """Register a job; a non-positive interval disables it"""
+    if interval_seconds <= 0:
+        return None
+
+    job = PeriodicJob(name, interval_seconds, func)
+    _jobs.append(job)
+    return job
+
+
+def start_jobs() -> None:
+    for job in _jobs:
+        job.start()
+
+
+def stop_jobs() -> None:
+    for job in _jobs:
+        job.stop()
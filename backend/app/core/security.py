@@ -1,10 +1,31 @@
 # app/core/security.py
 
+"""
+Password hashing.
+
+bcrypt is deliberately slow (BCRYPT_ROUNDS sets the cost), so request
+handlers use the async variants: they run on a dedicated pool of
+PASSWORD_HASH_WORKERS threads (bcrypt releases the GIL) instead of the
+shared request threadpool, and a login burst can only ever occupy that
+pool. At most PASSWORD_HASH_MAX_QUEUE calls wait for a free worker;
+beyond that PasswordHasherBusy is raised right away so the caller can
+shed load instead of queueing indefinitely.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
 from passlib.context import CryptContext
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
 
 pwd_context = CryptContext(
     schemes=["bcrypt"],
-    deprecated="auto"
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS
 )
 
 
@@ -14,3 +35,87 @@ def hash_password(password: str) -> str:
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
+
+
+# =========================================================
+# Hashing Pool
+# =========================================================
+
+class PasswordHasherBusy(RuntimeError):
+    """All hashing workers are busy and the wait queue is full"""
+
+
+class PasswordHasher:
+    """Bounded worker pool for bcrypt with an async API"""
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.rejected = 0
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=self.workers,
+                        thread_name_prefix="password-hash"
+                    )
+        return self._pool
+
+    def _release(self, _future=None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    async def run(self, func: Callable, *args):
+        if self.workers <= 0:
+            # Pool disabled: hash on the shared request threadpool
+            return await run_in_threadpool(func, *args)
+
+        with self._lock:
+            if self._in_flight >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise PasswordHasherBusy("Password hashing is saturated")
+            self._in_flight += 1
+
+        try:
+            future = self._executor().submit(func, *args)
+        except BaseException:
+            self._release()
+            raise
+
+        # A cancelled caller must not free the slot while bcrypt still runs
+        future.add_done_callback(self._release)
+
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._in_flight,
+            "rejected": self.rejected
+        }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False)
+                self._pool = None
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE
+)
+
+
+async def hash_password_async(password: str) -> str:
+    return await password_hasher.run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
@@ -0,0 +1,263 @@
+# app/core/sentiment.py
+
+"""
+Pluggable sentiment scoring backends.
+
+    lexicon      keyword analyzer from app.utils.sentiment (default)
+    transformer  Hugging Face sequence classifier on CPU
+                 (optional: pip install transformers torch)
+
+Pick one with SENTIMENT_BACKEND; get_backend() loads it once per process.
+Every backend returns the same result dict as SentimentAnalyzer.analyze.
+"""
+
+import logging
+import queue
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.utils.sentiment import sentiment_analyzer
+
+logger = logging.getLogger(__name__)
+
+
+class SentimentBackend(ABC):
+    """Scores texts; `version` changes whenever results may change"""
+
+    name = "base"
+
+    @property
+    def version(self) -> str:
+        return self.name
+
+    @abstractmethod
+    def analyze_batch(self, texts: List[str]) -> List[Dict]:
+        """One result per text, in order"""
+
+    def analyze(self, text: str) -> Dict:
+        return self.analyze_batch([text])[0]
+
+
+# =========================================================
+# Lexicon
+# =========================================================
+
+class LexiconBackend(SentimentBackend):
+    name = "lexicon"
+
+    @property
+    def version(self) -> str:
+        return f"{self.name}-{sentiment_analyzer.lexicon_version}"
+
+    def analyze_batch(self, texts: List[str]) -> List[Dict]:
+        return sentiment_analyzer.analyze_batch(texts, processes=1)
+
+
+# =========================================================
+# Micro-batching
+# =========================================================
+
+class MicroBatcher:
+    """
+    Coalesces concurrent calls into batched calls of
+    `func(texts) -> results`: a batch is flushed when it reaches
+    `max_batch_size` or `max_wait_ms` after its first item arrived.
+    Texts from a multi-text submission may share batches with others.
+    """
+
+    def __init__(
+        self,
+        func: Callable[[List[str]], List[Dict]],
+        max_batch_size: int,
+        max_wait_ms: float
+    ):
+        self.func = func
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._loop, name="sentiment-batcher", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, text: str) -> Dict:
+        return self.submit_many([text])[0]
+
+    def submit_many(self, texts: List[str]) -> List[Dict]:
+        futures = []
+        for text in texts:
+            future: Future = Future()
+            self._queue.put((text, future))
+            futures.append(future)
+        return [future.result() for future in futures]
+
+    def _loop(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            try:
+                while len(batch) < self.max_batch_size:
+                    batch.append(self._queue.get(timeout=self.max_wait))
+            except queue.Empty:
+                pass
+
+            texts = [text for text, _ in batch]
+            try:
+                results = self.func(texts)
+            except Exception as exc:
+                for _, future in batch:
+                    future.set_exception(exc)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+
+# =========================================================
+# Transformer
+# =========================================================
+
+class TransformerBackend(SentimentBackend):
+    """
+    Sequence classifier with negative/neutral/positive labels, read from
+    the model config (models that only name them LABEL_0..2, such as
+    cardiffnlp/twitter-roberta-base-sentiment, use that order). Inputs
+    are truncated to the model's maximum length. Toxicity still comes
+    from the lexicon analyzer.
+
+    Every call, single text or batch, goes through one MicroBatcher, so
+    request-path and queue-worker texts share forward passes.
+    """
+
+    name = "transformer"
+    LABELS = ("negative", "neutral", "positive")
+
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None
+    ):
+        try:
+            import torch
+            from transformers import AutoModelForSequenceClassification, AutoTokenizer
+        except ImportError as exc:
+            raise RuntimeError(
+                "SENTIMENT_BACKEND=transformer requires `pip install transformers torch`"
+            ) from exc
+
+        source = model or settings.SENTIMENT_MODEL_DIR or settings.SENTIMENT_MODEL
+        local_only = bool(settings.SENTIMENT_MODEL_DIR) and model is None
+
+        self._torch = torch
+        self.model_name = source
+        self.tokenizer = AutoTokenizer.from_pretrained(source, local_files_only=local_only)
+        self.model = AutoModelForSequenceClassification.from_pretrained(
+            source, local_files_only=local_only
+        )
+        self.model.eval()
+        self.labels = self.model_labels(self.model.config.id2label)
+
+        # Some tokenizers report a huge sentinel model_max_length;
+        # the position embeddings are the real bound (RoBERTa reserves 2)
+        positions = getattr(self.model.config, "max_position_embeddings", None)
+        limits = [settings.SENTIMENT_MAX_LENGTH, self.tokenizer.model_max_length]
+        if positions:
+            limits.append(positions - 2)
+        self.max_length = min(limits)
+
+        self.max_batch_size = max_batch_size or settings.SENTIMENT_BATCH_MAX_SIZE
+        self._batcher = MicroBatcher(
+            self._infer,
+            self.max_batch_size,
+            settings.SENTIMENT_BATCH_MAX_WAIT_MS if max_wait_ms is None else max_wait_ms
+        )
+
+        logger.info("Loaded sentiment model %s (max_length=%d)", source, self.max_length)
+
+    @classmethod
+    def model_labels(cls, id2label: Dict[int, str]) -> Tuple[str, ...]:
+        """Output index -> sentiment label, from the model's id2label"""
+        names = tuple(str(id2label[i]).lower() for i in range(len(id2label)))
+        if names == tuple(f"label_{i}" for i in range(len(cls.LABELS))):
+            return cls.LABELS
+        if sorted(names) != sorted(cls.LABELS):
+            raise RuntimeError(
+                f"Sentiment model labels {names} are not {cls.LABELS}"
+            )
+        return names
+
+    @property
+    def version(self) -> str:
+        return f"{self.name}:{self.model_name}:{self.max_length}"
+
+    def _infer(self, texts: List[str]) -> List[Dict]:
+        encoded = self.tokenizer(
+            [text or "" for text in texts],
+            truncation=True,
+            max_length=self.max_length,
+            padding=True,
+            return_tensors="pt"
+        )
+        with self._torch.inference_mode():
+            probs = self._torch.softmax(self.model(**encoded).logits, dim=-1).tolist()
+
+        results = []
+        for text, row in zip(texts, probs):
+            if not text or not text.strip():
+                results.append(sentiment_analyzer.analyze(text))
+                continue
+
+            by_label = dict(zip(self.labels, row))
+            confidence = max(row)
+            label = self.labels[row.index(confidence)]
+            toxicity = sentiment_analyzer.analyze(text)
+            raw_score = by_label["positive"] - by_label["negative"]
+
+            results.append({
+                'label': label,
+                'score': abs(raw_score),
+                'confidence': confidence,
+                'toxicity': toxicity['toxicity'],
+                'toxicity_score': toxicity['toxicity_score'],
+                'raw_score': raw_score
+            })
+        return results
+
+    def analyze_batch(self, texts: List[str]) -> List[Dict]:
+        # Concurrent callers share forward passes of at most max_batch_size
+        return self._batcher.submit_many(texts)
+
+
+# =========================================================
+# Registry
+# =========================================================
+
+BACKENDS = {
+    LexiconBackend.name: LexiconBackend,
+    TransformerBackend.name: TransformerBackend,
+}
+
+_backend: Optional[SentimentBackend] = None
+_backend_lock = threading.Lock()
+
+
+def get_backend() -> SentimentBackend:
+    """The configured backend, loaded once per process"""
+    global _backend
+
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                try:
+                    backend_cls = BACKENDS[settings.SENTIMENT_BACKEND]
+                except KeyError:
+                    raise ValueError(
+                        f"Unknown SENTIMENT_BACKEND {settings.SENTIMENT_BACKEND!r}; "
+                        f"expected one of {sorted(BACKENDS)}"
+                    )
+                _backend = backend_cls()
+
+    return _backend
@@ -1,8 +1,30 @@
 # app/database.py
 
-from sqlalchemy import create_engine
+"""
+Engines and sessions.
+
+Writes (and reads that must see them) go to the primary through get_db /
+get_async_db. Read-only GET endpoints use get_read_db /
+get_async_read_db from app.api.deps, which spread sessions round-robin
+over the DATABASE_REPLICA_URLS engines (the primary when none are set).
+A user who has just written reads from the primary for
+REPLICA_STICKY_SECONDS so replication lag never hides their own writes.
+The time of that write comes back with the request (a signed cookie or
+header, see app.api.deps), so it holds whichever worker serves the read.
+"""
+
+import itertools
+import threading
+import time
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.config import settings
 
 # Create database engine
@@ -11,7 +33,7 @@ engine = create_engine(
     pool_pre_ping=True,
     pool_size=10,
     max_overflow=20,
-    echo=settings.DEBUG
+    echo=settings.SQL_ECHO
 )
 
 # Create session factory
@@ -21,6 +43,101 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def utcnow() -> datetime:
+    """
+    Python-side default for timestamps used as pagination keys: SQLite's
+    CURRENT_TIMESTAMP keeps whole seconds in a different text format than
+    bound datetimes, which breaks `(created_at, id)` comparisons there.
+    """
+    return datetime.now(timezone.utc)
+
+
+# Async drivers for the sync URL's backend
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite",
+}
+
+
+class AsyncDatabaseUnavailable(RuntimeError):
+    """No async driver for the configured database"""
+
+
+def async_database_url(url: str) -> str:
+    """DATABASE_URL with its driver swapped for the async one"""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise AsyncDatabaseUnavailable(
+            f"No async driver for {backend!r} databases (supported: "
+            f"{sorted(ASYNC_DRIVERS)}); set ASYNC_DATABASE_URL to an async URL"
+        )
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(
+        hide_password=False
+    )
+
+
+def _async_engine(url: str):
+    return create_async_engine(
+        make_url(url),
+        # aiosqlite would otherwise reconnect for every session
+        poolclass=AsyncAdaptedQueuePool,
+        pool_pre_ping=True,
+        pool_size=10,
+        max_overflow=20,
+        echo=settings.SQL_ECHO
+    )
+
+
+# Async engines for `async def` endpoints, side by side with the sync
+# ones. Built on first use, so a database without an async driver only
+# fails (with AsyncDatabaseUnavailable) on the endpoints that need one.
+_async_engines: Optional[Tuple[AsyncEngine, List[AsyncEngine]]] = None
+_async_engines_lock = threading.Lock()
+
+
+def _get_async_engines() -> Tuple[AsyncEngine, List[AsyncEngine]]:
+    """(primary, replicas) async engines, created once per process"""
+    global _async_engines
+
+    if _async_engines is None:
+        with _async_engines_lock:
+            if _async_engines is None:
+                primary = _async_engine(
+                    settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+                )
+                replicas = [
+                    _async_engine(async_database_url(url))
+                    for url in settings.DATABASE_REPLICA_URLS
+                ]
+                _async_engines = (primary, replicas)
+
+    return _async_engines
+
+
+def get_async_engine() -> AsyncEngine:
+    return _get_async_engines()[0]
+
+
+async def dispose_async_engines() -> None:
+    """Close the async pools, if they were ever opened"""
+    global _async_engines
+
+    engines, _async_engines = _async_engines, None
+    if engines is not None:
+        primary, replicas = engines
+        for async_engine in [primary, *replicas]:
+            await async_engine.dispose()
+
+
+# expire_on_commit=False: attributes are read after commit without a
+# lazy refresh, which async sessions cannot do implicitly
+AsyncSessionLocal = async_sessionmaker(
+    autoflush=False,
+    expire_on_commit=False
+)
+
+
 # Dependency to get database session
 def get_db():
     """
@@ -31,4 +148,97 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    """
+    Async database session dependency for `async def` endpoints.
+    Sync helpers can be reused on it through `await db.run_sync(...)`.
+    """
+    async with AsyncSessionLocal(bind=get_async_engine()) as db:
+        yield db
+
+
+# =========================================================
+# Read Replicas
+# =========================================================
+
+class ReadOnlySession(Session):
+    """Session for replica reads; flushing anything is a routing bug"""
+
+
+@event.listens_for(ReadOnlySession, "before_flush")
+def _reject_flush(session, flush_context, instances):
+    raise RuntimeError("Read-only session: use get_db for writes")
+
+
+replica_engines = [
+    create_engine(
+        url,
+        pool_pre_ping=True,
+        pool_size=10,
+        max_overflow=20,
+        echo=settings.SQL_ECHO
+    )
+    for url in settings.DATABASE_REPLICA_URLS
+]
+
+ReadSessionLocal = sessionmaker(class_=ReadOnlySession, autocommit=False, autoflush=False)
+AsyncReadSessionLocal = async_sessionmaker(
+    sync_session_class=ReadOnlySession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+_replica_turn = itertools.count()
+
+def _read_target(engines: list, primary, last_write_at: Optional[float]):
+    if not engines or (
+        last_write_at is not None
+        and time.time() - last_write_at < settings.REPLICA_STICKY_SECONDS
+    ):
+        return primary
+    return engines[next(_replica_turn) % len(engines)]
+
+
+def read_session(last_write_at: Optional[float] = None) -> ReadOnlySession:
+    """
+    Read-only session on a replica, or the primary when the reader
+    wrote (at unix time `last_write_at`) within REPLICA_STICKY_SECONDS
+    """
+    return ReadSessionLocal(bind=_read_target(replica_engines, engine, last_write_at))
+
+
+def async_read_session(last_write_at: Optional[float] = None) -> AsyncSession:
+    """read_session() for async endpoints"""
+    primary, replicas = _get_async_engines()
+    return AsyncReadSessionLocal(bind=_read_target(replicas, primary, last_write_at))
+
+
+def dialect_insert(db, model):
+    """
+    INSERT construct for the session's dialect, exposing
+    on_conflict_do_nothing / on_conflict_do_update (PostgreSQL, SQLite).
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    return insert(model)
+
+
+def try_advisory_lock(db, name: str) -> bool:
+    """
+    Take the transaction-scoped advisory lock `name` without waiting.
+    Periodic jobs that every worker schedules use it so only one worker
+    runs them at a time; the others skip the run. Always True outside
+    PostgreSQL (SQLite serializes writers anyway).
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return True
+
+    return bool(db.execute(
+        select(func.pg_try_advisory_xact_lock(func.hashtext(name)))
+    ).scalar())
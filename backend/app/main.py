@@ -1,13 +1,30 @@
 # app/main.py
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
+from sqlalchemy.orm import Session
 
 from app.config import settings
 from app.api.v1 import api_router
-from app.database import engine, Base
+from app.database import dispose_async_engines, engine, Base, get_db
+from app.api.deps import LAST_WRITE_COOKIE, LAST_WRITE_HEADER, request_writer, write_marker
+from app.core.scheduler import register_job, start_jobs, stop_jobs
+from app.core.image_pool import image_processor
+from app.core.security import password_hasher
+from app.services.engagement import reconcile_engagement_counters
+from app.services.trending import refresh_trending
+from app.services.rollups import refresh_recent_rollups
+from app.services.sentiment_cache import cache_stats, prune_sentiment_cache
+from app.services.uploads import sweep_upload_sessions
+from app.services.media_store import reconcile_media_blobs
+from app.services.media_variants import prune_variant_cache
+from app.services.sentiment_jobs import (
+    drain_sentiment_jobs,
+    prune_finished_jobs,
+    queue_metrics
+)
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
@@ -28,8 +45,31 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[LAST_WRITE_HEADER],
 )
 
+
+@app.middleware("http")
+async def track_writers(request: Request, call_next):
+    """Send a user's reads to the primary right after they write"""
+    response = await call_next(request)
+
+    if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+        writer = request_writer(request)
+        if writer is not None:
+            marker = write_marker(writer)
+            response.headers[LAST_WRITE_HEADER] = marker
+            response.set_cookie(
+                LAST_WRITE_COOKIE,
+                marker,
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite="lax"
+            )
+
+    return response
+
+
 # Mount static files for uploads
 if Path(settings.UPLOAD_DIR).exists():
     app.mount("/uploads", StaticFiles(directory=settings.UPLOAD_DIR), name="uploads")
@@ -38,6 +78,70 @@ if Path(settings.UPLOAD_DIR).exists():
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
 
+@app.on_event("startup")
+def start_background_jobs():
+    """Start periodic maintenance jobs"""
+    register_job(
+        "reconcile-engagement",
+        settings.ENGAGEMENT_RECONCILE_INTERVAL_SECONDS,
+        reconcile_engagement_counters
+    )
+    register_job(
+        "refresh-trending",
+        settings.TRENDING_REFRESH_INTERVAL_SECONDS,
+        refresh_trending
+    )
+    register_job(
+        "refresh-rollups",
+        settings.ROLLUP_REFRESH_INTERVAL_SECONDS,
+        refresh_recent_rollups
+    )
+    register_job(
+        "prune-jobs",
+        settings.JOB_PRUNE_INTERVAL_SECONDS,
+        prune_finished_jobs
+    )
+    register_job(
+        "prune-sentiment-cache",
+        settings.JOB_PRUNE_INTERVAL_SECONDS if settings.SENTIMENT_CACHE_PERSISTENT else 0,
+        prune_sentiment_cache
+    )
+    register_job(
+        "sweep-uploads",
+        settings.UPLOAD_SWEEP_INTERVAL_SECONDS,
+        sweep_upload_sessions
+    )
+    register_job(
+        "reconcile-media",
+        settings.MEDIA_RECONCILE_INTERVAL_SECONDS,
+        reconcile_media_blobs
+    )
+    register_job(
+        "prune-media-variants",
+        settings.MEDIA_VARIANT_PRUNE_INTERVAL_SECONDS,
+        prune_variant_cache
+    )
+    for worker in range(settings.SENTIMENT_WORKERS):
+        register_job(
+            f"sentiment-worker-{worker}",
+            settings.SENTIMENT_POLL_INTERVAL_SECONDS,
+            drain_sentiment_jobs
+        )
+    start_jobs()
+
+
+@app.on_event("shutdown")
+def stop_background_jobs():
+    stop_jobs()
+    password_hasher.shutdown()
+    image_processor.shutdown()
+
+
+@app.on_event("shutdown")
+async def close_async_engine():
+    await dispose_async_engines()
+
+
 @app.get("/")
 def root():
     """Root endpoint"""
@@ -58,6 +162,30 @@ def health_check():
     }
 
 
+@app.get("/health/sentiment-queue")
+def sentiment_queue_health(db: Session = Depends(get_db)):
+    """Sentiment job queue depth and lag"""
+    return queue_metrics(db)
+
+
+@app.get("/health/sentiment-cache")
+def sentiment_cache_health():
+    """Sentiment result cache size and hit rate (this worker)"""
+    return cache_stats()
+
+
+@app.get("/health/password-hash")
+def password_hash_health():
+    """Password hashing pool occupancy and rejections (this worker)"""
+    return password_hasher.stats()
+
+
+@app.get("/health/image-pool")
+def image_pool_health():
+    """Image transcoding pool occupancy, rejections and timeouts (this worker)"""
+    return image_processor.stats()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=settings.DEBUG)
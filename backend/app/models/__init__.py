@@ -14,3 +14,10 @@ from app.models.notification import Notification
 from app.models.bookmark import Bookmark
 from app.models.reaction import Reaction
 from app.models.sentiment import Sentiment
+from app.models.trending import TrendingPost
+from app.models.feed import UserFeed, UserFeedPost
+from app.models.job_queue import Job
+from app.models.sentiment_cache import SentimentCacheEntry
+from app.models.metrics import DailyUserMetrics, DailyMetrics, StatsSnapshot
+from app.models.moderation import ModerationFlag
+from app.models.media import Media, MediaBlob, Story, UploadSession
@@ -9,7 +9,7 @@ from sqlalchemy import (
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
-from app.database import Base
+from app.database import Base, utcnow
 
 
 class Bookmark(Base):
@@ -33,6 +33,7 @@ class Bookmark(Base):
 
     created_at = Column(
         DateTime(timezone=True),
+        default=utcnow,
         server_default=func.now(),
         nullable=False
     )
@@ -45,6 +46,7 @@ class Bookmark(Base):
         ),
         Index("idx_bookmarks_user", "user_id"),
         Index("idx_bookmarks_post", "post_id"),
+        Index("idx_bookmarks_user_created", "user_id", "created_at", "id"),
     )
 
     # ========= Relationships =========
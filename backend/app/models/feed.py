@@ -0,0 +1,84 @@
+# app/models/feed.py
+
+from sqlalchemy import (
+    Column,
+    BigInteger,
+    DateTime,
+    ForeignKey,
+    Index
+)
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+
+from app.database import Base
+
+
+class UserFeed(Base):
+    """Materialized home timeline header, one per user"""
+
+    __tablename__ = "user_feeds"
+
+    id = Column(BigInteger, primary_key=True, index=True)
+
+    user_id = Column(
+        BigInteger,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        unique=True,
+        nullable=False
+    )
+
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+
+    # ========= Relationships =========
+
+    entries = relationship(
+        "UserFeedPost",
+        back_populates="feed",
+        cascade="all, delete-orphan",
+        passive_deletes=True
+    )
+
+    def __repr__(self) -> str:
+        return f"<UserFeed id={self.id} user_id={self.user_id}>"
+
+
+class UserFeedPost(Base):
+    """
+    A post pushed into a user's timeline.
+    `created_at` mirrors the post's so pages are read straight off
+    the (feed_id, created_at, post_id) index.
+    """
+
+    __tablename__ = "user_feed_posts"
+
+    feed_id = Column(
+        BigInteger,
+        ForeignKey("user_feeds.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+
+    post_id = Column(
+        BigInteger,
+        ForeignKey("posts.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+
+    author_id = Column(BigInteger, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_user_feed_posts_feed_created", "feed_id", "created_at", "post_id"),
+        Index("ix_user_feed_posts_feed_author", "feed_id", "author_id"),
+    )
+
+    # ========= Relationships =========
+
+    feed = relationship("UserFeed", back_populates="entries")
+
+    def __repr__(self) -> str:
+        return f"<UserFeedPost feed_id={self.feed_id} post_id={self.post_id}>"
@@ -9,7 +9,7 @@ from sqlalchemy import (
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
-from app.database import Base
+from app.database import Base, utcnow
 
 
 class Follow(Base):
@@ -31,6 +31,7 @@ class Follow(Base):
 
     created_at = Column(
         DateTime(timezone=True),
+        default=utcnow,
         server_default=func.now(),
         nullable=False
     )
@@ -43,6 +44,9 @@ class Follow(Base):
         ),
         Index("ix_follows_follower", "follower_id"),
         Index("ix_follows_following", "following_id"),
+        Index("ix_follows_follower_created", "follower_id", "created_at", "id"),
+        Index("ix_follows_following_created", "following_id", "created_at", "id"),
+        Index("ix_follows_following_follower", "following_id", "follower_id"),
     )
 
     # ========= Relationships =========
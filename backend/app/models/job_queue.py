@@ -0,0 +1,68 @@
+# app/models/job_queue.py
+
+from sqlalchemy import (
+    Column,
+    BigInteger,
+    String,
+    Integer,
+    Text,
+    DateTime,
+    ForeignKey,
+    Index,
+    CheckConstraint
+)
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class Job(Base):
+    """
+    Background work item (modeled on Job_Queue in Tables.sql).
+    status: pending | processing | done | failed
+    """
+
+    __tablename__ = "job_queue"
+
+    id = Column(BigInteger, primary_key=True, index=True)
+
+    job_type = Column(String(100), nullable=False)   # sentiment
+    target_type = Column(String(100), nullable=False)  # post | comment
+    status = Column(String(50), nullable=False, default="pending", server_default="pending")
+
+    post_id = Column(
+        BigInteger,
+        ForeignKey("posts.id", ondelete="CASCADE"),
+        nullable=True
+    )
+
+    comment_id = Column(
+        BigInteger,
+        ForeignKey("comments.id", ondelete="CASCADE"),
+        nullable=True
+    )
+
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    last_error = Column(Text)
+
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+
+    __table_args__ = (
+        CheckConstraint(
+            "(post_id IS NOT NULL AND comment_id IS NULL) OR "
+            "(post_id IS NULL AND comment_id IS NOT NULL)",
+            name="ck_job_queue_single_target"
+        ),
+        Index("ix_job_queue_status_id", "status", "id"),
+        Index("ix_job_queue_finished", "finished_at"),
+    )
+
+    def __repr__(self) -> str:
+        target_id = self.post_id or self.comment_id
+        return f"<Job id={self.id} {self.job_type} {self.target_type}={target_id} {self.status}>"
@@ -0,0 +1,178 @@
+# app/models/media.py
+
+from sqlalchemy import (
+    Column,
+    BigInteger,
+    Integer,
+    String,
+    DateTime,
+    ForeignKey,
+    Index
+)
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+
+from app.database import Base
+
+
+class Media(Base):
+    """
+    A file uploaded through /media/upload before it belongs to a post;
+    attaching it to a post copies it into post_media.
+    """
+
+    __tablename__ = "media"
+
+    id = Column(BigInteger, primary_key=True, index=True)
+
+    user_id = Column(
+        BigInteger,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+
+    file_url = Column(String(500), nullable=False)
+
+    file_type = Column(String(20), nullable=False)  # image | video
+
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+
+    __table_args__ = (
+        Index("ix_media_file_url", "file_url"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<Media id={self.id} user_id={self.user_id} type={self.file_type}>"
+
+
+class Story(Base):
+    """A single image or video shown to followers until `expires_at`"""
+
+    __tablename__ = "stories"
+
+    id = Column(BigInteger, primary_key=True, index=True)
+
+    user_id = Column(
+        BigInteger,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False
+    )
+
+    media_url = Column(String(500), nullable=False)
+
+    media_type = Column(String(20), nullable=False)  # image | video
+
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    # =======================
+    # Relationships
+    # =======================
+
+    author = relationship("User", lazy="joined")
+
+    # =======================
+    # Indexes
+    # =======================
+
+    __table_args__ = (
+        Index("ix_stories_user_expires", "user_id", "expires_at"),
+        Index("ix_stories_expires", "expires_at"),
+        Index("ix_stories_media_url", "media_url"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<Story id={self.id} user_id={self.user_id}>"
+
+
+class UploadSession(Base):
+    """
+    A resumable upload in progress. Chunks are written in order straight
+    into UPLOAD_DIR/.sessions/<id>.part; `received` counts the bytes
+    stored so far. Idle sessions are swept after UPLOAD_SESSION_TTL_SECONDS.
+    """
+
+    __tablename__ = "upload_sessions"
+
+    id = Column(String(32), primary_key=True)  # uuid4 hex
+
+    user_id = Column(
+        BigInteger,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+
+    purpose = Column(String(20), nullable=False)  # media | story
+    media_type = Column(String(20), nullable=False)  # image | video
+    filename = Column(String(255), nullable=False)
+    content_type = Column(String(100))  # validated at creation; NULL on older sessions
+
+    total_size = Column(BigInteger, nullable=False)
+    received = Column(BigInteger, nullable=False, default=0, server_default="0")
+
+    # Token of the request writing the next chunk; claims `received` so
+    # concurrent PUTs at the same offset can't both write
+    writer = Column(String(32))
+
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+
+    # Last chunk received; the sweeper's clock
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_upload_sessions_updated", "updated_at"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<UploadSession id={self.id} {self.received}/{self.total_size}>"
+
+
+class MediaBlob(Base):
+    """
+    A file in the content-addressed store (UPLOAD_DIR/media/...), shared
+    by every post_media, media and stories row carrying its URL.
+    ref_count is adjusted transactionally as those rows come and go and
+    reconciled periodically; unreferenced blobs are garbage-collected.
+    """
+
+    __tablename__ = "media_blobs"
+
+    file_url = Column(String(500), primary_key=True)
+
+    sha256 = Column(String(64), nullable=False, index=True)  # of the uploaded bytes
+    file_type = Column(String(20), nullable=False)  # image | video
+    size = Column(BigInteger, nullable=False)  # bytes on disk
+
+    ref_count = Column(Integer, nullable=False, default=0, server_default="0")
+    uploads = Column(Integer, nullable=False, default=0, server_default="0")  # times these bytes were uploaded
+
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+
+    # Last reference change; unreferenced blobs are kept for a grace period
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_media_blobs_refs_updated", "ref_count", "updated_at"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<MediaBlob {self.file_url} refs={self.ref_count}>"
@@ -0,0 +1,84 @@
+# app/models/metrics.py
+
+from sqlalchemy import (
+    Column,
+    BigInteger,
+    Integer,
+    String,
+    Date,
+    DateTime,
+    ForeignKey
+)
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+def _counter():
+    return Column(Integer, nullable=False, default=0, server_default="0")
+
+
+class DailyUserMetrics(Base):
+    """
+    Per-user activity per UTC day (in the spirit of Engagement_Metrics in
+    Tables.sql). Maintained incrementally by app.services.rollups.
+    """
+
+    __tablename__ = "daily_user_metrics"
+
+    user_id = Column(
+        BigInteger,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    day = Column(Date, primary_key=True)
+
+    posts = _counter()
+    comments = _counter()
+    reactions_received = _counter()
+    comments_received = _counter()
+
+    # Sentiment of the user's posts, by post day
+    positive_posts = _counter()
+    negative_posts = _counter()
+    neutral_posts = _counter()
+
+    def __repr__(self) -> str:
+        return f"<DailyUserMetrics user_id={self.user_id} day={self.day}>"
+
+
+class DailyMetrics(Base):
+    """Site-wide activity per UTC day"""
+
+    __tablename__ = "daily_metrics"
+
+    day = Column(Date, primary_key=True)
+
+    posts = _counter()
+    comments = _counter()
+    reactions = _counter()
+    new_users = _counter()
+
+    # Sentiment of posts and comments, by content day
+    positive = _counter()
+    negative = _counter()
+    neutral = _counter()
+
+    def __repr__(self) -> str:
+        return f"<DailyMetrics day={self.day}>"
+
+
+class StatsSnapshot(Base):
+    """
+    Last exact value of each system-wide total, one row per stat.
+    Recounted by app.services.system_stats.
+    """
+
+    __tablename__ = "stats_snapshot"
+
+    name = Column(String(50), primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0)
+    refreshed_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    def __repr__(self) -> str:
+        return f"<StatsSnapshot {self.name}={self.value}>"
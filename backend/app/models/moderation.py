@@ -0,0 +1,108 @@
+# app/models/moderation.py
+
+from sqlalchemy import (
+    Column,
+    BigInteger,
+    String,
+    Float,
+    Integer,
+    Text,
+    DateTime,
+    ForeignKey,
+    Index,
+    CheckConstraint,
+    text
+)
+from sqlalchemy.sql import func
+
+from app.database import Base, utcnow
+
+OPEN = text("status = 'open'")
+
+
+class ModerationFlag(Base):
+    """
+    Moderation queue entry for a post or comment (modeled on Flags and
+    Moderation_Action in Tables.sql). Raised when the analyzer's result
+    should be flagged for moderation; one row per target.
+    status: open | approved | removed | actioned
+
+    Flags outlive their target: deleting the post or comment clears
+    post_id/comment_id, target_type and target_id keep what was flagged.
+    """
+
+    __tablename__ = "moderation_flags"
+
+    id = Column(BigInteger, primary_key=True, index=True)
+
+    target_type = Column(String(20), nullable=False)  # post | comment
+    target_id = Column(BigInteger, nullable=False)
+
+    post_id = Column(
+        BigInteger,
+        ForeignKey("posts.id", ondelete="SET NULL"),
+        nullable=True,
+        unique=True
+    )
+
+    comment_id = Column(
+        BigInteger,
+        ForeignKey("comments.id", ondelete="SET NULL"),
+        nullable=True,
+        unique=True
+    )
+
+    author_id = Column(
+        BigInteger,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False
+    )
+
+    status = Column(String(20), nullable=False, default="open", server_default="open")
+
+    # Analyzer result that raised the flag
+    sentiment_label = Column(String(20), nullable=False)
+    confidence = Column(Float, nullable=False, default=0.0)
+    toxicity = Column(String(20), nullable=False)  # none | low | medium | high
+    toxicity_score = Column(Float, nullable=False, default=0.0)
+    flag_count = Column(Integer, nullable=False, default=1, server_default="1")
+
+    # Resolution
+    moderator_id = Column(
+        BigInteger,
+        ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True
+    )
+    action = Column(String(50))
+    reason = Column(Text)
+    resolved_at = Column(DateTime(timezone=True))
+
+    created_at = Column(
+        DateTime(timezone=True),
+        default=utcnow,
+        server_default=func.now(),
+        nullable=False
+    )
+
+    __table_args__ = (
+        CheckConstraint(
+            "post_id IS NULL OR comment_id IS NULL",
+            name="ck_moderation_flags_single_target"
+        ),
+        # Partial indexes: only the open queue is ever scanned in order
+        Index(
+            "ix_moderation_flags_open",
+            "created_at", "id",
+            postgresql_where=OPEN,
+            sqlite_where=OPEN
+        ),
+        Index(
+            "ix_moderation_flags_open_type",
+            "target_type", "created_at", "id",
+            postgresql_where=OPEN,
+            sqlite_where=OPEN
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return f"<ModerationFlag {self.target_type}={self.target_id} {self.status}>"
@@ -12,7 +12,7 @@ from sqlalchemy import (
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
-from app.database import Base
+from app.database import Base, utcnow
 
 
 class Notification(Base):
@@ -45,7 +45,7 @@ class Notification(Base):
 
     is_read = Column(Boolean, default=False)
 
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
 
     # ========= Relationships =========
 
@@ -62,4 +62,5 @@ class Notification(Base):
 
     __table_args__ = (
         Index("ix_notifications_recipient_unread", "recipient_id", "is_read"),
+        Index("ix_notifications_recipient_created", "recipient_id", "created_at", "id"),
     )
@@ -62,6 +62,7 @@ class PostMedia(Base):
 
     __table_args__ = (
         Index("idx_post_media_post_created", "post_id", "created_at"),
+        Index("ix_post_media_file_url", "file_url"),
     )
 
     # =======================
@@ -3,6 +3,7 @@ from sqlalchemy import (
     BigInteger,
     Text,
     String,
+    Integer,
     DateTime,
     ForeignKey,
     Index
@@ -10,7 +11,7 @@ from sqlalchemy import (
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
-from app.database import Base
+from app.database import Base, utcnow
 
 
 class Post(Base):
@@ -36,8 +37,25 @@ class Post(Base):
     location = Column(String(255), nullable=True)
     platform = Column(String(50), default="web", index=True)
 
+    # =========================
+    # Engagement Counters
+    # Maintained by app.services.engagement in the same
+    # transaction as reaction/comment writes.
+    # =========================
+
+    likes_count = Column(Integer, nullable=False, default=0, server_default="0")
+    comments_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    like_count = Column(Integer, nullable=False, default=0, server_default="0")
+    love_count = Column(Integer, nullable=False, default=0, server_default="0")
+    haha_count = Column(Integer, nullable=False, default=0, server_default="0")
+    wow_count = Column(Integer, nullable=False, default=0, server_default="0")
+    sad_count = Column(Integer, nullable=False, default=0, server_default="0")
+    angry_count = Column(Integer, nullable=False, default=0, server_default="0")
+
     created_at = Column(
         DateTime(timezone=True),
+        default=utcnow,
         server_default=func.now(),
         nullable=False
     )
@@ -75,15 +93,13 @@ class Post(Base):
     reactions = relationship(
         "Reaction",
         back_populates="post",
-        cascade="all, delete-orphan",
-        lazy="selectin"
+        cascade="all, delete-orphan"
     )
 
     bookmarks = relationship(
         "Bookmark",
         back_populates="post",
-        cascade="all, delete-orphan",
-        lazy="selectin"
+        cascade="all, delete-orphan"
     )
 
     # ✅ FIXED sentiment relationship
@@ -103,6 +119,7 @@ class Post(Base):
         Index("ix_posts_visibility", "visibility"),
         Index("ix_posts_created_at", "created_at"),
         Index("ix_posts_user_created", "user_id", "created_at"),
+        Index("ix_posts_visibility_created", "visibility", "created_at", "id"),
     )
 
     def __repr__(self) -> str:
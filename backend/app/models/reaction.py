@@ -58,7 +58,6 @@ class Reaction(Base):
             "post_id",
             name="uq_user_post_reaction"
         ),
-        Index("ix_reactions_post_id", "post_id"),
         Index("ix_reactions_type", "reaction_type"),
     )
 
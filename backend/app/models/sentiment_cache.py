@@ -0,0 +1,38 @@
+# app/models/sentiment_cache.py
+
+from sqlalchemy import (
+    Column,
+    String,
+    Text,
+    DateTime,
+    Index
+)
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class SentimentCacheEntry(Base):
+    """
+    Persistent tier of the sentiment result cache.
+    `key` is the SHA-256 of the backend version and normalized content.
+    """
+
+    __tablename__ = "sentiment_cache"
+
+    key = Column(String(64), primary_key=True)
+    backend_version = Column(String(255), nullable=False)
+    result = Column(Text, nullable=False)  # JSON analysis dict
+
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+
+    __table_args__ = (
+        Index("ix_sentiment_cache_created", "created_at"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<SentimentCacheEntry key={self.key[:12]} version={self.backend_version}>"
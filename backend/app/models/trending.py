@@ -0,0 +1,59 @@
+# app/models/trending.py
+
+from sqlalchemy import (
+    Column,
+    BigInteger,
+    Integer,
+    Float,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index
+)
+from sqlalchemy.orm import relationship
+
+from app.database import Base
+
+
+class TrendingPost(Base):
+    """
+    Time-decayed engagement score per post.
+
+    `score` is the decayed value as of `scored_at`; writers fold new
+    engagement in incrementally and the refresh job materializes `rank`
+    (and `date`) for the trending endpoint to page through.
+    """
+
+    __tablename__ = "trending_posts"
+
+    id = Column(BigInteger, primary_key=True, index=True)
+
+    post_id = Column(
+        BigInteger,
+        ForeignKey("posts.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=True
+    )
+
+    score = Column(Float, nullable=False, default=0.0)
+    scored_at = Column(DateTime(timezone=True), nullable=False)
+
+    rank = Column(Integer, nullable=True)
+    date = Column(Date, nullable=True)
+
+    # =========================
+    # Relationships
+    # =========================
+
+    post = relationship("Post")
+
+    # =========================
+    # Indexes
+    # =========================
+
+    __table_args__ = (
+        Index("ix_trending_posts_rank", "rank"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<TrendingPost post_id={self.post_id} rank={self.rank} score={self.score:.2f}>"
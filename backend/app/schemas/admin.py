@@ -21,6 +21,7 @@ class ModerationAction(BaseModel):
 
 class FlaggedContent(BaseModel):
     """Flagged content for review"""
+    flag_id: int
     content_id: int
     content_type: str  # 'post' or 'comment'
     content_text: str
@@ -28,12 +29,14 @@ class FlaggedContent(BaseModel):
     author_username: str
     sentiment_label: str
     toxicity_level: str
+    toxicity_score: float = 0.0
     flag_count: int
     created_at: datetime
 
     class Config:
         json_schema_extra = {
             "example": {
+                "flag_id": 12,
                 "content_id": 1,
                 "content_type": "post",
                 "content_text": "This is harmful content...",
@@ -41,12 +44,21 @@ class FlaggedContent(BaseModel):
                 "author_username": "baduser",
                 "sentiment_label": "negative",
                 "toxicity_level": "high",
+                "toxicity_score": 0.75,
                 "flag_count": 3,
                 "created_at": "2024-01-15T10:30:00"
             }
         }
 
 
+class FlaggedContentPage(BaseModel):
+    """One page of the moderation queue"""
+    items: List[FlaggedContent]
+    page_size: int
+    has_more: bool
+    next_cursor: Optional[str] = None
+
+
 class UserManagement(BaseModel):
     """User management action"""
     user_id: int
@@ -64,6 +76,7 @@ class SystemStats(BaseModel):
     comments_today: int
     flagged_content_count: int
     suspended_users_count: int
+    as_of: Optional[datetime] = None  # when the totals were counted
 
     class Config:
         json_schema_extra = {
@@ -75,20 +88,47 @@ class SystemStats(BaseModel):
                 "total_comments": 15000,
                 "comments_today": 450,
                 "flagged_content_count": 5,
-                "suspended_users_count": 2
+                "suspended_users_count": 2,
+                "as_of": "2024-01-15T10:30:00Z"
+            }
+        }
+
+
+class MediaStorageReport(BaseModel):
+    """Content-addressed media store usage"""
+    blobs: int  # distinct stored files
+    stored_bytes: int
+    uploads: int
+    deduplicated_uploads: int  # uploads that matched a stored file
+    references: int  # posts, media items and stories using stored files
+    bytes_saved: int  # bytes deduplicated uploads did not write
+    unreferenced_blobs: int  # awaiting garbage collection
+    unreferenced_bytes: int
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "blobs": 1200,
+                "stored_bytes": 734003200,
+                "uploads": 1500,
+                "deduplicated_uploads": 300,
+                "references": 2100,
+                "bytes_saved": 157286400,
+                "unreferenced_blobs": 4,
+                "unreferenced_bytes": 2097152
             }
         }
 
 
 class UserDetail(BaseModel):
     """Detailed user information for admin"""
-    User_id: int
-    Username: str
-    Email: str
-    Date_Joined: date
-    Country: Optional[str]
+    id: int
+    username: str
+    email: str
+    created_at: Optional[datetime] = None
+    country: Optional[str] = None
     role: str = "user"
-    status: str = "active"
+    is_active: bool = True
     posts_count: int
     comments_count: int
     followers_count: int
@@ -96,4 +136,4 @@ class UserDetail(BaseModel):
     flags_received: int
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
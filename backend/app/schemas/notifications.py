@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 
 class NotificationActor(BaseModel):
@@ -23,3 +23,9 @@ class NotificationResponse(BaseModel):
 
     class Config:
         orm_mode = True
+
+
+class NotificationListResponse(BaseModel):
+    notifications: List[NotificationResponse]
+    has_more: bool
+    next_cursor: Optional[str] = None
@@ -93,6 +93,7 @@ class PostResponse(BaseModel):
 
     # Extras
     sentiment: Optional[SentimentAnalysis] = None
+    sentiment_status: str = "ready"  # pending until the scoring job runs
     media: List[MediaResponse] = []
 
     class Config:
@@ -160,10 +161,11 @@ class ReactionResponse(BaseModel):
 
 class FeedResponse(BaseModel):
     posts: List[PostResponse]
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: Optional[int] = None
     page_size: int
     has_more: bool
+    next_cursor: Optional[str] = None
 
 
 # ======================================================
@@ -8,24 +8,23 @@ from pydantic import BaseModel
 class StoryAuthor(BaseModel):
     id: int
     username: str
+    profile_pic_url: Optional[str] = None
 
     class Config:
         from_attributes = True
 
 
-class StoryCreate(BaseModel):
-    title: str
-    content: str
-    is_published: bool = True
-
-
 class StoryResponse(BaseModel):
     id: int
-    title: str
-    content: str
+    user_id: int
     author: StoryAuthor
-    is_published: bool
+    media_url: str
+    media_type: str
     created_at: datetime
+    expires_at: datetime
+    is_expired: bool
+    views_count: int = 0
+    is_viewed: bool = False
 
     class Config:
         from_attributes = True
@@ -34,3 +33,4 @@ class StoryResponse(BaseModel):
 class StoriesListResponse(BaseModel):
     stories: List[StoryResponse]
     total: int
+    has_unviewed: bool = False
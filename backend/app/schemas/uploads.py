@@ -0,0 +1,22 @@
+# app/schemas/uploads.py
+
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+
+class UploadSessionCreate(BaseModel):
+    purpose: str = Field(..., pattern="^(media|story)$")
+    media_type: str = Field(..., pattern="^(image|video)$")
+    filename: str = Field(..., min_length=1, max_length=255)
+    content_type: str
+    total_size: int = Field(..., gt=0)
+
+
+class UploadSessionResponse(BaseModel):
+    id: str
+    purpose: str
+    media_type: str
+    total_size: int
+    offset: int  # bytes received so far; the next chunk starts here
+    complete: bool
+    expires_at: datetime  # if no further chunk arrives
@@ -0,0 +1,119 @@
+# app/services/analytics.py
+
+"""
+Set-based analytics queries.
+
+Everything here runs a fixed number of grouped statements regardless of
+how many posts a user has; per-post engagement comes from the
+denormalized counters on Post.
+"""
+
+from typing import Dict
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models import Comment, Post, Profile, Sentiment
+
+SENTIMENT_LABELS = ("positive", "negative", "neutral")
+
+# A comment counts as two reactions
+COMMENT_ENGAGEMENT = 2
+
+
+def _percentage(part: int, total: int) -> float:
+    return round(part / max(total, 1) * 100, 1)
+
+
+def user_dashboard(db: Session, user_id: int, top_n: int = 5) -> Dict:
+    """Overview totals, sentiment distribution and top posts in three queries"""
+
+    # 1. Overview: post aggregates plus scalar subqueries for the rest
+    comments_made = (
+        select(func.count(Comment.id))
+        .where(Comment.user_id == user_id)
+        .scalar_subquery()
+    )
+    followers = (
+        select(Profile.followers_count)
+        .where(Profile.user_id == user_id)
+        .scalar_subquery()
+    )
+    following = (
+        select(Profile.following_count)
+        .where(Profile.user_id == user_id)
+        .scalar_subquery()
+    )
+
+    total_posts, total_likes, comments_received, total_comments, followers_count, following_count = (
+        db.query(
+            func.count(Post.id),
+            func.coalesce(func.sum(Post.likes_count), 0),
+            func.coalesce(func.sum(Post.comments_count), 0),
+            comments_made,
+            followers,
+            following
+        )
+        .filter(Post.user_id == user_id)
+        .one()
+    )
+
+    # 2. Sentiment distribution
+    distribution = dict(
+        db.query(Sentiment.label, func.count(Sentiment.id))
+        .join(Post, Post.id == Sentiment.post_id)
+        .filter(Post.user_id == user_id)
+        .group_by(Sentiment.label)
+        .all()
+    )
+
+    # 3. Top posts, ordered and limited in the database
+    engagement = (
+        Post.likes_count + Post.comments_count * COMMENT_ENGAGEMENT
+    ).label("engagement")
+
+    top_posts = (
+        db.query(
+            Post.id,
+            func.substr(Post.content, 1, 100),
+            func.length(Post.content),
+            Post.likes_count,
+            Post.comments_count,
+            engagement,
+            Post.created_at
+        )
+        .filter(Post.user_id == user_id)
+        .order_by(engagement.desc(), Post.created_at.desc(), Post.id.desc())
+        .limit(top_n)
+        .all()
+    )
+
+    return {
+        "overview": {
+            "total_posts": total_posts,
+            "total_comments": total_comments,
+            "total_likes_received": int(total_likes),
+            "total_comments_received": int(comments_received),
+            "average_engagement": round(int(total_likes) / total_posts, 2) if total_posts else 0,
+            "followers": followers_count or 0,
+            "following": following_count or 0
+        },
+        "sentiment_analysis": {
+            "distribution": distribution,
+            **{
+                f"{label}_percentage": _percentage(distribution.get(label, 0), total_posts)
+                for label in SENTIMENT_LABELS
+            }
+        },
+        "top_posts": [
+            {
+                "post_id": post_id,
+                "content": (preview or "") + ("..." if (length or 0) > 100 else ""),
+                "likes": likes,
+                "comments": comments,
+                "engagement_score": score,
+                "date": created_at.isoformat()
+            }
+            for post_id, preview, length, likes, comments, score, created_at in top_posts
+        ]
+    }
@@ -0,0 +1,127 @@
+# app/services/engagement.py
+
+from typing import Dict, List
+
+from sqlalchemy import or_, select, func
+from sqlalchemy.orm import Session
+
+from app.models import Post, Reaction, Comment
+
+REACTION_TYPES = ("like", "love", "haha", "wow", "sad", "angry")
+
+
+def reaction_counter(reaction_type: str):
+    """Post column holding the count for one reaction type"""
+    return getattr(Post, f"{reaction_type}_count")
+
+
+# =========================================================
+# Transactional Counter Updates
+# =========================================================
+# Updates are issued as `col = col + delta` so concurrent writers
+# never overwrite each other. The caller controls the transaction.
+
+def add_reaction(*, db: Session, post_id: int, reaction_type: str) -> None:
+    counter = reaction_counter(reaction_type)
+
+    db.query(Post).filter(Post.id == post_id).update(
+        {
+            Post.likes_count: Post.likes_count + 1,
+            counter: counter + 1
+        },
+        synchronize_session=False
+    )
+
+
+def remove_reaction(*, db: Session, post_id: int, reaction_type: str) -> None:
+    counter = reaction_counter(reaction_type)
+
+    db.query(Post).filter(Post.id == post_id).update(
+        {
+            Post.likes_count: Post.likes_count - 1,
+            counter: counter - 1
+        },
+        synchronize_session=False
+    )
+
+
+def change_reaction(
+    *,
+    db: Session,
+    post_id: int,
+    old_type: str,
+    new_type: str
+) -> None:
+    old_counter = reaction_counter(old_type)
+    new_counter = reaction_counter(new_type)
+
+    db.query(Post).filter(Post.id == post_id).update(
+        {
+            old_counter: old_counter - 1,
+            new_counter: new_counter + 1
+        },
+        synchronize_session=False
+    )
+
+
+def add_comments(*, db: Session, post_id: int, count: int = 1) -> None:
+    if not count:
+        return
+
+    db.query(Post).filter(Post.id == post_id).update(
+        {Post.comments_count: Post.comments_count + count},
+        synchronize_session=False
+    )
+
+
+def reaction_breakdown(post: Post) -> Dict[str, int]:
+    breakdown = {}
+    for reaction_type in REACTION_TYPES:
+        count = getattr(post, f"{reaction_type}_count") or 0
+        if count:
+            breakdown[reaction_type] = count
+    return breakdown
+
+
+# =========================================================
+# Reconciliation
+# =========================================================
+
+def reconcile_engagement_counters(db: Session) -> int:
+    """
+    Recompute every post's counters from the reactions and comments
+    tables in a single set-based UPDATE, touching only posts whose
+    stored counters drifted. Returns the number of posts repaired.
+    """
+    actual = {
+        Post.likes_count: (
+            select(func.count(Reaction.id))
+            .where(Reaction.post_id == Post.id)
+            .scalar_subquery()
+        ),
+        Post.comments_count: (
+            select(func.count(Comment.id))
+            .where(Comment.post_id == Post.id)
+            .scalar_subquery()
+        ),
+    }
+
+    for reaction_type in REACTION_TYPES:
+        actual[reaction_counter(reaction_type)] = (
+            select(func.count(Reaction.id))
+            .where(
+                Reaction.post_id == Post.id,
+                Reaction.reaction_type == reaction_type
+            )
+            .scalar_subquery()
+        )
+
+    drifted: List = [column != value for column, value in actual.items()]
+
+    repaired = db.query(Post).filter(or_(*drifted)).update(
+        actual,
+        synchronize_session=False
+    )
+    db.commit()
+
+    return repaired
@@ -0,0 +1,225 @@
+# app/services/media_store.py
+
+"""
+Reference counts for the content-addressed media store.
+
+Every post_media, media and stories row pointing at a stored file holds
+one reference on its media_blobs row. Counts move in the same
+transaction as those rows (`ref_count = ref_count + delta`); rows removed
+by cascades (a deleted post or user) are caught by reconcile_media_blobs,
+which also deletes files left unreferenced for MEDIA_GC_GRACE_SECONDS.
+Files are moved into the store before their blob row commits, so a
+file whose transaction failed has no row at all; the reconcile sweeps
+those too once they are as old.
+"""
+
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import dialect_insert
+from app.models import Media, MediaBlob, PostMedia, Story
+from app.services.media_variants import drop_variants
+from app.utils.file_handler import StoredFile, file_handler
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+# =========================================================
+# Transactional Reference Updates
+# =========================================================
+# The caller controls the transaction.
+
+def acquire_blob(*, db: Session, stored: StoredFile, file_type: str) -> None:
+    """Count a new upload of `stored` and the row that will reference it"""
+    now = _utcnow()
+
+    stmt = dialect_insert(db, MediaBlob).values(
+        file_url=stored.url,
+        sha256=stored.sha256,
+        file_type=file_type,
+        size=os.path.getsize(stored.path),
+        ref_count=1,
+        uploads=1,
+        updated_at=now
+    )
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[MediaBlob.file_url],
+        set_={
+            "ref_count": MediaBlob.ref_count + 1,
+            "uploads": MediaBlob.uploads + 1,
+            "updated_at": now
+        }
+    ))
+
+
+def add_references(*, db: Session, file_url: str, count: int = 1) -> None:
+    """Adjust a stored file's reference count (no-op for files outside the store)"""
+    if not count:
+        return
+
+    db.query(MediaBlob).filter(MediaBlob.file_url == file_url).update(
+        {
+            MediaBlob.ref_count: MediaBlob.ref_count + count,
+            MediaBlob.updated_at: _utcnow()
+        },
+        synchronize_session=False
+    )
+
+
+def release_blob(*, db: Session, file_url: str) -> None:
+    add_references(db=db, file_url=file_url, count=-1)
+
+
+# =========================================================
+# Reconciliation & Garbage Collection
+# =========================================================
+
+def _reference_count():
+    return sum(
+        select(func.count()).select_from(model).where(column == MediaBlob.file_url).scalar_subquery()
+        for model, column in (
+            (PostMedia, PostMedia.file_url),
+            (Media, Media.file_url),
+            (Story, Story.media_url),
+        )
+    )
+
+
+def collect_garbage(db: Session) -> List[str]:
+    """
+    Delete blobs unreferenced for MEDIA_GC_GRACE_SECONDS, their files
+    and cached renditions.
+    A file touched within the grace period (a duplicate upload that is
+    about to re-register it) is kept. Returns the URLs removed.
+    """
+    cutoff = _utcnow() - timedelta(seconds=settings.MEDIA_GC_GRACE_SECONDS)
+
+    removed = db.execute(
+        delete(MediaBlob)
+        .where(MediaBlob.ref_count <= 0, MediaBlob.updated_at < cutoff)
+        .returning(MediaBlob.file_url, MediaBlob.sha256)
+    ).all()
+    db.commit()
+
+    oldest = time.time() - settings.MEDIA_GC_GRACE_SECONDS
+    for file_url, sha256 in removed:
+        path = file_handler.path_for_url(file_url)
+        try:
+            if os.stat(path).st_mtime < oldest:
+                os.remove(path)
+                drop_variants(sha256)
+        except FileNotFoundError:
+            pass
+
+    return [file_url for file_url, _ in removed]
+
+
+def sweep_unregistered_files(db: Session) -> List[str]:
+    """
+    Delete stored files older than MEDIA_GC_GRACE_SECONDS that have no
+    media_blobs row (their upload's transaction never committed), with
+    their cached renditions. Returns the URLs removed.
+    """
+    store = Path(settings.UPLOAD_DIR) / "media"
+    if not store.exists():
+        return []
+
+    oldest = time.time() - settings.MEDIA_GC_GRACE_SECONDS
+    removed = []
+
+    for directory in store.iterdir():
+        if not directory.is_dir():
+            continue
+
+        candidates = {}
+        for path in directory.iterdir():
+            try:
+                if path.stat().st_mtime < oldest:
+                    candidates[f"/uploads/media/{directory.name}/{path.name}"] = path
+            except FileNotFoundError:
+                pass
+        if not candidates:
+            continue
+
+        registered = {
+            file_url for (file_url,) in
+            db.query(MediaBlob.file_url).filter(MediaBlob.file_url.in_(list(candidates)))
+        }
+        for file_url, path in candidates.items():
+            if file_url in registered:
+                continue
+            try:
+                # Re-check: a duplicate upload refreshes mtime before registering
+                if path.stat().st_mtime < oldest:
+                    path.unlink()
+                    drop_variants(path.stem)
+                    removed.append(file_url)
+            except FileNotFoundError:
+                pass
+
+    return removed
+
+
+def reconcile_media_blobs(db: Session) -> int:
+    """
+    Recount every blob's references from post_media, media and stories,
+    touching only blobs whose count drifted, then collect garbage
+    (including stored files that never got a blob row).
+    Returns the number of blobs repaired.
+    """
+    actual = _reference_count()
+
+    repaired = db.query(MediaBlob).filter(MediaBlob.ref_count != actual).update(
+        {
+            MediaBlob.ref_count: actual,
+            MediaBlob.updated_at: _utcnow()
+        },
+        synchronize_session=False
+    )
+    db.commit()
+
+    collect_garbage(db)
+    sweep_unregistered_files(db)
+    return repaired
+
+
+# =========================================================
+# Reporting
+# =========================================================
+
+def storage_report(db: Session) -> Dict[str, int]:
+    """Store size and the bytes deduplication avoided writing"""
+    referenced = MediaBlob.ref_count > 0
+
+    blobs, stored_bytes, uploads, references, bytes_saved = db.query(
+        func.count(MediaBlob.file_url),
+        func.coalesce(func.sum(MediaBlob.size), 0),
+        func.coalesce(func.sum(MediaBlob.uploads), 0),
+        func.coalesce(func.sum(MediaBlob.ref_count), 0),
+        func.coalesce(func.sum(MediaBlob.size * (MediaBlob.uploads - 1)), 0)
+    ).one()
+
+    unreferenced_blobs, unreferenced_bytes = db.query(
+        func.count(MediaBlob.file_url),
+        func.coalesce(func.sum(MediaBlob.size), 0)
+    ).filter(~referenced).one()
+
+    return {
+        "blobs": blobs,
+        "stored_bytes": stored_bytes,
+        "uploads": uploads,
+        "deduplicated_uploads": uploads - blobs,
+        "references": references,
+        "bytes_saved": bytes_saved,
+        "unreferenced_blobs": unreferenced_blobs,
+        "unreferenced_bytes": unreferenced_bytes
+    }
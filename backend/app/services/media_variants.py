@@ -0,0 +1,145 @@
+# app/services/media_variants.py
+
+"""
+Resized renditions of stored images, generated on first request.
+
+    GET /media/variants/<sha256>/<variant>.<format>
+
+<sha256> is the stored file's name (/uploads/media/<ab>/<sha256>.jpg),
+`variant` one of VARIANTS (longest side in pixels) and `format` is
+webp or jpg. Stored images are content-addressed, so a rendition never
+changes once written and is served as immutable. Renditions are cached
+under UPLOAD_DIR/.variants and pruned least-recently-used first once
+they exceed MEDIA_VARIANT_CACHE_BYTES; a hit refreshes the file's mtime
+(at most every TOUCH_INTERVAL_SECONDS) so recency survives restarts.
+
+Concurrent requests for a missing rendition share one transcode per
+worker process; across workers the final rename makes any duplicate
+work harmless.
+"""
+
+import asyncio
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.utils.file_handler import file_handler
+
+VARIANTS: Dict[str, int] = {
+    "thumb": 320,
+    "feed": 1080,
+    "full": file_handler.MAX_IMAGE_WIDTH
+}
+FORMATS: Dict[str, str] = {"webp": "WEBP", "jpg": "JPEG"}
+MEDIA_TYPES: Dict[str, str] = {"webp": "image/webp", "jpg": "image/jpeg"}
+
+TOUCH_INTERVAL_SECONDS = 600
+
+# (sha256, variant, format) -> transcode in progress
+_pending: Dict[Tuple[str, str, str], asyncio.Future] = {}
+
+
+def variant_dir() -> Path:
+    return Path(settings.UPLOAD_DIR) / '.variants'
+
+
+def variant_path(sha256: str, variant: str, image_format: str) -> Path:
+    return variant_dir() / sha256[:2] / f"{sha256}-{variant}.{image_format}"
+
+
+def _touch(path: Path) -> None:
+    """Record a cache hit; raises FileNotFoundError on a miss"""
+    if time.time() - path.stat().st_mtime > TOUCH_INTERVAL_SECONDS:
+        os.utime(path)
+
+
+# =========================================================
+# Generation
+# =========================================================
+
+async def variant_file(sha256: str, variant: str, image_format: str) -> Path:
+    """
+    Path of the rendition, transcoding it first if it isn't cached.
+    Raises FileNotFoundError if no image is stored under `sha256`, or
+    HTTPException when the image pool is saturated.
+    """
+    _, source = file_handler.content_location(sha256, "jpg")
+    if not source.exists():
+        raise FileNotFoundError(source)
+
+    if VARIANTS[variant] >= file_handler.MAX_IMAGE_WIDTH and image_format == "jpg":
+        # Stored images already are JPEGs within these bounds
+        return source
+
+    target = variant_path(sha256, variant, image_format)
+    try:
+        _touch(target)
+        return target
+    except FileNotFoundError:
+        pass
+
+    key = (sha256, variant, image_format)
+    render = _pending.get(key)
+    if render is None:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        render = asyncio.ensure_future(file_handler.transcode(
+            source, target, VARIANTS[variant], VARIANTS[variant], FORMATS[image_format]
+        ))
+        _pending[key] = render
+        render.add_done_callback(lambda _: _pending.pop(key, None))
+
+    # A waiter that goes away must not cancel everyone else's transcode
+    await asyncio.shield(render)
+    return target
+
+
+# =========================================================
+# Cache Maintenance
+# =========================================================
+
+def _cached_files() -> List[os.DirEntry]:
+    root = variant_dir()
+    if not root.exists():
+        return []
+
+    return [
+        entry
+        for shard in os.scandir(root) if shard.is_dir()
+        for entry in os.scandir(shard.path) if entry.is_file()
+    ]
+
+
+def drop_variants(sha256: str) -> None:
+    """Remove every cached rendition of a stored image"""
+    shard = variant_dir() / sha256[:2]
+    for path in shard.glob(f"{sha256}-*"):
+        file_handler.delete_file(str(path))
+
+
+def prune_variant_cache(db: Session) -> int:
+    """
+    Delete least recently used renditions until the cache fits in
+    MEDIA_VARIANT_CACHE_BYTES. Returns the bytes freed.
+    """
+    files = []
+    for entry in _cached_files():
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue
+        files.append((stat.st_mtime, stat.st_size, entry.path))
+
+    excess = sum(size for _, size, _ in files) - settings.MEDIA_VARIANT_CACHE_BYTES
+    freed = 0
+
+    for _, size, path in sorted(files):
+        if freed >= excess:
+            break
+        if file_handler.delete_file(path):
+            freed += size
+
+    return freed
@@ -0,0 +1,200 @@
+# app/services/moderation.py
+
+"""
+Moderation queue.
+
+Whenever a post or comment is scored, the analyzer's verdict
+(should_flag_for_moderation) is persisted: flaggable content gets an open
+`moderation_flags` row, content that no longer qualifies drops its open
+flag. A resolved flag is reopened (and requeued) only if a rescore finds
+the content more toxic than when it was reviewed; `flag_count` counts
+the times the target was queued for review, not every rescore that
+agreed with an open flag.
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import case
+from sqlalchemy.orm import Session
+
+from app.database import dialect_insert
+from app.models import Comment, ModerationFlag, Post, User
+from app.utils.pagination import keyset_page
+from app.utils.sentiment import sentiment_analyzer
+
+# Moderator action -> resulting flag status
+ACTION_STATUS = {
+    "approve": "approved",
+    "remove": "removed",
+    "suspend_user": "actioned",
+    "warn": "actioned",
+}
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+# =========================================================
+# Flagging
+# =========================================================
+
+def record_flags(db: Session, target_type: str, rows: List[Dict]) -> None:
+    """
+    Raise, update or clear flags for freshly scored targets.
+    `rows` are sentiment rows carrying the analyzer result fields
+    (`label`, `confidence`, `toxicity`, `toxicity_score`); rows without
+    a toxicity verdict are ignored. The caller controls the transaction.
+    """
+    target_col = f"{target_type}_id"
+    rows = [row for row in rows if "toxicity" in row]
+    if not rows:
+        return
+
+    flagged = [row for row in rows if sentiment_analyzer.should_flag_for_moderation(row)]
+    flagged_ids = {row[target_col] for row in flagged}
+    cleared = [row[target_col] for row in rows if row[target_col] not in flagged_ids]
+
+    column = getattr(ModerationFlag, target_col)
+
+    if cleared:
+        db.query(ModerationFlag).filter(
+            column.in_(cleared),
+            ModerationFlag.status == "open"
+        ).delete(synchronize_session=False)
+
+    if not flagged:
+        return
+
+    model = Post if target_type == "post" else Comment
+    authors = dict(
+        db.query(model.id, model.user_id).filter(model.id.in_(flagged_ids))
+    )
+
+    now = _utcnow()
+    values = [
+        {
+            "target_type": target_type,
+            "target_id": row[target_col],
+            target_col: row[target_col],
+            "author_id": authors[row[target_col]],
+            "status": "open",
+            "sentiment_label": row["label"],
+            "confidence": row.get("confidence", 0.0),
+            "toxicity": row["toxicity"],
+            "toxicity_score": row.get("toxicity_score", 0.0),
+            "created_at": now
+        }
+        for row in flagged
+        if row[target_col] in authors  # deleted since it was scored
+    ]
+    if not values:
+        return
+
+    stmt = dialect_insert(db, ModerationFlag).values(values)
+
+    # A resolved flag keeps the verdict it was reviewed on unless the new
+    # one is worse; then it is reopened at the back of the queue
+    reopened = (
+        (ModerationFlag.status != "open")
+        & (stmt.excluded.toxicity_score > ModerationFlag.toxicity_score)
+    )
+    current = (ModerationFlag.status == "open") | reopened
+
+    def latest(column: str):
+        return case((current, stmt.excluded[column]), else_=getattr(ModerationFlag, column))
+
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[target_col],
+        set_={
+            "sentiment_label": latest("sentiment_label"),
+            "confidence": latest("confidence"),
+            "toxicity": latest("toxicity"),
+            "toxicity_score": latest("toxicity_score"),
+            "status": case((current, "open"), else_=ModerationFlag.status),
+            "created_at": case((reopened, stmt.excluded.created_at), else_=ModerationFlag.created_at),
+            "flag_count": case(
+                (reopened, ModerationFlag.flag_count + 1),
+                else_=ModerationFlag.flag_count
+            )
+        }
+    ))
+
+
+# =========================================================
+# Queue
+# =========================================================
+
+def open_flags(
+    db: Session,
+    content_type: Optional[str],
+    cursor: Optional[str],
+    limit: int
+) -> Tuple[List, Optional[str]]:
+    """
+    One newest-first page of open flags across posts and comments, with
+    author and content. Rows are (flag, username, content).
+    """
+    query = (
+        db.query(ModerationFlag, User.username, Post.content, Comment.content)
+        .join(User, User.id == ModerationFlag.author_id)
+        .outerjoin(Post, Post.id == ModerationFlag.post_id)
+        .outerjoin(Comment, Comment.id == ModerationFlag.comment_id)
+        .filter(ModerationFlag.status == "open")
+    )
+    if content_type in ("post", "comment"):
+        query = query.filter(ModerationFlag.target_type == content_type)
+
+    rows, next_cursor = keyset_page(
+        query,
+        ModerationFlag.created_at,
+        ModerationFlag.id,
+        cursor,
+        limit,
+        key=lambda row: (row[0].created_at, row[0].id)
+    )
+
+    return [
+        (flag, username, post_content if post_content is not None else comment_content)
+        for flag, username, post_content, comment_content in rows
+    ], next_cursor
+
+
+def detach_flags(db: Session, target_type: str, target_ids: List[int]) -> None:
+    """
+    Unlink flags from targets about to be deleted so the flag, and the
+    decision recorded on it, survives the content.
+    The caller controls the transaction.
+    """
+    if not target_ids:
+        return
+
+    column = ModerationFlag.post_id if target_type == "post" else ModerationFlag.comment_id
+    db.query(ModerationFlag).filter(column.in_(target_ids)).update(
+        {column: None}, synchronize_session=False
+    )
+
+
+def resolve_flag(
+    *,
+    db: Session,
+    target_type: str,
+    target_id: int,
+    moderator_id: int,
+    action: str,
+    reason: Optional[str] = None
+) -> int:
+    """
+    Record a moderator's decision on the target's flag.
+    The caller controls the transaction (commit/rollback).
+    """
+    column = ModerationFlag.post_id if target_type == "post" else ModerationFlag.comment_id
+
+    return db.query(ModerationFlag).filter(column == target_id).update({
+        ModerationFlag.status: ACTION_STATUS[action],
+        ModerationFlag.action: action,
+        ModerationFlag.reason: reason,
+        ModerationFlag.moderator_id: moderator_id,
+        ModerationFlag.resolved_at: _utcnow()
+    }, synchronize_session=False)
@@ -0,0 +1,100 @@
+# app/services/removal.py
+
+"""
+Deleting posts and comments together with everything counted from them.
+
+A deleted row takes its replies, reactions, sentiments and attachments
+with it through cascades, which the denormalized counters never see:
+the post's comments_count, trending scores, the daily rollups and media
+reference counts. These functions uncount all of that, detach the
+moderation flags (which are kept as a record), then delete.
+The caller controls the transaction (commit/rollback).
+"""
+
+from collections import Counter
+from typing import List
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import Comment, Post, PostMedia, Sentiment, TrendingPost
+from app.services import engagement, rollups, trending
+from app.services.media_store import add_references
+from app.services.moderation import detach_flags
+
+
+def thread_ids(db: Session, comment_id: int) -> List[int]:
+    """Ids of a comment and every reply below it"""
+    thread = (
+        select(Comment.id)
+        .where(Comment.id == comment_id)
+        .cte("thread", recursive=True)
+    )
+    thread = thread.union_all(
+        select(Comment.id).where(Comment.parent_id == thread.c.id)
+    )
+    return [row.id for row in db.execute(select(thread.c.id))]
+
+
+def delete_comment_thread(*, db: Session, comment: Comment) -> int:
+    """
+    Delete a comment with its whole reply thread, keeping the post's
+    comment counter, trending score and rollups exact.
+    Returns the number of comments removed.
+    """
+    ids = thread_ids(db, comment.id)
+
+    post_author_id = db.query(Post.user_id).filter(
+        Post.id == comment.post_id
+    ).scalar()
+    rollups.forget_comments(
+        db=db, comment_ids=ids, post_author_id=post_author_id
+    )
+
+    # Explicit sentiment cleanup (safe for DB project)
+    db.query(Sentiment).filter(
+        Sentiment.comment_id.in_(ids)
+    ).delete(synchronize_session=False)
+    detach_flags(db, "comment", ids)
+
+    removed = db.query(Comment).filter(
+        Comment.id.in_(ids)
+    ).delete(synchronize_session=False)
+
+    engagement.add_comments(db=db, post_id=comment.post_id, count=-removed)
+    trending.record_engagement(
+        db=db,
+        post_id=comment.post_id,
+        weight=-trending.COMMENT_WEIGHT * removed
+    )
+
+    return removed
+
+
+def delete_post(*, db: Session, post: Post) -> None:
+    """
+    Delete a post with its comments, reactions, sentiment and
+    attachments, uncounting them from the rollups, its trending entry
+    and the stored files they reference.
+    """
+    comment_ids = [
+        comment_id for (comment_id,) in
+        db.query(Comment.id).filter(Comment.post_id == post.id)
+    ]
+    rollups.forget_comments(db=db, comment_ids=comment_ids, post_author_id=post.user_id)
+    rollups.forget_post(db=db, post_id=post.id)
+
+    attachments = Counter(
+        file_url for (file_url,) in
+        db.query(PostMedia.file_url).filter(PostMedia.post_id == post.id)
+    )
+    for file_url, count in attachments.items():
+        add_references(db=db, file_url=file_url, count=-count)
+
+    db.query(TrendingPost).filter(
+        TrendingPost.post_id == post.id
+    ).delete(synchronize_session=False)
+    detach_flags(db, "comment", comment_ids)
+    detach_flags(db, "post", [post.id])
+
+    db.delete(post)
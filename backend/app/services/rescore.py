@@ -0,0 +1,197 @@
+# app/services/rescore.py
+
+"""
+Bulk re-scoring of stored sentiments (e.g. after a lexicon change).
+
+Posts and comments are streamed in id order over a server-side cursor on
+their own connection, scored in fixed-size chunks and written back with
+upsert_sentiments (so rollups and the moderation queue follow along),
+one commit per chunk. Texts go through the sentiment cache, so only
+misses are scored: with the lexicon backend they are fanned out over a
+process pool while the next chunks are being read; other backends score
+in-process with their own batching.
+
+After every committed chunk the last id per target type is saved to a
+checkpoint file, and a run given the same file resumes after it.
+Dry runs write nothing and only count label drift.
+"""
+
+import json
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.sentiment import LexiconBackend, get_backend
+from app.models import Comment, Post, Sentiment
+from app.services.sentiment_cache import analyze_texts, split_cached, store_results
+from app.services.sentiment_jobs import upsert_sentiments
+from app.utils.sentiment import analyze_sentiment_batch
+
+TARGETS = {"post": Post, "comment": Comment}
+
+Chunk = List[Tuple[int, Optional[str]]]
+
+
+# =========================================================
+# Checkpoints
+# =========================================================
+
+def load_checkpoint(path: str) -> Dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_checkpoint(path: str, state: Dict) -> None:
+    # Write-then-rename, so an interrupted run never leaves a torn file
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+# =========================================================
+# Streaming
+# =========================================================
+
+def _stream_chunks(db: Session, target_type: str, after_id: int, chunk_size: int) -> Iterator[Chunk]:
+    """(id, content) rows with id > after_id, in id order, chunk by chunk"""
+    model = TARGETS[target_type]
+    bind = db.get_bind()
+
+    if bind.dialect.name != "postgresql":
+        # No server-side cursors (and a reader would block the writer on
+        # SQLite): walk the id index one chunk per query instead
+        while True:
+            chunk = [
+                tuple(row) for row in db.execute(
+                    select(model.id, model.content)
+                    .where(model.id > after_id)
+                    .order_by(model.id)
+                    .limit(chunk_size)
+                )
+            ]
+            if not chunk:
+                return
+            yield chunk
+            after_id = chunk[-1][0]
+
+    # A separate connection keeps the cursor open across per-chunk commits
+    with bind.connect() as conn:
+        result = conn.execution_options(
+            stream_results=True,
+            yield_per=chunk_size
+        ).execute(
+            select(model.id, model.content)
+            .where(model.id > after_id)
+            .order_by(model.id)
+        )
+        for partition in result.partitions():
+            yield [tuple(row) for row in partition]
+
+
+def _scored_chunks(
+    db: Session,
+    chunks: Iterable[Chunk],
+    processes: Optional[int]
+) -> Iterator[Tuple[Chunk, List[Dict]]]:
+    """Pair each chunk with its results, in order"""
+    processes = processes or os.cpu_count() or 1
+    if not isinstance(get_backend(), LexiconBackend) or processes < 2:
+        for chunk in chunks:
+            yield chunk, analyze_texts(db, [content for _, content in chunk])
+        return
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        # Only cache misses go to the pool; keep every worker busy plus
+        # one chunk queued per worker
+        pending = []
+
+        def finish():
+            chunk, keys, found, misses, future = pending.pop(0)
+            if future is not None:
+                scored = dict(zip(misses, future.result()))
+                store_results(db, scored)
+                found.update(scored)
+            return chunk, [found[key] for key in keys]
+
+        for chunk in chunks:
+            keys, found, misses = split_cached(db, [content for _, content in chunk])
+            future = None
+            if misses:
+                future = pool.submit(analyze_sentiment_batch, list(misses.values()), 1)
+            pending.append((chunk, keys, found, misses, future))
+            if len(pending) >= processes * 2:
+                yield finish()
+        while pending:
+            yield finish()
+
+
+# =========================================================
+# Rescore
+# =========================================================
+
+def rescore_corpus(
+    db: Session,
+    *,
+    target_types: Sequence[str] = ("post", "comment"),
+    chunk_size: int = 1000,
+    processes: Optional[int] = None,
+    dry_run: bool = False,
+    checkpoint: Optional[str] = None,
+    progress: Optional[Callable[[str, int, int], None]] = None
+) -> Dict:
+    """
+    Re-score every post and comment; resumes from `checkpoint` if it
+    exists (dry runs neither read nor write it).
+    Returns {"scored": {type: n}, "drift": {"old->new": n}};
+    `progress(target_type, last_id, scored)` is called after each chunk.
+    """
+    state = {"last_id": {}, "scored": {}, "drift": {}}
+    if checkpoint and not dry_run and os.path.exists(checkpoint):
+        state = load_checkpoint(checkpoint)
+
+    drift = Counter(state["drift"])
+
+    for target_type in target_types:
+        target_col = f"{target_type}_id"
+        sentiment_col = getattr(Sentiment, target_col)
+        last_id = state["last_id"].get(target_type, 0)
+        scored = state["scored"].get(target_type, 0)
+
+        chunks = _stream_chunks(db, target_type, last_id, chunk_size)
+        for chunk, results in _scored_chunks(db, chunks, processes):
+            ids = [target_id for target_id, _ in chunk]
+            current = dict(
+                db.query(sentiment_col, Sentiment.label).filter(sentiment_col.in_(ids))
+            )
+
+            for target_id, result in zip(ids, results):
+                old = current.get(target_id, "missing")
+                if old != result["label"]:
+                    drift[f"{old}->{result['label']}"] += 1
+
+            if dry_run:
+                db.rollback()
+            else:
+                upsert_sentiments(db, [
+                    {**result, target_col: target_id}
+                    for target_id, result in zip(ids, results)
+                ], target_type)
+                db.commit()
+
+            last_id = ids[-1]
+            scored += len(ids)
+            state["last_id"][target_type] = last_id
+            state["scored"][target_type] = scored
+            state["drift"] = dict(drift)
+
+            if checkpoint and not dry_run:
+                save_checkpoint(checkpoint, state)
+            if progress:
+                progress(target_type, last_id, scored)
+
+    return {"scored": state["scored"], "drift": dict(drift)}
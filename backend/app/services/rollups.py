@@ -0,0 +1,408 @@
+# app/services/rollups.py
+
+"""
+Daily activity rollups (daily_user_metrics / daily_metrics).
+
+Write paths bump counters with additive upserts in their own transaction;
+deletions decrement the day the row was created, so the tables always
+match a recount from source rows. backfill_rollups() recounts any date
+range and corrects the stored counters to match, and a periodic job
+re-derives the last ROLLUP_REFRESH_DAYS days to absorb drift (e.g.
+cascaded deletes).
+
+Days are UTC calendar days of the rows' created_at.
+"""
+
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import dialect_insert, try_advisory_lock
+from app.models import (
+    Comment,
+    DailyMetrics,
+    DailyUserMetrics,
+    Post,
+    Reaction,
+    Sentiment,
+    User
+)
+
+SENTIMENT_LABELS = ("positive", "negative", "neutral")
+
+
+def utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def day_of(value) -> date:
+    """UTC day of a datetime (or of a DB-returned date/ISO string)"""
+    if isinstance(value, datetime):
+        if value.tzinfo:
+            value = value.astimezone(timezone.utc)
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def _day_expr(db: Session, column):
+    if db.get_bind().dialect.name == "postgresql":
+        return func.date(func.timezone("UTC", column))
+    return func.date(column)
+
+
+# =========================================================
+# Incremental Updates
+# =========================================================
+
+def bump(*, db: Session, day: date, user_id: Optional[int] = None, **deltas: int) -> None:
+    """
+    Add `deltas` to the day's counters: the user's row when `user_id` is
+    given, the site-wide row otherwise.
+    The caller controls the transaction (commit/rollback).
+    """
+    deltas = {name: delta for name, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    model = DailyUserMetrics if user_id is not None else DailyMetrics
+    keys = {"user_id": user_id, "day": day} if user_id is not None else {"day": day}
+
+    stmt = dialect_insert(db, model).values(**keys, **deltas)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=list(keys),
+        set_={
+            name: getattr(model, name) + getattr(stmt.excluded, name)
+            for name in deltas
+        }
+    ))
+
+
+def record_post(*, db: Session, user_id: int) -> None:
+    """Count a post created now. The caller controls the transaction."""
+    day = utc_today()
+    bump(db=db, day=day, user_id=user_id, posts=1)
+    bump(db=db, day=day, posts=1)
+
+
+def record_comment(*, db: Session, user_id: int, post_author_id: int) -> None:
+    """Count a comment created now. The caller controls the transaction."""
+    day = utc_today()
+    bump(db=db, day=day, user_id=user_id, comments=1)
+    bump(db=db, day=day, user_id=post_author_id, comments_received=1)
+    bump(db=db, day=day, comments=1)
+
+
+def record_reaction(
+    *,
+    db: Session,
+    post_author_id: int,
+    delta: int = 1,
+    created_at: Optional[datetime] = None
+) -> None:
+    """
+    Count a reaction added now (delta=1) or removed (delta=-1, dated by
+    the reaction's created_at). The caller controls the transaction.
+    """
+    day = day_of(created_at) if created_at else utc_today()
+    bump(db=db, day=day, user_id=post_author_id, reactions_received=delta)
+    bump(db=db, day=day, reactions=delta)
+
+
+def forget_comments(*, db: Session, comment_ids: List[int], post_author_id: int) -> None:
+    """
+    Uncount comments (and their sentiment labels) about to be deleted.
+    The caller controls the transaction.
+    """
+    if not comment_ids:
+        return
+
+    record_sentiment_changes(db, "comment", dict.fromkeys(comment_ids))
+
+    per_user_day = Counter()
+    for user_id, created_at in db.query(Comment.user_id, Comment.created_at).filter(
+        Comment.id.in_(comment_ids)
+    ):
+        per_user_day[(user_id, day_of(created_at))] += 1
+
+    per_day = Counter()
+    for (user_id, day), count in per_user_day.items():
+        bump(db=db, day=day, user_id=user_id, comments=-count)
+        per_day[day] += count
+
+    for day, count in per_day.items():
+        bump(db=db, day=day, user_id=post_author_id, comments_received=-count)
+        bump(db=db, day=day, comments=-count)
+
+
+def forget_post(*, db: Session, post_id: int) -> None:
+    """
+    Uncount a post (its sentiment label and the reactions it received)
+    about to be deleted; its comments go through forget_comments.
+    The caller controls the transaction.
+    """
+    post = db.query(Post.user_id, Post.created_at).filter(Post.id == post_id).first()
+    if post is None:
+        return
+
+    record_sentiment_changes(db, "post", {post_id: None})
+
+    day = day_of(post.created_at)
+    bump(db=db, day=day, user_id=post.user_id, posts=-1)
+    bump(db=db, day=day, posts=-1)
+
+    per_day = Counter(
+        day_of(created_at) for (created_at,) in
+        db.query(Reaction.created_at).filter(Reaction.post_id == post_id)
+    )
+    for day, count in per_day.items():
+        bump(db=db, day=day, user_id=post.user_id, reactions_received=-count)
+        bump(db=db, day=day, reactions=-count)
+
+
+def record_sentiment_changes(
+    db: Session,
+    target_type: str,
+    new_labels: Dict[int, Optional[str]]
+) -> None:
+    """
+    Move sentiment label counts for targets about to be (re)labelled;
+    a None label means the sentiment is being removed.
+    Must run before the sentiments are written or deleted.
+    """
+    if not new_labels:
+        return
+
+    if target_type == "post":
+        rows = (
+            db.query(Post.id, Post.user_id, Post.created_at, Sentiment.label)
+            .outerjoin(Sentiment, Sentiment.post_id == Post.id)
+            .filter(Post.id.in_(list(new_labels)))
+            .all()
+        )
+    else:
+        rows = (
+            db.query(Comment.id, Comment.user_id, Comment.created_at, Sentiment.label)
+            .outerjoin(Sentiment, Sentiment.comment_id == Comment.id)
+            .filter(Comment.id.in_(list(new_labels)))
+            .all()
+        )
+
+    user_deltas: Dict[Tuple[int, date], Counter] = defaultdict(Counter)
+    global_deltas: Dict[date, Counter] = defaultdict(Counter)
+
+    for target_id, user_id, created_at, old_label in rows:
+        new_label = new_labels[target_id]
+        if old_label == new_label:
+            continue
+
+        day = day_of(created_at) if created_at else utc_today()
+        for label, delta in ((old_label, -1), (new_label, 1)):
+            if label not in SENTIMENT_LABELS:
+                continue
+            global_deltas[day][label] += delta
+            if target_type == "post":
+                user_deltas[(user_id, day)][f"{label}_posts"] += delta
+
+    for (user_id, day), deltas in user_deltas.items():
+        bump(db=db, day=day, user_id=user_id, **deltas)
+    for day, deltas in global_deltas.items():
+        bump(db=db, day=day, **deltas)
+
+
+# =========================================================
+# Backfill
+# =========================================================
+
+@contextmanager
+def _snapshot(db: Session):
+    """
+    A session whose reads all see one snapshot (a REPEATABLE READ
+    connection on PostgreSQL), so recounts and stored counters agree
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        yield db
+        return
+
+    with db.get_bind().connect().execution_options(isolation_level="REPEATABLE READ") as connection:
+        snapshot = Session(bind=connection)
+        try:
+            yield snapshot
+        finally:
+            snapshot.close()
+
+
+def _stored(db: Session, model, start: Optional[date], end: Optional[date]) -> Dict[tuple, Dict[str, int]]:
+    query = db.query(model)
+    if start:
+        query = query.filter(model.day >= start)
+    if end:
+        query = query.filter(model.day <= end)
+
+    keys = [column.name for column in model.__table__.primary_key]
+    counters = [column.name for column in model.__table__.columns if not column.primary_key]
+    return {
+        tuple(getattr(row, key) for key in keys): {name: getattr(row, name) for name in counters}
+        for row in query
+    }
+
+
+def _recount(
+    db: Session,
+    start: Optional[date],
+    end: Optional[date]
+) -> Tuple[Dict[Tuple[int, date], Counter], Dict[date, Counter]]:
+    """Per-user and site-wide counters for [start, end] from source rows"""
+    def in_range(query, column):
+        if start:
+            query = query.filter(column >= datetime.combine(start, time.min, timezone.utc))
+        if end:
+            query = query.filter(
+                column < datetime.combine(end + timedelta(days=1), time.min, timezone.utc)
+            )
+        return query
+
+    user_rows: Dict[Tuple[int, date], Counter] = defaultdict(Counter)
+    global_rows: Dict[date, Counter] = defaultdict(Counter)
+
+    post_day = _day_expr(db, Post.created_at)
+    comment_day = _day_expr(db, Comment.created_at)
+    reaction_day = _day_expr(db, Reaction.created_at)
+    user_day = _day_expr(db, User.created_at)
+
+    per_user = (
+        ("posts", "posts", in_range(
+            db.query(Post.user_id, post_day, func.count(Post.id)), Post.created_at
+        ).group_by(Post.user_id, post_day)),
+        ("comments", "comments", in_range(
+            db.query(Comment.user_id, comment_day, func.count(Comment.id)), Comment.created_at
+        ).group_by(Comment.user_id, comment_day)),
+        ("reactions_received", "reactions", in_range(
+            db.query(Post.user_id, reaction_day, func.count(Reaction.id))
+            .join(Post, Post.id == Reaction.post_id), Reaction.created_at
+        ).group_by(Post.user_id, reaction_day)),
+        ("comments_received", None, in_range(
+            db.query(Post.user_id, comment_day, func.count(Comment.id))
+            .join(Post, Post.id == Comment.post_id), Comment.created_at
+        ).group_by(Post.user_id, comment_day)),
+    )
+
+    for user_column, global_column, query in per_user:
+        for user_id, day, count in query:
+            day = day_of(day)
+            user_rows[(user_id, day)][user_column] += count
+            if global_column:
+                global_rows[day][global_column] += count
+
+    post_sentiments = in_range(
+        db.query(Post.user_id, post_day, Sentiment.label, func.count(Sentiment.id))
+        .join(Post, Post.id == Sentiment.post_id), Post.created_at
+    ).group_by(Post.user_id, post_day, Sentiment.label)
+
+    for user_id, day, label, count in post_sentiments:
+        if label in SENTIMENT_LABELS:
+            day = day_of(day)
+            user_rows[(user_id, day)][f"{label}_posts"] += count
+            global_rows[day][label] += count
+
+    comment_sentiments = in_range(
+        db.query(comment_day, Sentiment.label, func.count(Sentiment.id))
+        .join(Comment, Comment.id == Sentiment.comment_id), Comment.created_at
+    ).group_by(comment_day, Sentiment.label)
+
+    for day, label, count in comment_sentiments:
+        if label in SENTIMENT_LABELS:
+            global_rows[day_of(day)][label] += count
+
+    new_users = in_range(
+        db.query(user_day, func.count(User.id)), User.created_at
+    ).group_by(user_day)
+
+    for day, count in new_users:
+        global_rows[day_of(day)]["new_users"] += count
+
+    return user_rows, global_rows
+
+
+def backfill_rollups(
+    db: Session,
+    start: Optional[date] = None,
+    end: Optional[date] = None
+) -> int:
+    """
+    Recount both rollup tables for [start, end] (inclusive; open-ended
+    when omitted) from source rows and correct the stored counters.
+    Returns the number of rows recounted (0 if another worker is at it).
+
+    The recount and the stored counters are read from one snapshot and
+    only their difference is applied, through the same additive upserts
+    as bump(), so counts bumped while the job runs are kept. Rows that
+    match are not written at all.
+    """
+    if not try_advisory_lock(db, "backfill-rollups"):
+        return 0
+
+    with _snapshot(db) as snapshot:
+        user_rows, global_rows = _recount(snapshot, start, end)
+        stored_user = _stored(snapshot, DailyUserMetrics, start, end)
+        stored_global = _stored(snapshot, DailyMetrics, start, end)
+
+    for key in stored_user.keys() - user_rows.keys():
+        user_rows[key] = Counter()
+    for (day,) in stored_global.keys() - {(day,) for day in global_rows}:
+        global_rows[day] = Counter()
+
+    for (user_id, day), counts in user_rows.items():
+        stored = stored_user.get((user_id, day), {})
+        bump(db=db, day=day, user_id=user_id, **{
+            name: counts[name] - stored.get(name, 0) for name in counts.keys() | stored.keys()
+        })
+    for day, counts in global_rows.items():
+        stored = stored_global.get((day,), {})
+        bump(db=db, day=day, **{
+            name: counts[name] - stored.get(name, 0) for name in counts.keys() | stored.keys()
+        })
+
+    db.commit()
+    return sum(1 for counts in user_rows.values() if counts) + sum(
+        1 for counts in global_rows.values() if counts
+    )
+
+
+def refresh_recent_rollups(db: Session) -> int:
+    """Periodic job: re-derive the last ROLLUP_REFRESH_DAYS days"""
+    today = utc_today()
+    return backfill_rollups(db, today - timedelta(days=settings.ROLLUP_REFRESH_DAYS - 1), today)
+
+
+# =========================================================
+# Reads
+# =========================================================
+
+def user_series(db: Session, user_id: int, start: date, end: date) -> Dict[date, DailyUserMetrics]:
+    """The user's rows for [start, end], one primary-key range scan"""
+    return {
+        row.day: row
+        for row in db.query(DailyUserMetrics).filter(
+            DailyUserMetrics.user_id == user_id,
+            DailyUserMetrics.day >= start,
+            DailyUserMetrics.day <= end
+        )
+    }
+
+
+def global_series(db: Session, start: date, end: date) -> Dict[date, DailyMetrics]:
+    """Site-wide rows for [start, end], one primary-key range scan"""
+    return {
+        row.day: row
+        for row in db.query(DailyMetrics).filter(
+            DailyMetrics.day >= start,
+            DailyMetrics.day <= end
+        )
+    }
@@ -0,0 +1,165 @@
+# app/services/sentiment_cache.py
+
+"""
+Sentiment results cached by normalized content.
+
+Texts are normalized (NFC, trimmed, whitespace runs collapsed) and always
+scored in normalized form, so a cached result is exactly what scoring the
+text again would return. Keys also cover the backend version, so switching
+models or lexicons never serves stale scores.
+
+Tiers: an in-process LRU with TTL, then optionally (SENTIMENT_CACHE_PERSISTENT)
+the `sentiment_cache` table so hits survive restarts and are shared between
+workers.
+"""
+
+import hashlib
+import json
+import re
+import unicodedata
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.sentiment import get_backend
+from app.database import dialect_insert
+from app.models import SentimentCacheEntry
+from app.utils.cache import LRUCache
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+result_cache = LRUCache(
+    max_entries=settings.SENTIMENT_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.SENTIMENT_CACHE_TTL_SECONDS
+)
+
+
+def normalize_content(text: Optional[str]) -> str:
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFC", text or "")).strip()
+
+
+def content_key(normalized: str, version: str) -> str:
+    return hashlib.sha256(f"{version}\0{normalized}".encode()).hexdigest()
+
+
+def _ttl_cutoff() -> datetime:
+    return datetime.now(timezone.utc) - timedelta(seconds=settings.SENTIMENT_CACHE_TTL_SECONDS)
+
+
+# =========================================================
+# Lookups
+# =========================================================
+
+def _lookup(db: Optional[Session], keys: List[str]) -> Dict[str, Dict]:
+    found = {}
+    missing = []
+
+    for key in keys:
+        result = result_cache.get(key)
+        if result is None:
+            missing.append(key)
+        else:
+            found[key] = result
+
+    if missing and db is not None and settings.SENTIMENT_CACHE_PERSISTENT:
+        rows = (
+            db.query(SentimentCacheEntry.key, SentimentCacheEntry.result)
+            .filter(
+                SentimentCacheEntry.key.in_(missing),
+                SentimentCacheEntry.created_at >= _ttl_cutoff()
+            )
+            .all()
+        )
+        for key, raw in rows:
+            found[key] = json.loads(raw)
+            result_cache.set(key, found[key])
+
+    return found
+
+
+def _store(db: Optional[Session], results: Dict[str, Dict], version: str) -> None:
+    for key, result in results.items():
+        result_cache.set(key, result)
+
+    if results and db is not None and settings.SENTIMENT_CACHE_PERSISTENT:
+        db.execute(
+            dialect_insert(db, SentimentCacheEntry)
+            .values([
+                {"key": key, "backend_version": version, "result": json.dumps(result)}
+                for key, result in results.items()
+            ])
+            .on_conflict_do_nothing(index_elements=["key"])
+        )
+
+
+def cached_result(db: Optional[Session], text: Optional[str]) -> Optional[Dict]:
+    """Cached analysis of `text`, or None on a miss (never scores)"""
+    key = content_key(normalize_content(text), get_backend().version)
+    return _lookup(db, [key]).get(key)
+
+
+def split_cached(
+    db: Optional[Session],
+    texts: List[Optional[str]]
+) -> Tuple[List[str], Dict[str, Dict], Dict[str, str]]:
+    """
+    Cache keys of `texts`, the cached results by key, and the distinct
+    misses still to score (key -> normalized text).
+    """
+    version = get_backend().version
+
+    normalized = [normalize_content(text) for text in texts]
+    keys = [content_key(text, version) for text in normalized]
+
+    found = _lookup(db, list(dict.fromkeys(keys)))
+
+    misses = {}
+    for key, text in zip(keys, normalized):
+        if key not in found:
+            misses.setdefault(key, text)
+
+    return keys, found, misses
+
+
+def store_results(db: Optional[Session], results: Dict[str, Dict]) -> None:
+    """Cache freshly scored misses (key -> result) from split_cached"""
+    _store(db, results, get_backend().version)
+
+
+def analyze_texts(db: Optional[Session], texts: List[Optional[str]]) -> List[Dict]:
+    """
+    Analyze texts through the cache; only distinct misses reach the backend.
+    With a session and SENTIMENT_CACHE_PERSISTENT, new results are added to
+    the persistent tier (the caller controls the transaction).
+    """
+    keys, found, misses = split_cached(db, texts)
+
+    if misses:
+        scored = dict(zip(misses, get_backend().analyze_batch(list(misses.values()))))
+        store_results(db, scored)
+        found.update(scored)
+
+    return [found[key] for key in keys]
+
+
+# =========================================================
+# Maintenance
+# =========================================================
+
+def prune_sentiment_cache(db: Session) -> int:
+    """Drop persistent entries older than SENTIMENT_CACHE_TTL_SECONDS"""
+    deleted = db.query(SentimentCacheEntry).filter(
+        SentimentCacheEntry.created_at < _ttl_cutoff()
+    ).delete(synchronize_session=False)
+
+    db.commit()
+    return deleted
+
+
+def cache_stats() -> Dict:
+    return {
+        **result_cache.stats(),
+        "persistent": settings.SENTIMENT_CACHE_PERSISTENT
+    }
@@ -0,0 +1,288 @@
+# app/services/sentiment_jobs.py
+
+"""
+Sentiment scoring off the request path.
+
+Writes enqueue a `job_queue` row in the same transaction and return;
+worker threads (see main.py) claim pending jobs in batches with
+SELECT ... FOR UPDATE SKIP LOCKED, score the current content through the
+result cache (app.services.sentiment_cache) and upsert the results into
+`sentiments`.
+Jobs are idempotent: re-scoring a target just overwrites its row.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import dialect_insert
+from app.models import Comment, Job, Post, Sentiment
+from app.services.moderation import record_flags
+from app.services.rollups import record_sentiment_changes
+from app.services.sentiment_cache import analyze_texts, cached_result
+
+logger = logging.getLogger(__name__)
+
+JOB_TYPE = "sentiment"
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _aware(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes even for timezone-aware columns
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+# =========================================================
+# Enqueue
+# =========================================================
+
+def enqueue_sentiment(
+    *,
+    db: Session,
+    post_id: Optional[int] = None,
+    comment_id: Optional[int] = None
+) -> Job:
+    """
+    Queue (re-)scoring of a post or comment.
+    The caller controls the transaction (commit/rollback).
+    """
+    job = Job(
+        job_type=JOB_TYPE,
+        target_type="post" if post_id else "comment",
+        post_id=post_id,
+        comment_id=comment_id
+    )
+    db.add(job)
+    return job
+
+
+def score_or_enqueue(
+    *,
+    db: Session,
+    content: Optional[str],
+    post_id: Optional[int] = None,
+    comment_id: Optional[int] = None
+) -> None:
+    """
+    Store a cached result right away, otherwise queue a scoring job.
+    The caller controls the transaction (commit/rollback).
+    """
+    result = cached_result(db, content)
+    if result is None:
+        enqueue_sentiment(db=db, post_id=post_id, comment_id=comment_id)
+        return
+
+    target_type = "post" if post_id else "comment"
+    upsert_sentiments(db, [
+        {**result, f"{target_type}_id": post_id or comment_id}
+    ], target_type)
+
+
+# =========================================================
+# Upsert
+# =========================================================
+
+def upsert_sentiments(db: Session, rows: List[Dict], target_type: str) -> None:
+    """
+    Insert or overwrite sentiments in one statement.
+    `rows` carry `post_id` or `comment_id` (per `target_type`), `label`
+    and `score`. Label changes are carried into the daily rollups; rows
+    with the analyzer's toxicity fields also update the moderation queue.
+    The caller controls the transaction.
+    """
+    if not rows:
+        return
+
+    target_col = f"{target_type}_id"
+    record_sentiment_changes(
+        db, target_type, {row[target_col]: row["label"] for row in rows}
+    )
+
+    stmt = dialect_insert(db, Sentiment).values([
+        {
+            target_col: row[target_col],
+            "label": row["label"],
+            "score": row["score"],
+            "target_type": target_type
+        }
+        for row in rows
+    ])
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[target_col],
+        set_={"label": stmt.excluded.label, "score": stmt.excluded.score}
+    ))
+
+    record_flags(db, target_type, rows)
+
+
+# =========================================================
+# Workers
+# =========================================================
+
+def claim_jobs(db: Session, limit: int) -> List[Job]:
+    """
+    Mark up to `limit` pending (or timed-out) jobs as processing.
+    Timed-out jobs that already used SENTIMENT_JOB_MAX_ATTEMPTS (e.g. a
+    text that keeps crashing its worker) are failed instead of reclaimed.
+    """
+    now = _utcnow()
+    stale_before = now - timedelta(seconds=settings.SENTIMENT_JOB_TIMEOUT_SECONDS)
+
+    db.query(Job).filter(
+        Job.job_type == JOB_TYPE,
+        Job.status == "processing",
+        Job.started_at < stale_before,
+        Job.attempts >= settings.SENTIMENT_JOB_MAX_ATTEMPTS
+    ).update({
+        Job.status: "failed",
+        Job.last_error: "timed out"
+    }, synchronize_session=False)
+
+    jobs = (
+        db.query(Job)
+        .filter(
+            Job.job_type == JOB_TYPE,
+            or_(
+                Job.status == "pending",
+                and_(Job.status == "processing", Job.started_at < stale_before)
+            )
+        )
+        .order_by(Job.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+
+    for job in jobs:
+        job.status = "processing"
+        job.started_at = now
+        job.attempts += 1
+
+    db.commit()
+    return jobs
+
+
+def _score(db: Session, jobs: List[Job]) -> None:
+    post_ids = {job.post_id for job in jobs if job.post_id}
+    comment_ids = {job.comment_id for job in jobs if job.comment_id}
+
+    # Deleted targets cascade their jobs away; anything missing is skipped
+    posts = dict(
+        db.query(Post.id, Post.content).filter(Post.id.in_(post_ids))
+    ) if post_ids else {}
+    comments = dict(
+        db.query(Comment.id, Comment.content).filter(Comment.id.in_(comment_ids))
+    ) if comment_ids else {}
+
+    for target_type, contents in (("post", posts), ("comment", comments)):
+        ids = list(contents)
+        results = analyze_texts(db, [contents[i] for i in ids])
+        upsert_sentiments(db, [
+            {**result, f"{target_type}_id": target_id}
+            for target_id, result in zip(ids, results)
+        ], target_type)
+
+
+def process_batch(db: Session, limit: Optional[int] = None) -> int:
+    """Claim, score and complete one batch. Returns the number of jobs completed."""
+    jobs = claim_jobs(db, limit or settings.SENTIMENT_BATCH_SIZE)
+    if not jobs:
+        return 0
+
+    try:
+        _score(db, jobs)
+    except Exception as exc:
+        db.rollback()
+        logger.exception("Sentiment batch of %d jobs failed", len(jobs))
+
+        for job in jobs:
+            job.status = (
+                "failed" if job.attempts >= settings.SENTIMENT_JOB_MAX_ATTEMPTS
+                else "pending"
+            )
+            job.last_error = str(exc)[:1000]
+        db.commit()
+        return 0
+
+    now = _utcnow()
+    for job in jobs:
+        job.status = "done"
+        job.finished_at = now
+        job.last_error = None
+
+    db.commit()
+    return len(jobs)
+
+
+def drain_sentiment_jobs(db: Session) -> int:
+    """Process batches until the queue is empty (one worker's run)"""
+    total = 0
+    while True:
+        done = process_batch(db)
+        if not done:
+            return total
+        total += done
+
+
+def prune_finished_jobs(db: Session) -> int:
+    """Delete completed jobs older than SENTIMENT_JOB_RETENTION_HOURS"""
+    cutoff = _utcnow() - timedelta(hours=settings.SENTIMENT_JOB_RETENTION_HOURS)
+
+    deleted = db.query(Job).filter(
+        Job.status == "done",
+        Job.finished_at < cutoff
+    ).delete(synchronize_session=False)
+
+    db.commit()
+    return deleted
+
+
+# =========================================================
+# Metrics
+# =========================================================
+
+def queue_metrics(db: Session) -> Dict:
+    """Queue depth per status, age of the oldest pending job and recent throughput"""
+    now = _utcnow()
+
+    depth = dict(
+        db.query(Job.status, func.count(Job.id))
+        .filter(Job.job_type == JOB_TYPE)
+        .group_by(Job.status)
+        .all()
+    )
+
+    oldest_pending = (
+        db.query(func.min(Job.created_at))
+        .filter(Job.job_type == JOB_TYPE, Job.status == "pending")
+        .scalar()
+    )
+
+    completed_last_minute = (
+        db.query(func.count(Job.id))
+        .filter(
+            Job.job_type == JOB_TYPE,
+            Job.status == "done",
+            Job.finished_at >= now - timedelta(minutes=1)
+        )
+        .scalar()
+    )
+
+    return {
+        "pending": depth.get("pending", 0),
+        "processing": depth.get("processing", 0),
+        "failed": depth.get("failed", 0),
+        "done": depth.get("done", 0),
+        "lag_seconds": (
+            max((now - _aware(oldest_pending)).total_seconds(), 0.0)
+            if oldest_pending else 0.0
+        ),
+        "completed_last_minute": completed_last_minute
+    }
@@ -0,0 +1,108 @@
+# app/services/system_stats.py
+
+"""
+System-wide totals for the admin dashboard.
+
+Totals are recounted in one statement and stored in `stats_snapshot` on
+read, once the snapshot is older than SYSTEM_STATS_MAX_AGE_SECONDS, so
+most reads are a handful of primary-key lookups and nothing is counted
+unless the dashboard is open. Today's post/comment counts come straight
+from the daily rollups. Pass exact=True to force a recount.
+
+Totals are deliberately not bumped on every write: a single counter row
+shared by all writers would serialize them.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import dialect_insert
+from app.models import Comment, DailyUserMetrics, ModerationFlag, Post, StatsSnapshot, User
+from app.services.rollups import global_series, utc_today
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _aware(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes even for timezone-aware columns
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _stat_queries() -> Dict:
+    today = utc_today()
+    return {
+        "total_users": select(func.count(User.id)),
+        "total_posts": select(func.count(Post.id)),
+        "total_comments": select(func.count(Comment.id)),
+        "flagged_content_count": (
+            select(func.count(ModerationFlag.id)).where(ModerationFlag.status == "open")
+        ),
+        "suspended_users_count": (
+            select(func.count(User.id)).where(User.is_active.is_(False))
+        ),
+        "active_users_today": (
+            select(func.count(DailyUserMetrics.user_id)).where(
+                DailyUserMetrics.day == today,
+                (DailyUserMetrics.posts > 0) | (DailyUserMetrics.comments > 0)
+            )
+        ),
+    }
+
+
+def refresh_system_stats(db: Session) -> Dict:
+    """Recount every total (one round trip) and store the snapshot"""
+    queries = _stat_queries()
+    values = db.execute(select(*[
+        query.scalar_subquery().label(name) for name, query in queries.items()
+    ])).one()
+
+    now = _utcnow()
+    rows = [
+        {"name": name, "value": value or 0, "refreshed_at": now}
+        for name, value in zip(queries, values)
+    ]
+
+    stmt = dialect_insert(db, StatsSnapshot).values(rows)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=["name"],
+        set_={"value": stmt.excluded.value, "refreshed_at": stmt.excluded.refreshed_at}
+    ))
+    db.commit()
+
+    return {**{row["name"]: row["value"] for row in rows}, "as_of": now}
+
+
+def system_stats(db: Session, exact: bool = False) -> Dict:
+    """
+    Snapshot totals no older than SYSTEM_STATS_MAX_AGE_SECONDS (recounted
+    here if they are, or when `exact`), plus today's activity.
+    """
+    snapshot = None
+
+    if not exact:
+        rows = db.query(StatsSnapshot).all()
+        names = set(_stat_queries())
+        if rows and names <= {row.name for row in rows}:
+            as_of = min(_aware(row.refreshed_at) for row in rows if row.name in names)
+            max_age = timedelta(seconds=settings.SYSTEM_STATS_MAX_AGE_SECONDS)
+            if _utcnow() - as_of <= max_age:
+                snapshot = {row.name: row.value for row in rows if row.name in names}
+                snapshot["as_of"] = as_of
+
+    if snapshot is None:
+        snapshot = refresh_system_stats(db)
+
+    today = utc_today()
+    today_row = global_series(db, today, today).get(today)
+
+    return {
+        **snapshot,
+        "posts_today": today_row.posts if today_row else 0,
+        "comments_today": today_row.comments if today_row else 0
+    }
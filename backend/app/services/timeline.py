@@ -0,0 +1,305 @@
+# app/services/timeline.py
+
+"""
+Materialized home timelines (fan-out on write).
+
+New posts are pushed into every follower's `user_feed_posts` by a
+background task, so reading a timeline is a single index range scan.
+Authors with more than FEED_FANOUT_MAX_FOLLOWERS followers are not
+fanned out; their posts are merged in at read time instead. A user's
+timeline is created and backfilled on first read; until then fan-out
+skips them.
+"""
+
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, literal, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal, dialect_insert
+from app.models import Follow, Post, Profile, UserFeed, UserFeedPost
+from app.utils.pagination import decode_cursor, encode_cursor
+
+FANOUT_BATCH_SIZE = 1000
+
+
+# =========================================================
+# Helpers
+# =========================================================
+
+def _feed_ids(db: Session, user_ids: Iterable[int]) -> dict:
+    """
+    Map user_id -> feed id for users whose timeline exists. Only
+    _build_feed creates feeds, so an existing feed always holds the
+    backfilled history; users without one are built on first read.
+    """
+    user_ids = list(user_ids)
+    if not user_ids:
+        return {}
+
+    return dict(
+        db.query(UserFeed.user_id, UserFeed.id)
+        .filter(UserFeed.user_id.in_(user_ids))
+        .all()
+    )
+
+
+def _push(db: Session, feed_ids: Iterable[int], posts: List) -> None:
+    """Add posts (Post instances or rows with id, user_id, created_at) to the feeds"""
+    rows = [
+        {
+            "feed_id": feed_id,
+            "post_id": post.id,
+            "author_id": post.user_id,
+            "created_at": post.created_at
+        }
+        for feed_id in feed_ids
+        for post in posts
+    ]
+
+    if rows:
+        db.execute(
+            dialect_insert(db, UserFeedPost)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["feed_id", "post_id"])
+        )
+
+
+def is_high_follower(db: Session, user_id: int) -> bool:
+    count = (
+        db.query(Profile.followers_count)
+        .filter(Profile.user_id == user_id)
+        .scalar()
+    )
+    return (count or 0) > settings.FEED_FANOUT_MAX_FOLLOWERS
+
+
+def adjust_follow_counts(*, db: Session, follower_id: int, following_id: int, delta: int) -> None:
+    """
+    Keep the profile follower/following counters in step with `follows`;
+    they decide which authors are fanned out.
+    The caller controls the transaction (commit/rollback).
+    """
+    db.query(Profile).filter(Profile.user_id == following_id).update(
+        {Profile.followers_count: func.coalesce(Profile.followers_count, 0) + delta},
+        synchronize_session=False
+    )
+    db.query(Profile).filter(Profile.user_id == follower_id).update(
+        {Profile.following_count: func.coalesce(Profile.following_count, 0) + delta},
+        synchronize_session=False
+    )
+
+
+# =========================================================
+# Write Path (background tasks, own session)
+# =========================================================
+
+def fan_out_post(post_id: int) -> None:
+    """Push a new post into its author's and followers' timelines"""
+    db = SessionLocal()
+    try:
+        post = db.query(Post).filter(Post.id == post_id).first()
+        if post is None:
+            return
+
+        _push(db, _feed_ids(db, [post.user_id]).values(), [post])
+        db.commit()
+
+        if is_high_follower(db, post.user_id):
+            return
+
+        last_id = 0
+        while True:
+            follower_ids = [
+                follower_id for (follower_id,) in (
+                    db.query(Follow.follower_id)
+                    .filter(
+                        Follow.following_id == post.user_id,
+                        Follow.follower_id > last_id
+                    )
+                    .order_by(Follow.follower_id)
+                    .limit(FANOUT_BATCH_SIZE)
+                )
+            ]
+            if not follower_ids:
+                break
+
+            _push(db, _feed_ids(db, follower_ids).values(), [post])
+            db.commit()
+            last_id = follower_ids[-1]
+    finally:
+        db.close()
+
+
+def backfill_follow(follower_id: int, following_id: int) -> None:
+    """Copy the newly followed author's recent posts into the follower's timeline"""
+    db = SessionLocal()
+    try:
+        if not _feed_ids(db, [follower_id]):
+            _build_feed(db, follower_id)
+            return
+
+        if is_high_follower(db, following_id):
+            return
+
+        posts = (
+            db.query(Post)
+            .filter(Post.user_id == following_id)
+            .order_by(Post.created_at.desc(), Post.id.desc())
+            .limit(settings.FEED_BACKFILL_POSTS)
+            .all()
+        )
+
+        _push(db, _feed_ids(db, [follower_id]).values(), posts)
+        db.commit()
+    finally:
+        db.close()
+
+
+def remove_author(*, db: Session, user_id: int, author_id: int) -> None:
+    """
+    Drop an unfollowed author's posts from the user's timeline.
+    The caller controls the transaction (commit/rollback).
+    """
+    feed_id = db.query(UserFeed.id).filter(UserFeed.user_id == user_id).scalar()
+    if feed_id is None:
+        return
+
+    db.query(UserFeedPost).filter(
+        UserFeedPost.feed_id == feed_id,
+        UserFeedPost.author_id == author_id
+    ).delete(synchronize_session=False)
+
+
+def _build_feed(db: Session, user_id: int) -> int:
+    """
+    First read of a user without a materialized timeline: backfill it
+    with the latest FEED_BACKFILL_POSTS of the user and of every followed
+    author below the fan-out limit, in one windowed query.
+    """
+    db.execute(
+        dialect_insert(db, UserFeed)
+        .values(user_id=user_id)
+        .on_conflict_do_nothing(index_elements=["user_id"])
+    )
+    # Committed before the history is read, so fan-out of any post the
+    # backfill query can't see yet finds the feed
+    db.commit()
+    feed_id = _feed_ids(db, [user_id])[user_id]
+
+    following_ids = [
+        following_id for (following_id,) in
+        db.query(Follow.following_id).filter(Follow.follower_id == user_id)
+    ]
+    merged_authors = {
+        author_id for (author_id,) in (
+            db.query(Profile.user_id).filter(
+                Profile.user_id.in_(following_ids),
+                Profile.followers_count > settings.FEED_FANOUT_MAX_FOLLOWERS
+            )
+        )
+    } if following_ids else set()
+    author_ids = [user_id] + [
+        following_id for following_id in following_ids
+        if following_id not in merged_authors
+    ]
+
+    ranked = (
+        select(
+            Post.id,
+            Post.user_id,
+            Post.created_at,
+            func.row_number().over(
+                partition_by=Post.user_id,
+                order_by=(Post.created_at.desc(), Post.id.desc())
+            ).label("position")
+        )
+        .where(Post.user_id.in_(author_ids))
+        .subquery()
+    )
+    posts = db.execute(
+        select(ranked.c.id, ranked.c.user_id, ranked.c.created_at)
+        .where(ranked.c.position <= settings.FEED_BACKFILL_POSTS)
+    ).all()
+
+    for start in range(0, len(posts), FANOUT_BATCH_SIZE):
+        _push(db, [feed_id], posts[start:start + FANOUT_BATCH_SIZE])
+
+    db.commit()
+    return feed_id
+
+
+# =========================================================
+# Read Path
+# =========================================================
+
+def read_timeline(
+    db: Session,
+    user_id: int,
+    cursor: Optional[str],
+    limit: int
+) -> Tuple[List[Post], Optional[str]]:
+    """
+    One newest-first page of the user's home timeline: the materialized
+    entries merged with recent posts of followed high-follower authors.
+    Returns the posts and the cursor for the next page (None at the end).
+    """
+    feed_id = db.query(UserFeed.id).filter(UserFeed.user_id == user_id).scalar()
+    if feed_id is None:
+        feed_id = _build_feed(db, user_id)
+
+    position = decode_cursor(cursor) if cursor else None
+
+    entries = db.query(UserFeedPost.created_at, UserFeedPost.post_id).filter(
+        UserFeedPost.feed_id == feed_id
+    )
+    if position:
+        entries = entries.filter(
+            tuple_(UserFeedPost.created_at, UserFeedPost.post_id) < tuple_(
+                literal(position[0], UserFeedPost.created_at.type),
+                literal(position[1], UserFeedPost.post_id.type)
+            )
+        )
+    candidates = entries.order_by(
+        UserFeedPost.created_at.desc(), UserFeedPost.post_id.desc()
+    ).limit(limit + 1).all()
+
+    merged_authors = [
+        following_id for (following_id,) in (
+            db.query(Follow.following_id)
+            .join(Profile, Profile.user_id == Follow.following_id)
+            .filter(
+                Follow.follower_id == user_id,
+                Profile.followers_count > settings.FEED_FANOUT_MAX_FOLLOWERS
+            )
+        )
+    ]
+
+    if merged_authors:
+        merged = db.query(Post.created_at, Post.id).filter(
+            Post.user_id.in_(merged_authors)
+        )
+        if position:
+            merged = merged.filter(
+                tuple_(Post.created_at, Post.id) < tuple_(
+                    literal(position[0], Post.created_at.type),
+                    literal(position[1], Post.id.type)
+                )
+            )
+        candidates += merged.order_by(
+            Post.created_at.desc(), Post.id.desc()
+        ).limit(limit + 1).all()
+
+    # An author may have crossed the threshold after being fanned out
+    keys = sorted({(created_at, post_id) for created_at, post_id in candidates}, reverse=True)
+
+    next_cursor = None
+    if len(keys) > limit:
+        keys = keys[:limit]
+        next_cursor = encode_cursor(*keys[-1])
+
+    page_ids = [post_id for _, post_id in keys]
+    posts = {p.id: p for p in db.query(Post).filter(Post.id.in_(page_ids))}
+
+    return [posts[post_id] for post_id in page_ids if post_id in posts], next_cursor
@@ -0,0 +1,151 @@
+# app/services/trending.py
+
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import case, extract, func, literal, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import try_advisory_lock
+from app.models import Post, TrendingPost
+
+REACTION_WEIGHT = 1.0
+COMMENT_WEIGHT = 2.0
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _aware(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes even for timezone-aware columns
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def decayed_score(score: float, scored_at: datetime, now: Optional[datetime] = None) -> float:
+    """Exponentially decay `score` from `scored_at` to `now`"""
+    now = now or _utcnow()
+    half_life = settings.TRENDING_HALF_LIFE_HOURS * 3600
+    elapsed = max((now - _aware(scored_at)).total_seconds(), 0.0)
+    return score * 0.5 ** (elapsed / half_life)
+
+
+# =========================================================
+# Incremental Updates
+# =========================================================
+
+def record_engagement(*, db: Session, post_id: int, weight: float) -> None:
+    """
+    Fold an engagement event into the post's decayed score.
+    The caller controls the transaction (commit/rollback).
+    """
+    if not weight:
+        return
+
+    now = _utcnow()
+
+    entry = (
+        db.query(TrendingPost)
+        .filter(TrendingPost.post_id == post_id)
+        .with_for_update()
+        .first()
+    )
+
+    if entry is None:
+        if weight < 0:
+            return
+        try:
+            with db.begin_nested():
+                db.add(TrendingPost(post_id=post_id, score=weight, scored_at=now))
+            return
+        except IntegrityError:
+            # Created concurrently; fall through and update it
+            entry = (
+                db.query(TrendingPost)
+                .filter(TrendingPost.post_id == post_id)
+                .with_for_update()
+                .one()
+            )
+
+    entry.score = max(decayed_score(entry.score, entry.scored_at, now) + weight, 0.0)
+    entry.scored_at = now
+
+
+# =========================================================
+# Materialization
+# =========================================================
+
+def _elapsed_seconds(db: Session, now: datetime):
+    """SQL expression: seconds from each entry's scored_at to `now` (never negative)"""
+    now = literal(now, TrendingPost.scored_at.type)
+
+    if db.get_bind().dialect.name == "postgresql":
+        elapsed = extract("epoch", now - TrendingPost.scored_at)
+    else:
+        elapsed = (func.julianday(now) - func.julianday(TrendingPost.scored_at)) * 86400.0
+
+    return case((elapsed > 0, elapsed), else_=0.0)
+
+
+def refresh_trending(db: Session) -> int:
+    """
+    Decay every score to now, drop entries that fell below
+    TRENDING_MIN_SCORE and re-rank the public ones.
+    Returns the number of ranked posts (0 if another worker is
+    refreshing).
+
+    Scores are decayed by a single UPDATE, so engagement recorded while
+    the job runs is folded in rather than overwritten.
+    """
+    if not try_advisory_lock(db, "refresh-trending"):
+        return 0
+
+    now = _utcnow()
+    half_life = settings.TRENDING_HALF_LIFE_HOURS * 3600
+
+    db.query(TrendingPost).update(
+        {
+            TrendingPost.score: TrendingPost.score * func.power(0.5, _elapsed_seconds(db, now) / half_life),
+            TrendingPost.scored_at: now
+        },
+        synchronize_session=False
+    )
+
+    db.query(TrendingPost).filter(
+        TrendingPost.score < settings.TRENDING_MIN_SCORE
+    ).delete(synchronize_session=False)
+
+    ranking = (
+        select(
+            TrendingPost.id,
+            func.row_number().over(
+                order_by=(TrendingPost.score.desc(), TrendingPost.id)
+            ).label("rank")
+        )
+        .join(Post, Post.id == TrendingPost.post_id)
+        .where(Post.visibility == "public")
+        .subquery()
+    )
+
+    ranked = db.execute(
+        update(TrendingPost)
+        .where(TrendingPost.id == ranking.c.id)
+        .values(rank=ranking.c.rank, date=now.date())
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+    # Posts that stopped being public keep their score but leave the ranking
+    db.execute(
+        update(TrendingPost)
+        .where(
+            TrendingPost.rank.isnot(None),
+            TrendingPost.post_id.in_(select(Post.id).where(Post.visibility != "public"))
+        )
+        .values(rank=None)
+        .execution_options(synchronize_session=False)
+    )
+
+    db.commit()
+    return ranked
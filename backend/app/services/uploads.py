@@ -0,0 +1,114 @@
+# app/services/uploads.py
+
+"""
+Resumable upload sessions.
+
+Chunks must arrive in order (each PUT claims the session's current
+offset before writing) and are written straight into the session's part
+file, so completing an upload renames that file instead of reassembling
+it. The
+running SHA-256 is kept per session in this worker; when a session's
+chunks were spread over several workers (or a restart) the file is
+hashed once on completion instead.
+"""
+
+import hashlib
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import UploadSession
+from app.utils.cache import LRUCache
+from app.utils.file_handler import file_handler
+
+# session id -> (bytes hashed, hashlib object)
+_digests = LRUCache(max_entries=10000, ttl_seconds=settings.UPLOAD_SESSION_TTL_SECONDS)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def session_path(session_id: str) -> Path:
+    return file_handler.session_dir() / f"{session_id}.part"
+
+
+def claimed_path(session_id: str) -> Path:
+    """Where the part file is moved while an upload is being completed"""
+    return file_handler.session_dir() / f"{session_id}.claimed"
+
+
+# =========================================================
+# Running digests
+# =========================================================
+
+def running_digest(session_id: str, offset: int):
+    """A copy of the session's SHA-256 at `offset`, or None if this worker lacks it"""
+    if offset == 0:
+        return hashlib.sha256()
+
+    entry = _digests.get(session_id)
+    if entry is not None and entry[0] == offset:
+        return entry[1].copy()
+    return None
+
+
+def record_digest(session_id: str, offset: int, digest) -> None:
+    if digest is not None:
+        _digests.set(session_id, (offset, digest))
+
+
+def final_digest(session_id: str, total_size: int) -> Optional[str]:
+    entry = _digests.get(session_id)
+    if entry is not None and entry[0] == total_size:
+        return entry[1].hexdigest()
+    return None
+
+
+def forget_digest(session_id: str) -> None:
+    _digests.pop(session_id)
+
+
+# =========================================================
+# Sweeper
+# =========================================================
+
+def sweep_upload_sessions(db: Session) -> int:
+    """
+    Drop sessions idle for UPLOAD_SESSION_TTL_SECONDS together with their
+    part files, and any partial file (sessions or single-request temp
+    files) not written to for as long. Returns the number of sessions.
+    """
+    cutoff = _utcnow() - timedelta(seconds=settings.UPLOAD_SESSION_TTL_SECONDS)
+
+    stale = [
+        session_id for (session_id,) in
+        db.query(UploadSession.id).filter(UploadSession.updated_at < cutoff)
+    ]
+    if stale:
+        db.query(UploadSession).filter(
+            UploadSession.id.in_(stale),
+            UploadSession.updated_at < cutoff
+        ).delete(synchronize_session=False)
+        db.commit()
+
+    for session_id in stale:
+        forget_digest(session_id)
+
+    # mtime catches files whose session row is already gone
+    oldest = time.time() - settings.UPLOAD_SESSION_TTL_SECONDS
+    for directory in (file_handler.session_dir(), file_handler.temp_dir()):
+        if not directory.exists():
+            continue
+        for path in directory.iterdir():
+            try:
+                if path.stat().st_mtime < oldest:
+                    path.unlink()
+            except FileNotFoundError:
+                pass
+
+    return len(stale)
@@ -1,24 +1,427 @@
 # app/utils/file_handler.py
 
+"""
+File Upload Handler for Media (Images & Videos)
+
+Uploads are streamed to disk in CHUNK_SIZE pieces (never held in memory
+whole) and renamed into place once complete. Image transcoding runs on
+the image process pool (app.core.image_pool), never on the event loop.
+
+Stored files are content-addressed: UPLOAD_DIR/media/<ab>/<sha256>.<ext>,
+keyed by the SHA-256 of the uploaded bytes, so a file uploaded again is
+recognized before any processing and shared (see app.services.media_store
+for reference counting). Partial files live in UPLOAD_DIR/.tmp
+(single-request uploads) and UPLOAD_DIR/.sessions (resumable uploads), on
+the same filesystem so the final rename is atomic.
+"""
+
+import hashlib
+import logging
+import os
+import uuid
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from uuid import uuid4
-from fastapi import UploadFile
+from typing import AsyncIterator, BinaryIO, NamedTuple, Tuple, Optional
+from fastapi import UploadFile, HTTPException, status
+from PIL import UnidentifiedImageError
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import ClientDisconnect
+
+from app.config import settings
+from app.core.image_pool import ImageProcessingTimeout, ImageProcessorBusy, image_processor
+from app.utils.images import transcode_image
+
+logger = logging.getLogger(__name__)
+
+
+class StoredFile(NamedTuple):
+    """A saved upload"""
+    url: str
+    path: str
+    sha256: str  # of the uploaded bytes
+    size: int  # uploaded bytes
+    deduplicated: bool = False  # already stored; nothing was written
 
 
 class FileHandler:
-    def __init__(self, upload_dir: str = "uploads"):
-        self.upload_dir = Path(upload_dir)
-        self.upload_dir.mkdir(parents=True, exist_ok=True)
+    """Handle file uploads with validation and optimization"""
+
+    ALLOWED_IMAGE_TYPES = {'image/jpeg', 'image/jpg', 'image/png', 'image/gif', 'image/webp'}
+    # Stored videos are named by their validated type, never the client's filename
+    VIDEO_EXTENSIONS = {
+        'video/mp4': 'mp4',
+        'video/mpeg': 'mpeg',
+        'video/quicktime': 'mov',
+        'video/x-msvideo': 'avi'
+    }
+    ALLOWED_VIDEO_TYPES = set(VIDEO_EXTENSIONS)
+
+    MAX_IMAGE_SIZE = 10 * 1024 * 1024  # 10MB
+    MAX_VIDEO_SIZE = 100 * 1024 * 1024  # 100MB
+
+    CHUNK_SIZE = 1024 * 1024  # 1MB read/write unit while streaming uploads
+
+    # Image optimization settings
+    MAX_IMAGE_WIDTH = 2048
+    MAX_IMAGE_HEIGHT = 2048
+    IMAGE_QUALITY = 85
+
+    @staticmethod
+    def validate_content_type(content_type: Optional[str], file_type: str) -> Tuple[bool, str]:
+        """
+        Validate a declared content type
+
+        Args:
+            content_type: MIME type sent by the client
+            file_type: 'image' or 'video'
+
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
+
+        # Check file type
+        if file_type == 'image':
+            if content_type not in FileHandler.ALLOWED_IMAGE_TYPES:
+                return False, f"Invalid image type. Allowed: {', '.join(FileHandler.ALLOWED_IMAGE_TYPES)}"
+        elif file_type == 'video':
+            if content_type not in FileHandler.ALLOWED_VIDEO_TYPES:
+                return False, f"Invalid video type. Allowed: {', '.join(FileHandler.ALLOWED_VIDEO_TYPES)}"
+        else:
+            return False, "Invalid file type specified"
+
+        return True, ""
+
+    @staticmethod
+    def validate_file(file: UploadFile, file_type: str) -> Tuple[bool, str]:
+        """
+        Validate uploaded file
+
+        Args:
+            file: Uploaded file
+            file_type: 'image' or 'video'
+
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
+        return FileHandler.validate_content_type(file.content_type, file_type)
+
+    @staticmethod
+    def max_size(file_type: str) -> int:
+        return FileHandler.MAX_IMAGE_SIZE if file_type == 'image' else FileHandler.MAX_VIDEO_SIZE
+
+    @staticmethod
+    def _too_large(file_type: str) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{file_type.capitalize()} size exceeds maximum of "
+                   f"{FileHandler.max_size(file_type) / 1024 / 1024}MB"
+        )
+
+    @staticmethod
+    def temp_dir() -> Path:
+        return Path(settings.UPLOAD_DIR) / '.tmp'
+
+    @staticmethod
+    def session_dir() -> Path:
+        return Path(settings.UPLOAD_DIR) / '.sessions'
+
+    @staticmethod
+    def _temp_path() -> Path:
+        temp_dir = FileHandler.temp_dir()
+        temp_dir.mkdir(parents=True, exist_ok=True)
+        return temp_dir / f"{uuid.uuid4()}.part"
+
+    @staticmethod
+    def _stream_to_disk(source: BinaryIO, target: Path, file_type: str) -> Tuple[int, str]:
+        """
+        Copy `source` into `target` CHUNK_SIZE bytes at a time, hashing as it goes.
+        Aborts with 400 as soon as more than the type's maximum has arrived.
+
+        Returns:
+            Tuple of (size, sha256 hex digest)
+        """
+        max_size = FileHandler.max_size(file_type)
+        digest = hashlib.sha256()
+        size = 0
+
+        try:
+            with open(target, 'wb') as output:
+                while chunk := source.read(FileHandler.CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > max_size:
+                        raise FileHandler._too_large(file_type)
+                    digest.update(chunk)
+                    output.write(chunk)
+        except BaseException:
+            FileHandler.delete_file(str(target))
+            raise
+
+        return size, digest.hexdigest()
+
+    @staticmethod
+    async def _receive(file: UploadFile, file_type: str) -> Tuple[Path, int, str]:
+        """Stream an upload into a temp file: (temp_path, size, sha256)"""
+
+        # Reject up front when the client declared the size
+        if file.size is not None and file.size > FileHandler.max_size(file_type):
+            raise FileHandler._too_large(file_type)
+
+        temp_path = FileHandler._temp_path()
+
+        await file.seek(0)
+        size, sha256 = await run_in_threadpool(
+            FileHandler._stream_to_disk, file.file, temp_path, file_type
+        )
+        return temp_path, size, sha256
+
+    @staticmethod
+    def _write_at(target: Path, offset: int, data: bytes) -> None:
+        with open(target, 'r+b') as output:
+            output.seek(offset)
+            output.write(data)
+
+    @staticmethod
+    async def append_chunk(
+        stream: AsyncIterator[bytes],
+        target: Path,
+        offset: int,
+        limit: int,
+        digest=None
+    ) -> int:
+        """
+        Write a request body into `target` starting at `offset`, in
+        CHUNK_SIZE blocks. More than `limit` bytes is rejected with 400
+        before the block that crosses it is written. `digest` (a hashlib
+        object) is updated with everything written.
+
+        A client that disconnects mid-body keeps what arrived so far.
+
+        Returns:
+            Number of bytes written
+        """
+        written = 0
+        buffer = bytearray()
+
+        async def flush() -> None:
+            nonlocal written
+            if written + len(buffer) > limit:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Chunk runs past the declared upload size"
+                )
+            await run_in_threadpool(FileHandler._write_at, target, offset + written, bytes(buffer))
+            if digest is not None:
+                digest.update(buffer)
+            written += len(buffer)
+            buffer.clear()
+
+        try:
+            async for piece in stream:
+                buffer += piece
+                if len(buffer) >= FileHandler.CHUNK_SIZE:
+                    await flush()
+        except ClientDisconnect:
+            pass
+
+        if buffer:
+            await flush()
+        return written
+
+    @staticmethod
+    def _hash_file(path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as source:
+            while chunk := source.read(FileHandler.CHUNK_SIZE):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def content_location(sha256: str, ext: str) -> Tuple[str, Path]:
+        """URL and disk path of the stored file for these uploaded bytes"""
+        relative = f"media/{sha256[:2]}/{sha256}.{ext}"
+        return f"/uploads/{relative}", Path(settings.UPLOAD_DIR) / relative
+
+    @staticmethod
+    async def store_file(
+        source: Path,
+        file_type: str,
+        content_type: Optional[str],
+        size: int,
+        sha256: Optional[str] = None
+    ) -> StoredFile:
+        """
+        Move a fully received upload into the content-addressed store
+        (images are transcoded to JPEG first). Bytes that are already
+        stored short-circuit: nothing is transcoded or written. A video's
+        `source` is renamed into place under the extension of its
+        validated `content_type`; otherwise it is left for the caller to
+        remove. Without `sha256` the source is hashed from disk.
+
+        Returns:
+            StoredFile
+        """
+        if sha256 is None:
+            sha256 = await run_in_threadpool(FileHandler._hash_file, source)
+
+        if file_type == 'video':
+            file_ext = FileHandler.VIDEO_EXTENSIONS.get(content_type, 'mp4')
+        else:
+            file_ext = 'jpg'  # always re-encoded as JPEG
+
+        file_url, file_path = FileHandler.content_location(sha256, file_ext)
+
+        try:
+            # Refresh mtime so garbage collection leaves it alone
+            os.utime(file_path)
+            return StoredFile(file_url, str(file_path), sha256, size, deduplicated=True)
+        except FileNotFoundError:
+            pass
+
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Concurrent uploads of the same bytes produce the same file, so
+        # whichever rename lands last is equally correct
+        if file_type == 'video':
+            os.replace(source, file_path)
+        else:
+            await FileHandler.transcode(source, file_path)
+
+        return StoredFile(file_url, str(file_path), sha256, size)
+
+    @staticmethod
+    async def transcode(
+        source: Path,
+        file_path: Path,
+        max_width: int = MAX_IMAGE_WIDTH,
+        max_height: int = MAX_IMAGE_HEIGHT,
+        image_format: str = 'JPEG'
+    ) -> None:
+        """
+        Transcode `source` on the image pool into a temp file renamed to
+        `file_path`. Pool and decoding failures are raised as HTTPException.
+        """
+        output = FileHandler._temp_path()
+
+        try:
+            await image_processor.run(
+                transcode_image,
+                str(source),
+                str(output),
+                max_width,
+                max_height,
+                FileHandler.IMAGE_QUALITY,
+                image_format
+            )
+            os.replace(output, file_path)
+        except (ImageProcessorBusy, BrokenProcessPool):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many images are being processed, please retry",
+                headers={"Retry-After": "2"}
+            )
+        except ImageProcessingTimeout:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Image took too long to process"
+            )
+        except UnidentifiedImageError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="File is not a valid image"
+            )
+        except Exception:
+            # Details stay in the log; they can name paths and internals
+            logger.exception("Image transcode failed for %s", source)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="File is not a valid image"
+            )
+        finally:
+            FileHandler.delete_file(str(output))
+
+    @staticmethod
+    async def save_image(file: UploadFile) -> StoredFile:
+        """
+        Save and optimize image file
+
+        The upload is streamed to a temp file; a worker process transcodes
+        it from disk into a second temp file that is renamed into place.
+
+        Args:
+            file: Uploaded image file
+
+        Returns:
+            StoredFile (sha256 and size are of the uploaded bytes)
+        """
+
+        # Validate file
+        is_valid, error_msg = FileHandler.validate_file(file, 'image')
+        if not is_valid:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=error_msg
+            )
+
+        source, size, sha256 = await FileHandler._receive(file, 'image')
+
+        try:
+            return await FileHandler.store_file(source, 'image', file.content_type, size, sha256)
+        finally:
+            FileHandler.delete_file(str(source))
+
+    @staticmethod
+    async def save_video(file: UploadFile) -> StoredFile:
+        """
+        Save video file
+
+        Streamed to a temp file and renamed into place once complete.
+
+        Args:
+            file: Uploaded video file
+
+        Returns:
+            StoredFile
+        """
+
+        # Validate file
+        is_valid, error_msg = FileHandler.validate_file(file, 'video')
+        if not is_valid:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=error_msg
+            )
+
+        source, size, sha256 = await FileHandler._receive(file, 'video')
+
+        try:
+            return await FileHandler.store_file(source, 'video', file.content_type, size, sha256)
+        finally:
+            FileHandler.delete_file(str(source))
+
+    @staticmethod
+    def path_for_url(file_url: str) -> str:
+        """Disk path of a file served under /uploads"""
+        return str(Path(settings.UPLOAD_DIR) / file_url.removeprefix('/uploads/'))
 
-    def save_file(self, file: UploadFile) -> str:
-        extension = Path(file.filename).suffix
-        filename = f"{uuid4().hex}{extension}"
-        file_path = self.upload_dir / filename
+    @staticmethod
+    def delete_file(file_path: str) -> bool:
+        """
+        Delete a file from disk
 
-        with open(file_path, "wb") as buffer:
-            buffer.write(file.file.read())
+        Args:
+            file_path: Path to file
 
-        return str(file_path)
+        Returns:
+            True if deleted, False otherwise
+        """
+        try:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+                return True
+            return False
+        except Exception:
+            return False
 
 
+# Singleton instance
 file_handler = FileHandler()
@@ -0,0 +1,43 @@
+# app/utils/images.py
+
+"""
+Pillow transcoding. Runs inside image pool worker processes, so this
+module must stay importable without the rest of the app.
+"""
+
+from typing import BinaryIO, Union
+
+from PIL import Image
+
+
+def transcode_image(
+    source: Union[str, BinaryIO],
+    destination: Union[str, BinaryIO],
+    max_width: int,
+    max_height: int,
+    quality: int,
+    image_format: str = 'JPEG'
+) -> None:
+    """
+    Flatten transparency, fit within max_width x max_height and write
+    `source` to `destination` as JPEG (or WEBP). Both are paths (or file
+    objects), so image bytes never travel between processes.
+    """
+    image = Image.open(source)
+
+    # Convert RGBA to RGB if necessary
+    if image.mode in ('RGBA', 'LA', 'P'):
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        if image.mode == 'P':
+            image = image.convert('RGBA')
+        background.paste(image, mask=image.split()[-1] if image.mode == 'RGBA' else None)
+        image = background
+
+    # Resize if too large
+    if image.width > max_width or image.height > max_height:
+        image.thumbnail((max_width, max_height), Image.Resampling.LANCZOS)
+
+    if image_format == 'WEBP':
+        image.save(destination, format='WEBP', quality=quality, method=4)
+    else:
+        image.save(destination, format='JPEG', quality=quality, optimize=True)
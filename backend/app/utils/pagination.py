@@ -0,0 +1,117 @@
+# app/utils/pagination.py
+
+"""
+Keyset (cursor) pagination over `(created_at, id)`.
+
+Pages are read newest-first with `WHERE (created_at, id) < (:created_at, :id)`,
+which walks a composite index instead of skipping OFFSET rows, so every
+page costs the same as the first one. Cursors are opaque to clients and
+signed, so an edited cursor is rejected with 400 like a malformed one.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, literal, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query
+
+from app.config import settings
+
+
+def _cursor_signature(payload: str) -> str:
+    digest = hmac.new(
+        settings.SECRET_KEY.encode(), f"cursor:{payload}".encode(), hashlib.sha256
+    ).digest()
+    return base64.urlsafe_b64encode(digest[:12]).decode()
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), row_id]).encode()
+    payload = base64.urlsafe_b64encode(raw).decode().rstrip("=")
+    return f"{payload}.{_cursor_signature(payload)}"
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        payload, _, signature = cursor.partition(".")
+        if not hmac.compare_digest(signature, _cursor_signature(payload)):
+            raise ValueError("bad signature")
+
+        padded = payload + "=" * (-len(payload) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def _keyset_window(query, created_col, id_col, cursor: Optional[str], limit: int):
+    """Seek past the cursor and fetch one row more than the page"""
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(
+            tuple_(created_col, id_col) < tuple_(
+                literal(created_at, created_col.type),
+                literal(row_id, id_col.type)
+            )
+        )
+
+    return query.order_by(created_col.desc(), id_col.desc()).limit(limit + 1)
+
+
+def _keyset_result(
+    rows: List[Any],
+    limit: int,
+    key: Optional[Callable[[Any], Tuple[datetime, int]]]
+) -> Tuple[List[Any], Optional[str]]:
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        created_at, row_id = key(rows[-1]) if key else (rows[-1].created_at, rows[-1].id)
+        next_cursor = encode_cursor(created_at, row_id)
+
+    return rows, next_cursor
+
+
+def keyset_page(
+    query: Query,
+    created_col,
+    id_col,
+    cursor: Optional[str],
+    limit: int,
+    key: Optional[Callable[[Any], Tuple[datetime, int]]] = None
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Fetch one newest-first page of `query`.
+
+    `key` maps a result row to its `(created_at, id)`; by default the
+    row's own `created_at`/`id` attributes are used.
+    Returns the rows and the cursor for the next page (None at the end).
+    """
+    rows = _keyset_window(query, created_col, id_col, cursor, limit).all()
+    return _keyset_result(rows, limit, key)
+
+
+async def keyset_page_async(
+    db: AsyncSession,
+    stmt: Select,
+    created_col,
+    id_col,
+    cursor: Optional[str],
+    limit: int,
+    key: Optional[Callable[[Any], Tuple[datetime, int]]] = None
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    keyset_page() for a single-entity `select()` on an async session;
+    returns the entities rather than rows.
+    """
+    result = await db.scalars(_keyset_window(stmt, created_col, id_col, cursor, limit))
+    return _keyset_result(result.all(), limit, key)
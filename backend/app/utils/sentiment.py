@@ -5,13 +5,28 @@ Advanced Sentiment Analysis Utility
 """
 
 from __future__ import annotations
+import hashlib
+import os
 import re
-from typing import Dict, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
 from collections import Counter
 print("=== SENTIMENT MODULE STARTED ===")
 
 print("sentiment.py loaded")
 
+# Lexicon token flags
+_NEGATION = 1
+_INTENSIFIER = 2
+_TOXIC = 4
+_PHRASE = 8
+_UNKNOWN = (0.0, 0)
+
+# Batches at least this large are spread over a process pool
+PARALLEL_BATCH_THRESHOLD = 5000
+PARALLEL_CHUNK_SIZE = 1000
+
+
 class SentimentAnalyzer:
     """Advanced sentiment analyzer with toxicity detection"""
 
@@ -41,12 +56,11 @@ class SentimentAnalyzer:
             'extremist', 'radical', 'murder', 'rape', 'torture'
         }
 
-        self.very_toxic_patterns = [
-            r'\b(kill\s+yourself|kys)\b',
-            r'\b(commit\s+suicide)\b',
-            r'\b(hate\s+speech)\b',
-            r'\b(death\s+threat)\b'
-        ]
+        # Whole-word phrases; words may be separated by any whitespace
+        self.very_toxic_phrases = {
+            'kill yourself', 'kys', 'commit suicide',
+            'hate speech', 'death threat'
+        }
 
         self.negation_words = {
             'not', 'no', 'never', 'neither', 'nobody', 'nothing',
@@ -69,38 +83,119 @@ class SentimentAnalyzer:
             '👎': -0.7, '🤮': -0.9, '😑': -0.5, '😐': 0.0, '😶': 0.0
         }
 
+        self.compile_lexicons()
+
+    def compile_lexicons(self) -> None:
+        """
+        Build the single-pass matcher from the lexicons.
+        Call again after modifying any of the word/emoji sets.
+        """
+        # word -> (sentiment value, flags); positive wins over negative
+        lexicon = {}
+        for word in self.negation_words:
+            lexicon[word] = (0.0, _NEGATION)
+        for word in self.intensifiers:
+            value, flags = lexicon.get(word, (0.0, 0))
+            lexicon[word] = (value, flags | _INTENSIFIER)
+        for word in self.toxic_words:
+            value, flags = lexicon.get(word, (0.0, 0))
+            lexicon[word] = (value, flags | _TOXIC)
+        for words, word_value in ((self.negative_words, -0.15), (self.positive_words, 0.15)):
+            for word in words:
+                lexicon[word] = (word_value, lexicon.get(word, (0.0, 0))[1])
+
+        self._phrases = {tuple(phrase.split()) for phrase in self.very_toxic_phrases}
+        self._max_phrase = max(map(len, self._phrases), default=1)
+        for phrase in self._phrases:
+            for word in phrase:
+                value, flags = lexicon.get(word, (0.0, 0))
+                lexicon[word] = (value, flags | _PHRASE)
+
+        self._lexicon = lexicon
+
+        # Emojis are matched by their first character plus an optional
+        # tail (e.g. VS16) and then looked up, so the pattern does not
+        # grow into a long alternation as the emoji table grows
+        heads = "".join(sorted({re.escape(e[0]) for e in self.emoji_sentiment}))
+        tails = sorted({e[1:] for e in self.emoji_sentiment if len(e) > 1}, key=len, reverse=True)
+        emoji_pattern = f"[{heads}]"
+        if tails:
+            emoji_pattern += "(?:" + "|".join(map(re.escape, tails)) + ")?"
+        self._matcher = re.compile(rf"(?P<emoji>{emoji_pattern})|\w+")
+        self._emoji_order = {e: i for i, e in enumerate(self.emoji_sentiment)}
+
+        # Changes whenever any lexicon does, so stored results can be
+        # told apart from ones the current lexicons would produce
+        self.lexicon_version = hashlib.sha256(repr((
+            sorted(lexicon.items()),
+            sorted(self._phrases),
+            sorted(self.emoji_sentiment.items())
+        )).encode()).hexdigest()[:12]
+
     def analyze(self, text: str) -> Dict:
         if not text or not text.strip():
             return self._neutral_result()
 
         text_lower = text.lower()
-        words = self._tokenize(text_lower)
+        lexicon = self._lexicon
+        emoji_values = self.emoji_sentiment
 
         sentiment_score = 0.0
         word_count = 0
-
-        for i, word in enumerate(words):
-            if len(word) < 2:
+        toxic_count = 0
+        very_toxic = False
+        emojis = None
+
+        previous_flags = 0
+        run = ()        # trailing phrase words separated only by whitespace
+        run_end = 0
+
+        # One pass over the text: words and emojis alike
+        for match in self._matcher.finditer(text_lower):
+            token = match.group()
+
+            if match.lastgroup == "emoji":
+                if token not in emoji_values:
+                    token = token[0]
+                    if token not in emoji_values:
+                        continue
+                if emojis is None:
+                    emojis = Counter()
+                emojis[token] += 1
                 continue
 
-            word_count += 1
-            is_negated = i > 0 and words[i-1] in self.negation_words
-            is_intensified = i > 0 and words[i-1] in self.intensifiers
-            intensity_multiplier = 1.5 if is_intensified else 1.0
-
-            word_sentiment = 0.0
-            if word in self.positive_words:
-                word_sentiment = 0.15 * intensity_multiplier
-            elif word in self.negative_words:
-                word_sentiment = -0.15 * intensity_multiplier
-
-            if is_negated:
-                word_sentiment *= -1
-
-            sentiment_score += word_sentiment
-
-        emoji_score = self._analyze_emojis(text)
-        sentiment_score += emoji_score
+            value, flags = lexicon.get(token, _UNKNOWN)
+
+            if len(token) >= 2:
+                word_count += 1
+                if value:
+                    if previous_flags & _INTENSIFIER:
+                        value = value * 1.5
+                    if previous_flags & _NEGATION:
+                        value *= -1
+                    sentiment_score += value
+
+            if flags & _TOXIC:
+                toxic_count += 1
+
+            if flags & _PHRASE and not very_toxic:
+                if run and text_lower[run_end:match.start()].isspace():
+                    run = run[1 - self._max_phrase:] + (token,) if self._max_phrase > 1 else (token,)
+                else:
+                    run = (token,)
+                run_end = match.end()
+                very_toxic = any(run[-n:] in self._phrases for n in range(1, len(run) + 1))
+            else:
+                run = ()
+
+            previous_flags = flags
+
+        if emojis:
+            # Summed in table order so floats match per-emoji accumulation
+            emoji_score = 0.0
+            for emoji in sorted(emojis, key=self._emoji_order.__getitem__):
+                emoji_score += emoji_values[emoji] * emojis[emoji] * 0.2
+            sentiment_score += emoji_score
 
         exclamation_count = text.count('!')
         if exclamation_count > 0:
@@ -118,7 +213,7 @@ class SentimentAnalyzer:
             label = 'neutral'
 
         confidence = min(abs(sentiment_score) * 1.2, 1.0)
-        toxicity_level, toxicity_score = self._detect_toxicity(text_lower, words)
+        toxicity_level, toxicity_score = self._toxicity(text_lower, very_toxic, toxic_count)
 
         return {
             'label': label,
@@ -129,26 +224,37 @@ class SentimentAnalyzer:
             'raw_score': sentiment_score
         }
 
-    def _tokenize(self, text: str) -> list:
-        # Safe tokenizer (Windows & Python 3.12 compatible)
-        text = re.sub(r"[^\w\s]", " ", text)
-        return text.split()
-
-    def _analyze_emojis(self, text: str) -> float:
-        score = 0.0
-        for emoji, value in self.emoji_sentiment.items():
-            count = text.count(emoji)
-            score += value * count * 0.2
-        return score
+    def analyze_batch(
+        self,
+        texts: Iterable[str],
+        processes: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Analyze many texts; results are identical to analyze() per text.
+        Batches of PARALLEL_BATCH_THRESHOLD or more texts are split over
+        a process pool (`processes` workers, default: CPU count).
+        """
+        texts = list(texts)
+        processes = processes or os.cpu_count() or 1
+
+        if processes < 2 or len(texts) < PARALLEL_BATCH_THRESHOLD:
+            return [self.analyze(text) for text in texts]
+
+        chunks = [
+            texts[i:i + PARALLEL_CHUNK_SIZE]
+            for i in range(0, len(texts), PARALLEL_CHUNK_SIZE)
+        ]
+        results = []
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            for chunk_results in pool.map(_analyze_chunk, chunks):
+                results.extend(chunk_results)
+        return results
 
-    def _detect_toxicity(self, text_lower: str, words: list) -> Tuple[str, float]:
+    def _toxicity(self, text_lower: str, very_toxic: bool, toxic_count: int) -> Tuple[str, float]:
         toxicity_score = 0.0
 
-        for pattern in self.very_toxic_patterns:
-            if re.search(pattern, text_lower):
-                return 'high', 1.0
-
-        toxic_count = sum(1 for word in words if word in self.toxic_words)
+        if very_toxic:
+            return 'high', 1.0
 
         if toxic_count > 0:
             toxicity_score = min(toxic_count * 0.25, 1.0)
@@ -160,10 +266,14 @@ class SentimentAnalyzer:
             elif toxicity_score >= 0.25:
                 return 'low', toxicity_score
 
-        caps_ratio = sum(1 for c in text_lower if c.isupper()) / max(len(text_lower), 1)
-        if caps_ratio > 0.6 and len(text_lower) > 10:
-            toxicity_score = max(toxicity_score, 0.3)
-            return 'low', toxicity_score
+        # The text is already lowercased, so uppercase characters are rare
+        # (only those without a lowercase form); islower() rules them out
+        # in one C-level call before counting
+        if len(text_lower) > 10 and not text_lower.islower():
+            caps_ratio = sum(1 for c in text_lower if c.isupper()) / len(text_lower)
+            if caps_ratio > 0.6:
+                toxicity_score = max(toxicity_score, 0.3)
+                return 'low', toxicity_score
 
         return 'none', toxicity_score
 
@@ -188,10 +298,19 @@ class SentimentAnalyzer:
 sentiment_analyzer = SentimentAnalyzer()
 
 
+def _analyze_chunk(texts: List[str]) -> List[Dict]:
+    # Process pool worker; runs on the worker's own module-level analyzer
+    return sentiment_analyzer.analyze_batch(texts, processes=1)
+
+
 def analyze_sentiment(text: str) -> Dict:
     return sentiment_analyzer.analyze(text)
 
 
+def analyze_sentiment_batch(texts: Iterable[str], processes: Optional[int] = None) -> List[Dict]:
+    return sentiment_analyzer.analyze_batch(texts, processes)
+
+
 def extract_hashtags(text: str) -> list:
     hashtags = re.findall(r'#(\w+)', text)
     return [tag.lower() for tag in hashtags]
@@ -0,0 +1,35 @@
+# backfill_rollups.py
+
+"""
+Rebuild the daily rollup tables from source rows.
+
+    python backfill_rollups.py                      # full history
+    python backfill_rollups.py --start 2026-01-01   # from a day on
+    python backfill_rollups.py --start 2026-01-01 --end 2026-01-31
+
+Existing rollup rows in the range are replaced, so it is safe to re-run.
+"""
+
+import argparse
+from datetime import date
+
+from app.database import SessionLocal
+from app.services.rollups import backfill_rollups
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--start", type=date.fromisoformat, help="first day (YYYY-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat, help="last day (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        written = backfill_rollups(db, args.start, args.end)
+        print(f"✅ Wrote {written} rollup rows")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Sync vs async database stack under concurrent load.
+
+Serves the public feed two ways from one in-process app: the previous
+sync handler (`def`, get_db, run on Starlette's threadpool) and the
+async endpoint (get_async_db), then drives each with a fixed number of
+concurrent clients over httpx's ASGI transport and reports throughput
+and latency percentiles.
+
+    cd backend && DATABASE_URL=sqlite:///./bench.db python -m benchmarks.bench_async_db
+
+Point DATABASE_URL at PostgreSQL (asyncpg on the async side) for numbers
+that reflect production; SQLite serializes on a single file.
+"""
+
+import asyncio
+import os
+import time
+from typing import Optional
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+os.environ.setdefault("DEBUG", "false")
+
+import httpx
+from fastapi import Depends, FastAPI, Query
+from sqlalchemy.orm import Session
+
+from app.api.v1 import posts as posts_api
+from app.database import Base, SessionLocal, async_engine, engine, get_db
+from app.models import Post, User
+from app.schemas.posts import FeedResponse
+from app.utils.pagination import keyset_page
+
+POSTS = 2000
+REQUESTS = 2000
+# (stack, concurrent clients). Past the pool size (30) the sync stack can
+# deadlock: threadpool workers wait for connections that are only
+# returned by get_db cleanup, which needs a free worker itself.
+CASES = [("sync", 25), ("async", 25), ("async", 100)]
+
+app = FastAPI()
+
+
+@app.get("/sync/feed", response_model=FeedResponse)
+def sync_feed(
+    cursor: Optional[str] = None,
+    page_size: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    posts, next_cursor = keyset_page(
+        db.query(Post).filter(Post.visibility == "public"),
+        Post.created_at, Post.id, cursor, page_size
+    )
+    return FeedResponse(
+        posts=posts_api.build_post_responses(posts, db),
+        page_size=page_size,
+        has_more=next_cursor is not None,
+        next_cursor=next_cursor
+    )
+
+
+app.add_api_route("/async/feed", posts_api.get_feed, response_model=FeedResponse)
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def load(path: str, concurrency: int):
+    latencies = []
+    queue = asyncio.Queue()
+    for _ in range(REQUESTS):
+        queue.put_nowait(path)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker():
+            while not queue.empty():
+                url = queue.get_nowait()
+                started = time.perf_counter()
+                response = await client.get(url)
+                response.raise_for_status()
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    await async_engine.dispose()
+    return latencies, elapsed
+
+
+def seed() -> None:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    db.add(User(id=1, username="bench", email="bench@example.com", password_hash="x"))
+    db.add_all([Post(id=i, user_id=1, content=f"post {i}") for i in range(1, POSTS + 1)])
+    db.commit()
+    db.close()
+
+
+def main() -> None:
+    seed()
+
+    print(f"{REQUESTS} feed requests per run, {engine.dialect.name}")
+    print(f"{'stack':<8} {'clients':>8} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    for name, concurrency in CASES:
+        latencies, elapsed = asyncio.run(load(f"/{name}/feed", concurrency))
+        print(
+            f"{name:<8} {concurrency:>8} {REQUESTS / elapsed:>8.0f} "
+            f"{percentile(latencies, 0.5):>8.1f} {percentile(latencies, 0.99):>8.1f}"
+        )
+
+    Base.metadata.drop_all(bind=engine)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Event-loop lag during a burst of image uploads.
+
+Posts a burst of concurrent large JPEG uploads to an in-process app
+(over httpx's ASGI transport) whose endpoint runs the real upload path,
+file_handler.save_image, while a ticker coroutine measures how late
+each of its 5 ms sleeps wakes up. Compares transcoding inline on the
+event loop (the old behavior) with the image process pool.
+
+    cd backend && python -m benchmarks.bench_image_burst
+"""
+
+import asyncio
+import io
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("UPLOAD_DIR", tempfile.mkdtemp(prefix="bench-uploads-"))
+os.environ.setdefault("DEBUG", "false")
+
+import httpx
+from fastapi import FastAPI, File, UploadFile
+from PIL import Image
+
+from app.core.image_pool import image_processor
+from app.utils.file_handler import file_handler
+
+UPLOADS = 24
+TICK = 0.005
+
+app = FastAPI()
+
+
+@app.post("/upload")
+async def upload(file: UploadFile = File(...)):
+    stored = await file_handler.save_image(file)
+    return {"file_url": stored.url}
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def sample_photo() -> bytes:
+    # Noise keeps the JPEG close to a real photo in size and decode cost
+    output = io.BytesIO()
+    Image.frombytes("RGB", (4000, 3000), os.urandom(4000 * 3000 * 3)).save(output, "JPEG", quality=60)
+    return output.getvalue()
+
+
+async def run_inline(func, *args):
+    return func(*args)
+
+
+async def burst(photo: bytes, inline: bool):
+    pooled_run = image_processor.run
+    if inline:
+        image_processor.run = run_inline
+
+    lags = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(TICK)
+            lags.append((time.perf_counter() - started - TICK) * 1000)
+
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=300) as client:
+            async def post():
+                response = await client.post(
+                    "/upload", files={"file": ("photo.jpg", photo, "image/jpeg")}
+                )
+                return response.status_code
+
+            # Warm the pool up so process start-up is not measured
+            await image_processor.run(time.sleep, 0)
+
+            clock = asyncio.create_task(ticker())
+            started = time.perf_counter()
+            statuses = await asyncio.gather(*(post() for _ in range(UPLOADS)))
+            elapsed = time.perf_counter() - started
+            done.set()
+            await clock
+    finally:
+        image_processor.run = pooled_run
+
+    return lags, statuses, elapsed
+
+
+def main() -> None:
+    photo = sample_photo()
+    image_processor.max_queue = UPLOADS
+
+    print(f"{UPLOADS} concurrent 4000x3000 JPEG uploads ({len(photo) // 1024} KiB), {os.cpu_count()} CPUs")
+    print(f"{'mode':<22} {'ticks':>6} {'p50 lag':>8} {'p99 lag':>8} {'max lag':>8} {'burst s':>8}  statuses")
+    for name, inline in (("on the event loop", True), (f"image pool ({image_processor.workers})", False)):
+        lags, statuses, elapsed = asyncio.run(burst(photo, inline))
+        codes = {code: statuses.count(code) for code in sorted(set(statuses))}
+        print(
+            f"{name:<22} {len(lags):>6} {statistics.median(lags):>8.1f} "
+            f"{percentile(lags, 0.99):>8.1f} {max(lags):>8.1f} {elapsed:>8.2f}  {codes}"
+        )
+
+    image_processor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Latency of unrelated endpoints during a login burst.
+
+Fires a burst of concurrent logins at the app (in-process, over
+httpx's ASGI transport) while probing /health, and reports /health
+latency percentiles with bcrypt on the shared request threadpool
+(PASSWORD_HASH_WORKERS=0, the old behavior) and on the bounded pool.
+
+    cd backend && DATABASE_URL=sqlite:///./bench.db python -m benchmarks.bench_login_burst
+"""
+
+import asyncio
+import os
+import statistics
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+os.environ.setdefault("BCRYPT_ROUNDS", "10")
+os.environ.setdefault("DEBUG", "false")
+
+import httpx
+
+from app.core.security import hash_password, password_hasher
+from app.database import Base, SessionLocal, engine
+from app.main import app
+from app.models import User
+
+LOGINS = 120
+PROBE_INTERVAL = 0.005
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def burst(client: httpx.AsyncClient):
+    probes = []
+    done = asyncio.Event()
+
+    async def probe():
+        while not done.is_set():
+            started = time.perf_counter()
+            await client.get("/health")
+            probes.append((time.perf_counter() - started) * 1000)
+            await asyncio.sleep(PROBE_INTERVAL)
+
+    async def login():
+        response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": "bench@example.com", "password": "benchpassword"}
+        )
+        return response.status_code
+
+    prober = asyncio.create_task(probe())
+    started = time.perf_counter()
+    statuses = await asyncio.gather(*(login() for _ in range(LOGINS)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await prober
+
+    return probes, statuses, elapsed
+
+
+async def run(workers: int):
+    password_hasher.shutdown()
+    password_hasher.workers = workers
+    password_hasher.max_queue = LOGINS
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        return await burst(client)
+
+
+def main() -> None:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    db.add(User(
+        id=1,
+        username="bench",
+        email="bench@example.com",
+        password_hash=hash_password("benchpassword")
+    ))
+    db.commit()
+    db.close()
+
+    print(f"{LOGINS} concurrent logins, bcrypt rounds {os.environ['BCRYPT_ROUNDS']}")
+    print(f"{'mode':<22} {'probes':>7} {'p50 ms':>8} {'p99 ms':>8} {'burst s':>8}  statuses")
+    for name, workers in (("shared threadpool", 0), ("hash pool (4)", 4)):
+        probes, statuses, elapsed = asyncio.run(run(workers))
+        codes = {code: statuses.count(code) for code in sorted(set(statuses))}
+        print(
+            f"{name:<22} {len(probes):>7} {statistics.median(probes):>8.1f} "
+            f"{percentile(probes, 0.99):>8.1f} {elapsed:>8.2f}  {codes}"
+        )
+
+    password_hasher.shutdown()
+    Base.metadata.drop_all(bind=engine)
+
+
+if __name__ == "__main__":
+    main()
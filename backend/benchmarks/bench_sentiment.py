@@ -0,0 +1,44 @@
+"""
+Micro-benchmark for SentimentAnalyzer.analyze.
+
+Times short and long posts, then grows the lexicons to show per-text
+cost stays flat as they get bigger.
+
+    cd backend && python -m benchmarks.bench_sentiment
+"""
+
+import timeit
+
+from app.utils.sentiment import SentimentAnalyzer
+
+SHORT = "Really loved the concert tonight!! 😍🎉 not bad at all"
+LONG = (
+    "The launch went great, although support was terrible and slow. "
+    "I am not happy with the pricing 😡 but the team is awesome ✨. "
+) * 40
+
+
+def per_call_us(analyzer: SentimentAnalyzer, text: str, number: int) -> float:
+    seconds = min(timeit.repeat(lambda: analyzer.analyze(text), number=number, repeat=5))
+    return seconds / number * 1e6
+
+
+def main() -> None:
+    analyzer = SentimentAnalyzer()
+    print(f"{'lexicon words':>14} {'short (us)':>12} {'long (us)':>12}")
+
+    for extra in (0, 1_000, 10_000, 100_000):
+        analyzer.positive_words |= {f"pos{i}" for i in range(extra)}
+        analyzer.negative_words |= {f"neg{i}" for i in range(extra)}
+        analyzer.compile_lexicons()
+
+        size = len(analyzer.positive_words) + len(analyzer.negative_words)
+        print(
+            f"{size:>14} "
+            f"{per_call_us(analyzer, SHORT, 20_000):>12.2f} "
+            f"{per_call_us(analyzer, LONG, 500):>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Throughput and latency of the sentiment backends.
+
+Throughput: one analyze_batch call over a corpus of posts.
+Latency:    concurrent single-text analyze() calls (the transformer
+            backend micro-batches these), reported as p50/p95.
+
+    cd backend && python -m benchmarks.bench_sentiment_backends [--model DIR_OR_NAME]
+
+The transformer backend needs `pip install transformers torch`; it is
+skipped otherwise.
+"""
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.sentiment import LexiconBackend, TransformerBackend
+
+POSTS = [
+    "Really loved the concert tonight!! 😍🎉",
+    "Worst customer service ever, still waiting for a refund 😡",
+    "New blog post is up, link in bio",
+    "Not bad at all, the update fixed most of my issues",
+    "I can't believe how beautiful the sunset was today ✨",
+    "The launch went great, although support was terrible and slow. " * 12,
+]
+
+
+def throughput(backend, corpus) -> float:
+    start = time.perf_counter()
+    backend.analyze_batch(corpus)
+    return len(corpus) / (time.perf_counter() - start)
+
+
+def latency(backend, corpus, concurrency: int):
+    def timed(text):
+        start = time.perf_counter()
+        backend.analyze(text)
+        return (time.perf_counter() - start) * 1000
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = sorted(pool.map(timed, corpus))
+
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    return statistics.median(samples), p95
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--texts", type=int, default=600)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--model", help="model name or local directory")
+    args = parser.parse_args()
+
+    corpus = (POSTS * (args.texts // len(POSTS) + 1))[:args.texts]
+
+    backends = [("lexicon", LexiconBackend)]
+    backends.append(("transformer", lambda: TransformerBackend(model=args.model)))
+
+    print(f"{'backend':<12} {'texts/s':>10} {'p50 ms':>9} {'p95 ms':>9}")
+    for name, factory in backends:
+        try:
+            backend = factory()
+        except RuntimeError as exc:
+            print(f"{name:<12} skipped: {exc}")
+            continue
+
+        backend.analyze_batch(corpus[:8])  # warm up
+        rate = throughput(backend, corpus)
+        p50, p95 = latency(backend, corpus, args.concurrency)
+        print(f"{name:<12} {rate:>10.0f} {p50:>9.2f} {p95:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
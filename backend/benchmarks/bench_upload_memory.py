@@ -0,0 +1,67 @@
+"""
+Peak memory of saving one large upload.
+
+Saves an 80MB video upload (spooled to disk, as Starlette hands it
+over) the old way, reading the whole body before writing it out, and
+with FileHandler.save_video's chunked streaming, and reports the peak
+Python allocation (tracemalloc) and wall time of each.
+
+    cd backend && python -m benchmarks.bench_upload_memory
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+os.environ.setdefault("UPLOAD_DIR", tempfile.mkdtemp(prefix="bench-uploads-"))
+os.environ.setdefault("DEBUG", "false")
+
+from starlette.datastructures import Headers, UploadFile
+
+from app.config import settings
+from app.utils.file_handler import file_handler
+
+SIZE = 80 * 1024 * 1024
+
+
+async def save_whole(file: UploadFile) -> None:
+    # The previous save_video: read everything, check, write
+    contents = await file.read()
+    if len(contents) > file_handler.MAX_VIDEO_SIZE:
+        raise ValueError("too large")
+    Path(settings.UPLOAD_DIR, "posts", "whole.mp4").write_bytes(contents)
+
+
+def measure(save, body: str):
+    with open(body, "rb") as source:
+        file = UploadFile(source, filename="clip.mp4", headers=Headers({"content-type": "video/mp4"}))
+        tracemalloc.start()
+        started = time.perf_counter()
+        asyncio.run(save(file))
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return peak, elapsed
+
+
+def main() -> None:
+    Path(settings.UPLOAD_DIR, "posts").mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(delete=False) as body:
+        for _ in range(SIZE // (1024 * 1024)):
+            body.write(os.urandom(1024 * 1024))
+
+    print(f"{SIZE // (1024 * 1024)}MB upload, chunk {file_handler.CHUNK_SIZE // 1024}KB")
+    print(f"{'mode':<12} {'peak MB':>8} {'seconds':>8}")
+    try:
+        for name, save in (("read whole", save_whole), ("streamed", lambda f: file_handler.save_video(f))):
+            peak, elapsed = measure(save, body.name)
+            print(f"{name:<12} {peak / 1024 / 1024:>8.1f} {elapsed:>8.2f}")
+    finally:
+        os.remove(body.name)
+
+
+if __name__ == "__main__":
+    main()
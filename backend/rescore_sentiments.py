@@ -0,0 +1,63 @@
+# rescore_sentiments.py
+
+"""
+Re-score every post and comment with the current sentiment backend.
+
+    python rescore_sentiments.py --dry-run        # report label drift only
+    python rescore_sentiments.py                  # rewrite sentiments
+    python rescore_sentiments.py --chunk-size 5000 --processes 8
+
+Progress is checkpointed after each chunk; re-running after an
+interruption resumes where it stopped. The checkpoint is removed once a
+run completes.
+"""
+
+import argparse
+import os
+
+from app.database import SessionLocal
+from app.services.rescore import TARGETS, rescore_corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dry-run", action="store_true", help="count label drift without writing")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="rows per chunk (default 1000)")
+    parser.add_argument("--processes", type=int, default=None, help="scoring processes (default: CPU count)")
+    parser.add_argument("--targets", nargs="+", choices=sorted(TARGETS), default=["post", "comment"])
+    parser.add_argument("--checkpoint", default="rescore_checkpoint.json", help="checkpoint file")
+    args = parser.parse_args()
+
+    if os.path.exists(args.checkpoint) and not args.dry_run:
+        print(f"↻ Resuming from {args.checkpoint}")
+
+    def progress(target_type, last_id, scored):
+        print(f"  {target_type}s: {scored} scored (last id {last_id})")
+
+    db = SessionLocal()
+    try:
+        report = rescore_corpus(
+            db,
+            target_types=args.targets,
+            chunk_size=args.chunk_size,
+            processes=args.processes,
+            dry_run=args.dry_run,
+            checkpoint=args.checkpoint,
+            progress=progress
+        )
+    finally:
+        db.close()
+
+    if not args.dry_run and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+
+    print("✅ Dry run complete" if args.dry_run else "✅ Re-scoring complete")
+    for target_type, scored in report["scored"].items():
+        print(f"  {target_type}s scored: {scored}")
+    print("  Label drift:" if report["drift"] else "  No label drift")
+    for change, count in sorted(report["drift"].items(), key=lambda item: -item[1]):
+        print(f"    {change}: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+import os
+
+# The app builds its engine from settings at import time, so point it at a
+# local SQLite file before any test module imports `app`.
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("DEBUG", "False")
+
+from sqlalchemy import BigInteger
+from sqlalchemy.ext.compiler import compiles
+
+
+@compiles(BigInteger, "sqlite")
+def compile_big_integer_sqlite(type_, compiler, **kw):
+    """SQLite only auto-increments INTEGER PRIMARY KEY columns"""
+    return "INTEGER"
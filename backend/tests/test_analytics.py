@@ -0,0 +1,101 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models import User, Profile, Post, Comment, Reaction, Sentiment
+from app.services.analytics import user_dashboard
+from app.services.engagement import reconcile_engagement_counters
+
+engine = create_engine(
+    "sqlite://",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+def seed(db, count):
+    author = User(username="author", email="author@example.com", password_hash="x")
+    fan = User(username="fan", email="fan@example.com", password_hash="x")
+    db.add_all([author, fan])
+    db.flush()
+    db.add(Profile(user_id=author.id, followers_count=3, following_count=1))
+
+    for i in range(count):
+        post = Post(user_id=author.id, content=f"post {i} " + "x" * (120 if i == 0 else 0))
+        db.add(post)
+        db.flush()
+
+        for _ in range(i % 4):
+            db.add(Comment(user_id=fan.id, post_id=post.id, content="nice"))
+        if i % 3 == 0:
+            db.add(Reaction(user_id=fan.id, post_id=post.id, reaction_type="like"))
+        db.add(Sentiment(
+            post_id=post.id,
+            label=("positive", "negative", "neutral")[i % 3],
+            score=0.5,
+            target_type="post"
+        ))
+
+    db.add(Comment(user_id=author.id, post_id=post.id, content="thanks"))
+    db.commit()
+    reconcile_engagement_counters(db)
+    return author
+
+
+def dashboard_queries(db, user_id):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        dashboard = user_dashboard(db, user_id)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    return dashboard, len(statements)
+
+
+def test_dashboard_totals(db):
+    author = seed(db, 6)
+    dashboard, _ = dashboard_queries(db, author.id)
+
+    overview = dashboard["overview"]
+    assert overview["total_posts"] == 6
+    assert overview["total_comments"] == 1
+    assert overview["total_likes_received"] == 2
+    assert overview["total_comments_received"] == 0 + 1 + 2 + 3 + 0 + 1 + 1
+    assert overview["followers"] == 3
+
+    assert dashboard["sentiment_analysis"]["distribution"] == {
+        "positive": 2, "negative": 2, "neutral": 2
+    }
+    assert dashboard["sentiment_analysis"]["positive_percentage"] == 33.3
+
+    top = dashboard["top_posts"]
+    # post 3: like + 3 comments = 7; post 5: 2 comments (incl. author's) = 4
+    assert [p["engagement_score"] for p in top] == [7, 4, 4, 2, 1]
+    assert top[0]["content"] == "post 3 "
+
+
+def test_dashboard_query_count_is_bounded(db):
+    """Query count does not grow with the number of posts"""
+    author = seed(db, 200)
+    _, queries = dashboard_queries(db, author.id)
+
+    assert queries <= 3
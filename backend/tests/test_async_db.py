@@ -0,0 +1,98 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core.identity import identity_cache, load_identity_async
+from app import database
+from app.database import AsyncDatabaseUnavailable, Base, async_database_url
+from app.models import Post, User
+from app.utils.pagination import keyset_page_async
+
+START = datetime(2026, 1, 1, 12, 0, 0, 500000)
+
+
+def run(scenario):
+    async def with_session():
+        engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+                return await scenario(db, engine)
+        finally:
+            await engine.dispose()
+
+    identity_cache.clear()
+    try:
+        return asyncio.run(with_session())
+    finally:
+        identity_cache.clear()
+
+
+def test_async_database_url():
+    assert async_database_url("postgresql://u:p%40ss@db:5432/app") == "postgresql+asyncpg://u:p%40ss@db:5432/app"
+    assert async_database_url("sqlite:///./test.db") == "sqlite+aiosqlite:///./test.db"
+
+    with pytest.raises(AsyncDatabaseUnavailable):
+        async_database_url("mssql+pyodbc://u:p@db:1433/app?driver=ODBC+Driver+17+for+SQL+Server")
+
+
+def test_async_engine_built_on_first_use(monkeypatch):
+    """A database without an async driver only fails where one is needed"""
+    monkeypatch.setattr(database, "_async_engines", None)
+    monkeypatch.setattr(database.settings, "ASYNC_DATABASE_URL", None)
+    monkeypatch.setattr(database.settings, "DATABASE_URL", "mssql+pyodbc://u:p@db:1433/app")
+
+    with pytest.raises(AsyncDatabaseUnavailable, match="ASYNC_DATABASE_URL"):
+        database.get_async_engine()
+
+    monkeypatch.setattr(database.settings, "ASYNC_DATABASE_URL", "sqlite+aiosqlite://")
+    assert database.get_async_engine() is database.get_async_engine()
+    asyncio.run(database.dispose_async_engines())
+
+
+def test_keyset_page_async_walks_all_pages():
+    async def scenario(db, engine):
+        db.add(User(id=1, username="author", email="author@example.com", password_hash="x"))
+        db.add_all([
+            Post(id=i, user_id=1, content=f"post {i}", created_at=START + timedelta(minutes=i % 3))
+            for i in range(1, 8)
+        ])
+        await db.commit()
+
+        seen, cursor = [], None
+        while True:
+            posts, cursor = await keyset_page_async(
+                db, select(Post), Post.created_at, Post.id, cursor, 3
+            )
+            seen += [post.id for post in posts]
+            if cursor is None:
+                return seen
+
+    # Newest first, ties broken by id
+    assert run(scenario) == [5, 2, 7, 4, 1, 6, 3]
+
+
+def test_load_identity_async_is_cached():
+    async def scenario(db, engine):
+        db.add(User(id=1, username="alice", email="alice@example.com", password_hash="x"))
+        await db.commit()
+        db.expunge_all()
+
+        statements = []
+        event.listen(
+            engine.sync_engine, "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement)
+        )
+
+        first = await load_identity_async(db, 1, 100)
+        again = await load_identity_async(db, 1, 100)
+        missing = await load_identity_async(db, 2, 100)
+        return first, again, missing, len(statements)
+
+    first, again, missing, queries = run(scenario)
+    assert (first.username, again, missing, queries) == ("alice", first, None, 2)
@@ -0,0 +1,69 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models import User, Post, Reaction, Comment
+from app.services import engagement
+
+engine = create_engine(
+    "sqlite://",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def post(db):
+    author = User(username="author", email="author@example.com", password_hash="x")
+    db.add(author)
+    db.flush()
+
+    post = Post(user_id=author.id, content="hello")
+    db.add(post)
+    db.commit()
+    return post
+
+
+def test_counter_updates(db, post):
+    """Reaction and comment writes keep counters in step"""
+    engagement.add_reaction(db=db, post_id=post.id, reaction_type="like")
+    engagement.add_reaction(db=db, post_id=post.id, reaction_type="love")
+    engagement.change_reaction(db=db, post_id=post.id, old_type="like", new_type="wow")
+    engagement.remove_reaction(db=db, post_id=post.id, reaction_type="love")
+    engagement.add_comments(db=db, post_id=post.id, count=3)
+    db.commit()
+    db.refresh(post)
+
+    assert post.likes_count == 1
+    assert post.comments_count == 3
+    assert engagement.reaction_breakdown(post) == {"wow": 1}
+
+
+def test_reconcile_repairs_drift(db, post):
+    """Reconciliation recomputes drifted counters from source rows"""
+    db.add(Reaction(user_id=post.user_id, post_id=post.id, reaction_type="haha"))
+    db.add(Comment(user_id=post.user_id, post_id=post.id, content="hi"))
+    post.comments_count = 7
+    db.commit()
+
+    assert engagement.reconcile_engagement_counters(db) == 1
+    db.refresh(post)
+
+    assert post.likes_count == 1
+    assert post.haha_count == 1
+    assert post.comments_count == 1
+    assert engagement.reconcile_engagement_counters(db) == 0
@@ -0,0 +1,127 @@
+import asyncio
+import hashlib
+import io
+
+import pytest
+from fastapi import HTTPException
+from PIL import Image
+from starlette.datastructures import Headers, UploadFile
+
+from app.config import settings
+from app.utils.file_handler import FileHandler, file_handler
+
+
+class CountingReader(io.BytesIO):
+    """Records how many bytes were pulled from the upload"""
+
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.consumed = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.consumed += len(chunk)
+        return chunk
+
+
+def upload(data: bytes, filename: str, content_type: str, size=None) -> UploadFile:
+    return UploadFile(
+        CountingReader(data),
+        size=size,
+        filename=filename,
+        headers=Headers({"content-type": content_type})
+    )
+
+
+def files(root):
+    return sorted(str(p.relative_to(root)) for p in root.rglob("*") if p.is_file())
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(FileHandler, "CHUNK_SIZE", 1024)
+    return tmp_path
+
+
+def test_video_streamed_hashed_and_renamed(upload_dir):
+    data = bytes(range(256)) * 40  # ten chunks
+    stored = asyncio.run(file_handler.save_video(upload(data, "clip.mp4", "video/mp4")))
+
+    digest = hashlib.sha256(data).hexdigest()
+    assert stored.url == f"/uploads/media/{digest[:2]}/{digest}.mp4"
+    assert (stored.sha256, stored.size) == (digest, len(data))
+    assert open(stored.path, "rb").read() == data
+    # Only the final file is left behind
+    assert files(upload_dir) == [stored.url.removeprefix("/uploads/")]
+
+
+def test_video_extension_follows_content_type(upload_dir):
+    data = b"same bytes" * 100
+    digest = hashlib.sha256(data).hexdigest()
+
+    first = asyncio.run(file_handler.save_video(upload(data, "page.html", "video/quicktime")))
+    assert first.url == f"/uploads/media/{digest[:2]}/{digest}.mov"
+
+    # The client's filename never reaches the path, so it can't split
+    # identical bytes or add directories
+    again = asyncio.run(file_handler.save_video(upload(data, "x/y.MOV", "video/quicktime")))
+    assert (again.url, again.deduplicated) == (first.url, True)
+    assert files(upload_dir) == [first.url.removeprefix("/uploads/")]
+
+
+def test_oversize_aborted_at_the_limit(upload_dir, monkeypatch):
+    monkeypatch.setattr(FileHandler, "MAX_VIDEO_SIZE", 4096)
+    file = upload(b"x" * 100_000, "clip.mp4", "video/mp4")
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(file_handler.save_video(file))
+
+    assert exc.value.status_code == 400
+    # Stopped one chunk past the limit instead of reading the whole body
+    assert file.file.consumed == 4096 + 1024
+    assert files(upload_dir) == []
+
+
+def test_declared_oversize_rejected_before_reading(upload_dir, monkeypatch):
+    monkeypatch.setattr(FileHandler, "MAX_VIDEO_SIZE", 4096)
+    file = upload(b"x" * 100_000, "clip.mp4", "video/mp4", size=100_000)
+
+    with pytest.raises(HTTPException):
+        asyncio.run(file_handler.save_video(file))
+    assert file.file.consumed == 0
+
+
+def test_image_transcoded_from_disk(upload_dir, monkeypatch):
+    # Transcode on the request threadpool instead of spawning processes
+    monkeypatch.setattr("app.core.image_pool.image_processor.workers", 0)
+    output = io.BytesIO()
+    Image.new("RGBA", (3000, 1000), (0, 128, 255, 128)).save(output, "PNG")
+    data = output.getvalue()
+
+    stored = asyncio.run(file_handler.save_image(upload(data, "a.png", "image/png")))
+
+    assert stored.sha256 == hashlib.sha256(data).hexdigest()
+    assert Image.open(stored.path).size == (2048, 683)
+    assert files(upload_dir) == [stored.url.removeprefix("/uploads/")]
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(file_handler.save_image(upload(b"not an image", "b.png", "image/png")))
+    assert exc.value.detail == "File is not a valid image"
+    assert files(upload_dir) == [stored.url.removeprefix("/uploads/")]
+
+
+def test_transcode_errors_are_not_echoed(upload_dir, monkeypatch, caplog):
+    monkeypatch.setattr("app.core.image_pool.image_processor.workers", 0)
+
+    def fail(*args):
+        raise OSError(f"cannot write {settings.UPLOAD_DIR}/.tmp/x")
+
+    monkeypatch.setattr("app.utils.file_handler.transcode_image", fail)
+    output = io.BytesIO()
+    Image.new("RGB", (8, 8)).save(output, "PNG")
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(file_handler.save_image(upload(output.getvalue(), "a.png", "image/png")))
+    assert (exc.value.status_code, exc.value.detail) == (400, "File is not a valid image")
+    assert "cannot write" in caplog.text
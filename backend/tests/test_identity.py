@@ -0,0 +1,90 @@
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.api.deps import get_current_active_user, get_optional_user
+from app.core.identity import identity_cache, invalidate_user
+from app.core.jwt import create_access_token
+from app.database import Base
+from app.models import User
+
+engine = create_engine(
+    "sqlite://",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    identity_cache.clear()
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        identity_cache.clear()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def user(db):
+    user = User(username="alice", email="alice@example.com", password_hash="x")
+    db.add(user)
+    db.commit()
+    return user
+
+
+def bearer(user_id):
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=create_access_token(user_id))
+
+
+def user_queries(func):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "FROM users" in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        result = func()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return result, len(statements)
+
+
+def test_identity_cached_per_token(db, user):
+    credentials = bearer(user.id)
+
+    first, queries = user_queries(lambda: get_current_active_user(credentials, db))
+    assert (first.id, first.username, queries) == (user.id, "alice", 1)
+
+    again, queries = user_queries(lambda: get_current_active_user(credentials, db))
+    assert (again, queries) == (first, 0)
+
+    optional, queries = user_queries(lambda: get_optional_user(credentials, db))
+    assert (optional, queries) == (first, 0)
+
+
+def test_invalidation_reloads_changes(db, user):
+    credentials = bearer(user.id)
+    get_current_active_user(credentials, db)
+
+    user.username = "alice2"
+    user.is_active = False
+    db.commit()
+
+    # Still served from the cache until invalidated
+    assert get_current_active_user(credentials, db).username == "alice"
+
+    invalidate_user(user.id)
+    with pytest.raises(HTTPException) as exc:
+        get_current_active_user(credentials, db)
+    assert exc.value.status_code == 403
+    assert get_optional_user(credentials, db).username == "alice2"
@@ -0,0 +1,69 @@
+import asyncio
+import io
+import time
+
+import pytest
+from PIL import Image
+
+from app.core.image_pool import ImageProcessingTimeout, ImageProcessor, ImageProcessorBusy
+from app.utils.images import transcode_image
+
+
+def png_bytes(size, mode="RGBA"):
+    output = io.BytesIO()
+    Image.new(mode, size, (255, 0, 0, 128) if mode == "RGBA" else 0).save(output, "PNG")
+    return output.getvalue()
+
+
+def test_transcode_fits_and_flattens():
+    output = io.BytesIO()
+    transcode_image(io.BytesIO(png_bytes((3000, 1500))), output, 2048, 2048, 85)
+    image = Image.open(output)
+    assert (image.format, image.mode, image.size) == ("JPEG", "RGB", (2048, 1024))
+
+
+def test_transcode_in_worker_process(tmp_path):
+    source, output = tmp_path / "in.png", tmp_path / "out.jpg"
+    source.write_bytes(png_bytes((10, 10), "P"))
+    processor = ImageProcessor(workers=1, max_queue=0, timeout=30)
+    try:
+        asyncio.run(processor.run(transcode_image, str(source), str(output), 5, 5, 85))
+    finally:
+        processor.shutdown()
+    assert Image.open(output).size == (5, 5)
+
+
+def test_rejects_when_saturated():
+    processor = ImageProcessor(workers=1, max_queue=1, timeout=30)
+
+    async def scenario():
+        # One job on the worker, one waiting: the third is turned away
+        running = [asyncio.ensure_future(processor.run(time.sleep, 0.5)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        with pytest.raises(ImageProcessorBusy):
+            await processor.run(time.sleep, 0)
+        await asyncio.gather(*running)
+
+    try:
+        asyncio.run(scenario())
+        assert processor.stats()["in_flight"] == 0
+        assert processor.stats()["rejected"] == 1
+    finally:
+        processor.shutdown()
+
+
+def test_timeout_keeps_slot_until_worker_finishes():
+    processor = ImageProcessor(workers=1, max_queue=0, timeout=0.2)
+
+    async def scenario():
+        with pytest.raises(ImageProcessingTimeout):
+            await processor.run(time.sleep, 1.5)
+        # The abandoned job still occupies the only worker
+        with pytest.raises(ImageProcessorBusy):
+            await processor.run(time.sleep, 0)
+
+    try:
+        asyncio.run(scenario())
+        assert processor.stats()["timed_out"] == 1
+    finally:
+        processor.shutdown()
@@ -0,0 +1,51 @@
+import logging
+import time
+from datetime import timedelta
+
+import pytest
+from jose.exceptions import ExpiredSignatureError
+
+from app.core import jwt as jwt_module
+from app.core.jwt import create_access_token, decode_token
+
+
+@pytest.fixture(autouse=True)
+def clean_caches():
+    jwt_module._verified.clear()
+    jwt_module._rejections.clear()
+    yield
+    jwt_module._verified.clear()
+    jwt_module._rejections.clear()
+
+
+def test_verified_payload_cached_until_exp(monkeypatch):
+    token = create_access_token(7, expires_delta=timedelta(seconds=30))
+
+    claims = decode_token(token)
+    assert claims["sub"] == "7"
+
+    # Served from the cache without re-verifying
+    monkeypatch.setattr(jwt_module.jwt, "decode", lambda *a, **kw: pytest.fail("re-verified"))
+    assert decode_token(token) == claims
+
+    # ... but never past its expiry
+    def expired(*args, **kwargs):
+        raise ExpiredSignatureError("Signature has expired.")
+
+    now = time.time()
+    monkeypatch.setattr(jwt_module.time, "time", lambda: now + 60)
+    monkeypatch.setattr(jwt_module.jwt, "decode", expired)
+    assert decode_token(token) is None
+    assert len(jwt_module._verified) == 0
+
+
+def test_rejections_logged_once_per_interval(caplog):
+    caplog.set_level(logging.WARNING, logger="app.core.jwt")
+
+    for _ in range(5):
+        assert decode_token("not-a-token") is None
+
+    records = [r for r in caplog.records if r.name == "app.core.jwt"]
+    assert len(records) == 1
+    assert records[0].jwt_error == "JWTError"
+    assert jwt_module._rejections["JWTError"][1] == 4
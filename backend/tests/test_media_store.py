@@ -0,0 +1,150 @@
+import asyncio
+import io
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from app.config import settings
+from app.database import SessionLocal
+from app.main import app
+from app.models import MediaBlob
+from app.services.media_store import reconcile_media_blobs, storage_report
+from app.services.media_variants import variant_file
+from app.utils import file_handler as file_handler_module
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def headers(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr("app.core.image_pool.image_processor.workers", 0)
+
+    name = f"ms{uuid.uuid4().hex[:10]}"
+    response = client.post(
+        "/api/v1/auth/signup",
+        json={"username": name, "email": f"{name}@example.com", "password": "TestPass123!"}
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def png(color) -> bytes:
+    output = io.BytesIO()
+    Image.new("RGB", (64, 64), color).save(output, "PNG")
+    return output.getvalue()
+
+
+def upload(headers, data: bytes) -> dict:
+    response = client.post(
+        "/api/v1/media/upload",
+        params={"media_type": "image"},
+        files={"file": ("a.png", data, "image/png")},
+        headers=headers
+    )
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def blob(db, file_url) -> MediaBlob:
+    db.expire_all()
+    return db.query(MediaBlob).filter(MediaBlob.file_url == file_url).one_or_none()
+
+
+def test_duplicate_upload_shares_the_file(headers, db, monkeypatch):
+    data = png((200, 10, 10))
+    first = upload(headers, data)
+
+    transcodes = []
+    monkeypatch.setattr(
+        file_handler_module.FileHandler, "transcode",
+        staticmethod(lambda *args: transcodes.append(args))
+    )
+    second = upload(headers, data)
+
+    assert second["file_url"] == first["file_url"]
+    assert transcodes == []  # recognized before any processing
+    row = blob(db, first["file_url"])
+    assert (row.ref_count, row.uploads) == (2, 2)
+
+    report = storage_report(db)
+    assert report["deduplicated_uploads"] >= 1
+    assert report["bytes_saved"] >= row.size
+
+
+def test_references_follow_attach_and_delete(headers, db):
+    media = upload(headers, png((10, 200, 10)))
+    post = client.post("/api/v1/posts", json={"content": "pic"}, headers=headers).json()
+
+    response = client.post(
+        f"/api/v1/media/posts/{post['id']}/attach", json=[media["id"]], headers=headers
+    )
+    assert response.status_code == 200, response.text
+    assert blob(db, media["file_url"]).ref_count == 2
+
+    # The post keeps the file after the upload is deleted
+    assert client.delete(f"/api/v1/media/{media['id']}", headers=headers).status_code == 204
+    assert blob(db, media["file_url"]).ref_count == 1
+    path = os.path.join(settings.UPLOAD_DIR, media["file_url"].removeprefix("/uploads/"))
+    assert os.path.exists(path)
+
+
+def test_reconcile_repairs_drift_and_collects_garbage(headers, db):
+    kept = upload(headers, png((10, 10, 200)))
+    orphan = upload(headers, png((200, 200, 10)))
+    orphan_path = os.path.join(settings.UPLOAD_DIR, orphan["file_url"].removeprefix("/uploads/"))
+
+    # Counts drift when cascades delete rows without releasing them
+    assert client.delete(f"/api/v1/media/{orphan['id']}", headers=headers).status_code == 204
+    db.query(MediaBlob).filter(MediaBlob.file_url == orphan["file_url"]).update({"ref_count": 3})
+    db.query(MediaBlob).filter(MediaBlob.file_url == kept["file_url"]).update({"ref_count": 0})
+    db.commit()
+
+    # Inside the grace period the orphan survives a reconcile
+    assert reconcile_media_blobs(db) >= 2
+    assert blob(db, kept["file_url"]).ref_count == 1
+    assert blob(db, orphan["file_url"]).ref_count == 0
+    assert os.path.exists(orphan_path)
+
+    past = datetime.now(timezone.utc) - timedelta(hours=2)
+    db.query(MediaBlob).filter(MediaBlob.file_url == orphan["file_url"]).update({"updated_at": past})
+    db.commit()
+    os.utime(orphan_path, (past.timestamp(), past.timestamp()))
+
+    sha256 = orphan["file_url"].rsplit("/", 1)[-1].removesuffix(".jpg")
+    thumb = asyncio.run(variant_file(sha256, "thumb", "webp"))
+
+    reconcile_media_blobs(db)
+    assert blob(db, orphan["file_url"]) is None
+    assert not os.path.exists(orphan_path)
+    assert not thumb.exists()
+    assert blob(db, kept["file_url"]) is not None
+
+
+def test_reconcile_sweeps_files_without_a_blob(headers, db):
+    media = upload(headers, png((30, 120, 30)))
+    path = os.path.join(settings.UPLOAD_DIR, media["file_url"].removeprefix("/uploads/"))
+
+    # As if the upload's transaction failed after the file was stored
+    db.query(MediaBlob).filter(MediaBlob.file_url == media["file_url"]).delete()
+    db.commit()
+
+    reconcile_media_blobs(db)
+    assert os.path.exists(path)
+
+    past = (datetime.now(timezone.utc) - timedelta(hours=2)).timestamp()
+    os.utime(path, (past, past))
+    reconcile_media_blobs(db)
+    assert not os.path.exists(path)
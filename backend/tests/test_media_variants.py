@@ -0,0 +1,101 @@
+import asyncio
+import io
+import os
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from app.config import settings
+from app.main import app
+from app.services import media_variants
+from app.services.media_variants import prune_variant_cache, variant_file, variant_path
+from app.utils.file_handler import FileHandler, file_handler
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def stored(tmp_path, monkeypatch):
+    """sha256 of a 2048x1024 image in the media store"""
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr("app.core.image_pool.image_processor.workers", 0)
+
+    sha256 = "ab" * 32
+    _, path = file_handler.content_location(sha256, "jpg")
+    path.parent.mkdir(parents=True)
+    Image.new("RGB", (2048, 1024), (30, 90, 150)).save(path, "JPEG")
+    return sha256
+
+
+def test_variant_generated_once_and_cached_forever(stored, monkeypatch):
+    response = client.get(f"/api/v1/media/variants/{stored}/thumb.webp")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/webp"
+    assert response.headers["cache-control"] == "public, max-age=31536000, immutable"
+    image = Image.open(io.BytesIO(response.content))
+    assert (image.format, image.size) == ("WEBP", (320, 160))
+
+    # Served from disk afterwards
+    transcodes = []
+    monkeypatch.setattr(FileHandler, "transcode", staticmethod(lambda *args: transcodes.append(args)))
+    again = client.get(f"/api/v1/media/variants/{stored}/thumb.webp")
+    assert again.content == response.content and transcodes == []
+
+    # The stored JPEG already is the full-size JPEG rendition
+    full = client.get(f"/api/v1/media/variants/{stored}/full.jpg")
+    assert Image.open(io.BytesIO(full.content)).size == (2048, 1024)
+    assert transcodes == []
+
+
+def test_unknown_image_or_variant(stored):
+    assert client.get(f"/api/v1/media/variants/{'cd' * 32}/feed.webp").status_code == 404
+    assert client.get(f"/api/v1/media/variants/{stored}/huge.webp").status_code == 404
+    assert client.get(f"/api/v1/media/variants/{stored}/feed.gif").status_code == 404
+    assert client.get("/api/v1/media/variants/not-a-digest/feed.webp").status_code == 422
+
+
+def test_concurrent_requests_share_one_transcode(stored, monkeypatch):
+    calls = []
+    transcode = FileHandler.transcode
+
+    async def slow_transcode(*args):
+        calls.append(args)
+        await asyncio.sleep(0.05)
+        await transcode(*args)
+
+    monkeypatch.setattr(FileHandler, "transcode", staticmethod(slow_transcode))
+
+    async def burst():
+        return await asyncio.gather(*(variant_file(stored, "feed", "webp") for _ in range(20)))
+
+    paths = asyncio.run(burst())
+
+    assert len(calls) == 1
+    assert set(paths) == {variant_path(stored, "feed", "webp")}
+    assert Image.open(paths[0]).size == (1080, 540)
+    assert media_variants._pending == {}
+
+
+def test_prune_evicts_least_recently_used(stored, monkeypatch):
+    for variant in ("thumb", "feed", "full"):
+        asyncio.run(variant_file(stored, variant, "webp"))
+
+    now = time.time()
+    ages = {"thumb": 300, "feed": 3000, "full": 2000}
+    for variant, age in ages.items():
+        os.utime(variant_path(stored, variant, "webp"), (now - age, now - age))
+    sizes = {v: variant_path(stored, v, "webp").stat().st_size for v in ages}
+
+    # A hit on a stale file counts as a use
+    asyncio.run(variant_file(stored, "full", "webp"))
+
+    monkeypatch.setattr(settings, "MEDIA_VARIANT_CACHE_BYTES", sizes["thumb"] + sizes["full"])
+    assert prune_variant_cache(None) == sizes["feed"]
+    assert not variant_path(stored, "feed", "webp").exists()
+    assert variant_path(stored, "thumb", "webp").exists()
+    assert variant_path(stored, "full", "webp").exists()
+
+    assert prune_variant_cache(None) == 0
@@ -0,0 +1,161 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models import User, Post, Comment, ModerationFlag
+from app.services import moderation
+from app.services.removal import delete_comment_thread, delete_post
+from app.services.sentiment_jobs import upsert_sentiments
+from app.utils.sentiment import sentiment_analyzer
+
+engine = create_engine(
+    "sqlite://",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def author(db):
+    user = User(username="author", email="author@example.com", password_hash="x")
+    db.add(user)
+    db.commit()
+    return user
+
+
+def score(db, target, content):
+    target.content = content
+    db.flush()
+    target_type = "post" if isinstance(target, Post) else "comment"
+    upsert_sentiments(db, [
+        {**sentiment_analyzer.analyze(content), f"{target_type}_id": target.id}
+    ], target_type)
+    db.commit()
+
+
+def test_flags_follow_analyzer_verdict(db, author):
+    post = Post(user_id=author.id, content="")
+    db.add(post)
+    db.commit()
+
+    score(db, post, "what a scam and fraud")
+    flag = db.query(ModerationFlag).one()
+    assert (flag.status, flag.toxicity, flag.toxicity_score) == ("open", "medium", 0.5)
+    assert flag.author_id == author.id
+
+    # Rescoring an open flag is the same flag event
+    score(db, post, "such a scam and fraud")
+    db.refresh(flag)
+    assert flag.flag_count == 1
+
+    # No longer flaggable: the open flag goes away
+    score(db, post, "what a lovely day")
+    assert db.query(ModerationFlag).count() == 0
+
+    # A reviewed flag stays resolved unless the content gets worse
+    score(db, post, "what a scam and fraud")
+    moderation.resolve_flag(
+        db=db, target_type="post", target_id=post.id,
+        moderator_id=author.id, action="approve"
+    )
+    db.commit()
+
+    reviewed = db.query(ModerationFlag).one()
+    reviewed_at = reviewed.created_at
+
+    score(db, post, "scam and fraud, again")
+    db.refresh(reviewed)
+    assert (reviewed.status, reviewed.toxicity_score) == ("approved", 0.5)
+    assert reviewed.created_at == reviewed_at
+
+    score(db, post, "scam, fraud and a weapon")
+    flag = db.query(ModerationFlag).one()
+    db.refresh(flag)
+    assert (flag.status, flag.toxicity) == ("open", "high")
+    assert flag.created_at > reviewed_at  # back of the queue
+    assert flag.flag_count == 2
+
+
+def test_flags_for_deleted_targets_are_skipped(db, author):
+    post = Post(user_id=author.id, content="scam and fraud")
+    db.add(post)
+    db.commit()
+    result = {**sentiment_analyzer.analyze(post.content), "post_id": post.id}
+    db.delete(post)
+    db.commit()
+
+    moderation.record_flags(db, "post", [result])
+    assert db.query(ModerationFlag).count() == 0
+
+
+def test_removed_content_keeps_its_flag(db, author):
+    post = Post(user_id=author.id, content="")
+    db.add(post)
+    db.flush()
+    comment = Comment(user_id=author.id, post_id=post.id, content="")
+    db.add(comment)
+    db.commit()
+    post_id, comment_id = post.id, comment.id
+
+    score(db, comment, "scam and fraud")
+    score(db, post, "scam and fraud")
+
+    for target_type, target_id in (("comment", comment_id), ("post", post_id)):
+        moderation.resolve_flag(
+            db=db, target_type=target_type, target_id=target_id,
+            moderator_id=author.id, action="remove"
+        )
+    delete_comment_thread(db=db, comment=comment)
+    delete_post(db=db, post=post)
+    db.commit()
+
+    flags = db.query(ModerationFlag).order_by(ModerationFlag.id).all()
+    assert [
+        (flag.target_type, flag.target_id, flag.post_id, flag.comment_id, flag.status)
+        for flag in flags
+    ] == [
+        ("comment", comment_id, None, None, "removed"),
+        ("post", post_id, None, None, "removed")
+    ]
+
+
+def test_open_flags_single_ordered_page(db, author):
+    post = Post(user_id=author.id, content="")
+    db.add(post)
+    db.flush()
+    comments = [Comment(user_id=author.id, post_id=post.id, content="") for _ in range(3)]
+    db.add_all(comments)
+    db.commit()
+
+    score(db, post, "kill yourself")
+    for comment in comments:
+        score(db, comment, "scam and fraud")
+
+    seen = []
+    cursor = None
+    while True:
+        rows, cursor = moderation.open_flags(db, None, cursor, 2)
+        seen.extend((flag.target_type, flag.post_id or flag.comment_id, content) for flag, _, content in rows)
+        if cursor is None:
+            break
+
+    assert len(seen) == 4
+    assert seen[-1] == ("post", post.id, "kill yourself")
+    assert {target_type for target_type, _, _ in seen[:3]} == {"comment"}
+
+    rows, _ = moderation.open_flags(db, "post", None, 10)
+    assert [flag.post_id for flag, _, _ in rows] == [post.id]
@@ -0,0 +1,120 @@
+import base64
+import json
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.main import app
+from app.models import Post, User
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_page
+
+engine = create_engine(
+    "sqlite://",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def author(db):
+    user = User(username="author", email="author@example.com", password_hash="x")
+    db.add(user)
+    db.commit()
+    return user
+
+
+def walk(db, page_size):
+    """Every page of Post ids, newest first"""
+    pages, cursor = [], None
+    for _ in range(20):  # a cursor that repeats rows would never end
+        posts, cursor = keyset_page(
+            db.query(Post), Post.created_at, Post.id, cursor, page_size
+        )
+        pages.append([post.id for post in posts])
+        if cursor is None:
+            return pages
+    pytest.fail("pagination did not terminate")
+
+
+def test_pages_break_timestamp_ties_by_id(db, author):
+    second = datetime(2024, 5, 1, 12, 0, 0, tzinfo=timezone.utc)
+    earlier = datetime(2024, 5, 1, 11, 59, 59, tzinfo=timezone.utc)
+    for created_at in [earlier] * 2 + [second] * 5:
+        db.add(Post(user_id=author.id, content="tie", created_at=created_at))
+    db.commit()
+
+    pages = walk(db, page_size=2)
+
+    assert pages == [[7, 6], [5, 4], [3, 2], [1]]
+
+
+def test_pages_over_default_timestamps(db, author):
+    # created_at left to the column default, many in the same second
+    for _ in range(9):
+        db.add(Post(user_id=author.id, content="burst"))
+        db.commit()
+
+    ids = [post_id for page in walk(db, page_size=4) for post_id in page]
+
+    assert ids == list(range(9, 0, -1))
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2024, 5, 1, 12, 0, 0, 123456)
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+
+def forge(value) -> str:
+    payload = base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip("=")
+    return f"{payload}.{encode_cursor(datetime(2024, 1, 1), 1).split('.')[1]}"
+
+
+@pytest.mark.parametrize("cursor", [
+    "garbage",
+    "",
+    "é.é",
+    forge(["2024-01-01T00:00:00", 999]),  # edited position, stale signature
+    forge({"a": 1}),
+])
+def test_bad_cursor_rejected(cursor):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor)
+    assert exc.value.status_code == 400
+
+
+def test_endpoints_reject_tampered_cursor():
+    client = TestClient(app)
+    name = f"pg{uuid.uuid4().hex[:10]}"
+    response = client.post(
+        "/api/v1/auth/signup",
+        json={"username": name, "email": f"{name}@example.com", "password": "TestPass123!"}
+    )
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    cursor = encode_cursor(datetime(2024, 1, 1), 10)
+    signature = cursor.split(".")[1]
+    tampered = encode_cursor(datetime(2030, 1, 1), 10).split(".")[0] + "." + signature
+
+    for path in ("/api/v1/posts/feed", "/api/v1/bookmarks"):
+        assert client.get(path, params={"cursor": cursor}, headers=headers).status_code == 200
+        assert client.get(path, params={"cursor": tampered}, headers=headers).status_code == 400
+        assert client.get(path, params={"cursor": "!!"}, headers=headers).status_code == 400
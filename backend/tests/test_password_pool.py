@@ -0,0 +1,72 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core.security import (
+    PasswordHasher,
+    PasswordHasherBusy,
+    hash_password_async,
+    verify_password_async
+)
+
+
+def test_async_hash_roundtrip():
+    async def roundtrip():
+        hashed = await hash_password_async("correct horse")
+        return (
+            await verify_password_async("correct horse", hashed),
+            await verify_password_async("wrong horse", hashed)
+        )
+
+    assert asyncio.run(roundtrip()) == (True, False)
+
+
+def test_rejects_when_saturated():
+    hasher = PasswordHasher(workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        # One call on the worker, one waiting: the third is turned away
+        running = [asyncio.ensure_future(hasher.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        with pytest.raises(PasswordHasherBusy):
+            await hasher.run(release.wait)
+
+        release.set()
+        await asyncio.gather(*running)
+        # Capacity is returned once the calls finish
+        return await hasher.run(lambda: "ok")
+
+    try:
+        assert asyncio.run(scenario()) == "ok"
+        assert hasher.stats() == {"workers": 1, "max_queue": 1, "in_flight": 0, "rejected": 1}
+    finally:
+        hasher.shutdown()
+
+
+def test_cancelled_call_keeps_its_slot_until_done():
+    hasher = PasswordHasher(workers=1, max_queue=0)
+    release = threading.Event()
+
+    async def scenario():
+        call = asyncio.ensure_future(hasher.run(release.wait))
+        await asyncio.sleep(0.05)
+        call.cancel()
+        await asyncio.sleep(0.05)
+
+        # The worker is still busy, so the slot is still taken
+        assert hasher.stats()["in_flight"] == 1
+        with pytest.raises(PasswordHasherBusy):
+            await hasher.run(lambda: "ok")
+
+        release.set()
+        await asyncio.sleep(0.05)
+        return await hasher.run(lambda: "ok")
+
+    try:
+        assert asyncio.run(scenario()) == "ok"
+        assert hasher.stats()["in_flight"] == 0
+    finally:
+        release.set()
+        hasher.shutdown()
@@ -0,0 +1,89 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models import User, Post, Reaction, Comment, Bookmark
+from app.api.v1.posts import build_post_responses
+from app.services.engagement import reconcile_engagement_counters
+
+engine = create_engine(
+    "sqlite://",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+def seed_posts(db, count):
+    author = User(username="author", email="author@example.com", password_hash="x")
+    viewer = User(username="viewer", email="viewer@example.com", password_hash="x")
+    db.add_all([author, viewer])
+    db.flush()
+
+    for i in range(count):
+        post = Post(user_id=author.id, content=f"post {i}")
+        db.add(post)
+        db.flush()
+
+        db.add(Reaction(user_id=author.id, post_id=post.id, reaction_type="like"))
+        db.add(Comment(user_id=author.id, post_id=post.id, content="nice"))
+
+        if i % 2 == 0:
+            db.add(Reaction(user_id=viewer.id, post_id=post.id, reaction_type="love"))
+            db.add(Bookmark(user_id=viewer.id, post_id=post.id))
+
+    db.commit()
+    reconcile_engagement_counters(db)
+    db.refresh(viewer)
+    return viewer
+
+
+def count_hydration_queries(db, viewer, page_size):
+    posts = db.query(Post).order_by(Post.id).limit(page_size).all()
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        responses = build_post_responses(posts, db, viewer)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    return responses, len(statements)
+
+
+def test_hydration_resolves_counts_and_viewer_flags(db):
+    """Counts and viewer flags match the underlying rows"""
+    viewer = seed_posts(db, 4)
+    responses, _ = count_hydration_queries(db, viewer, 4)
+
+    assert [r["likes_count"] for r in responses] == [2, 1, 2, 1]
+    assert [r["comments_count"] for r in responses] == [1, 1, 1, 1]
+    assert [r["is_liked"] for r in responses] == [True, False, True, False]
+    assert [r["is_saved"] for r in responses] == [True, False, True, False]
+
+
+def test_hydration_query_count_is_flat(db):
+    """Query count does not grow with page size"""
+    viewer = seed_posts(db, 100)
+
+    _, small_page = count_hydration_queries(db, viewer, 5)
+    _, large_page = count_hydration_queries(db, viewer, 100)
+
+    assert small_page == large_page
+    assert large_page <= 4
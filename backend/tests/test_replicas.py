@@ -0,0 +1,86 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+from app import database
+from app.api.deps import LAST_WRITE_COOKIE, LAST_WRITE_HEADER, write_marker
+from app.database import Base, ReadOnlySession, read_session
+from app.main import app
+from app.models import User
+
+
+@pytest.fixture
+def replica(tmp_path, monkeypatch):
+    """A second SQLite file standing in for a lagging replica"""
+    replica_engine = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    Base.metadata.create_all(bind=replica_engine)
+    Base.metadata.create_all(bind=database.engine)
+    monkeypatch.setattr(database, "replica_engines", [replica_engine])
+    yield replica_engine
+    replica_engine.dispose()
+
+
+def test_reads_routed_to_replica_unless_recent_write(replica):
+    assert read_session().bind is replica
+    assert read_session(last_write_at=time.time() - 60).bind is replica
+    assert read_session(last_write_at=time.time()).bind is database.engine
+
+
+def test_read_sessions_reject_writes(replica):
+    db = read_session()
+    db.add(User(username="nope", email="nope@example.com", password_hash="x"))
+    with pytest.raises(RuntimeError):
+        db.flush()
+    db.close()
+
+
+def test_read_your_writes(replica):
+    client = TestClient(app)
+    response = client.post(
+        "/api/v1/auth/signup",
+        json={"username": "replicauser", "email": "replica@example.com", "password": "TestPass123!"}
+    )
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    user_id = client.get("/api/v1/users/me", headers=headers).json()["id"]
+
+    # The replica has not caught up with the signup yet
+    assert client.get(f"/api/v1/users/{user_id}", headers=headers).status_code == 404
+
+    # After a write the user reads from the primary
+    client.put("/api/v1/users/me", json={"username": "replicauser2"}, headers=headers)
+    response = client.get(f"/api/v1/users/{user_id}", headers=headers)
+    assert (response.status_code, response.json()["username"]) == (200, "replicauser2")
+
+    # Anonymous readers (and the user once the window passes) use the replica
+    assert client.get(f"/api/v1/users/{user_id}").status_code == 404
+    client.cookies.clear()
+    assert client.get(f"/api/v1/users/{user_id}", headers=headers).status_code == 404
+
+
+def test_marker_routes_reads_on_any_worker(replica):
+    # Two clients share nothing but what the writer sends back, like two
+    # workers behind a load balancer
+    writer, reader = TestClient(app), TestClient(app)
+    response = writer.post(
+        "/api/v1/auth/signup",
+        json={"username": "replicamarker", "email": "marker@example.com", "password": "TestPass123!"}
+    )
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    user_id = writer.get("/api/v1/users/me", headers=headers).json()["id"]
+
+    response = writer.put("/api/v1/users/me", json={"username": "replicamarker2"}, headers=headers)
+    marker = response.headers[LAST_WRITE_HEADER]
+    assert writer.cookies[LAST_WRITE_COOKIE] == marker
+
+    path = f"/api/v1/users/{user_id}"
+    assert reader.get(path, headers=headers).status_code == 404
+    assert reader.get(path, headers={**headers, LAST_WRITE_HEADER: marker}).status_code == 200
+
+    # Forged, stale and other users' markers are ignored
+    forged = marker[:-1] + ("0" if marker[-1] != "0" else "1")
+    stale = write_marker(user_id, time.time() - 60)
+    other = write_marker(user_id + 1)
+    for value in (forged, stale, other, "garbage"):
+        assert reader.get(path, headers={**headers, LAST_WRITE_HEADER: value}).status_code == 404
@@ -0,0 +1,173 @@
+import json
+from concurrent.futures import Future
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models import User, Post, Comment, Sentiment
+from app.core.sentiment import LexiconBackend
+from app.services import rescore, sentiment_cache
+from app.services.rescore import rescore_corpus
+from app.utils.sentiment import sentiment_analyzer
+
+engine = create_engine(
+    "sqlite://",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture(autouse=True)
+def cold_cache():
+    sentiment_cache.result_cache.clear()
+    yield
+    sentiment_cache.result_cache.clear()
+
+
+@pytest.fixture
+def corpus(db):
+    user = User(username="author", email="author@example.com", password_hash="x")
+    db.add(user)
+    db.flush()
+
+    posts = [Post(user_id=user.id, content=f"I love this amazing day {i}") for i in range(5)]
+    db.add_all(posts)
+    db.flush()
+    comment = Comment(user_id=user.id, post_id=posts[0].id, content="terrible and awful")
+    db.add(comment)
+    db.flush()
+
+    # Stale labels on three posts, none at all on the comment
+    for i, post in enumerate(posts):
+        db.add(Sentiment(
+            post_id=post.id,
+            label="negative" if i < 3 else "positive",
+            score=0.5,
+            target_type="post"
+        ))
+    db.commit()
+    return posts, comment
+
+
+def labels(db):
+    return sorted(
+        (s.target_type, s.post_id or s.comment_id, s.label) for s in db.query(Sentiment)
+    )
+
+
+def test_dry_run_reports_drift_only(db, corpus):
+    before = labels(db)
+
+    report = rescore_corpus(db, chunk_size=2, processes=1, dry_run=True)
+
+    assert report["scored"] == {"post": 5, "comment": 1}
+    assert report["drift"] == {"negative->positive": 3, "missing->negative": 1}
+    assert labels(db) == before
+
+
+def test_resume_from_checkpoint(db, corpus, tmp_path):
+    posts, comment = corpus
+    checkpoint = str(tmp_path / "rescore.json")
+
+    def interrupt(target_type, last_id, scored):
+        if scored >= 2:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        rescore_corpus(db, chunk_size=2, processes=1, checkpoint=checkpoint, progress=interrupt)
+
+    with open(checkpoint) as f:
+        assert json.load(f)["last_id"] == {"post": posts[1].id}
+
+    seen = []
+    report = rescore_corpus(
+        db, chunk_size=2, processes=2, checkpoint=checkpoint,
+        progress=lambda target_type, last_id, scored: seen.append((target_type, last_id))
+    )
+
+    # Only the remaining rows were read again
+    assert seen == [("post", posts[3].id), ("post", posts[4].id), ("comment", comment.id)]
+    assert report["scored"] == {"post": 5, "comment": 1}
+    assert report["drift"] == {"negative->positive": 3, "missing->negative": 1}
+
+    expected = sentiment_analyzer.analyze(comment.content)["label"]
+    assert labels(db) == sorted(
+        [("post", post.id, "positive") for post in posts] + [("comment", comment.id, expected)]
+    )
+
+
+class CountingBackend:
+    version = "counting-1"
+
+    def __init__(self):
+        self.scored = []
+
+    def analyze_batch(self, texts):
+        self.scored.extend(texts)
+        return [sentiment_analyzer.analyze(text) for text in texts]
+
+
+class InlinePool:
+    """Stands in for the process pool, recording what reaches it"""
+    submitted = []
+
+    def __init__(self, max_workers):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, func, texts, *args):
+        self.submitted.extend(texts)
+        future = Future()
+        future.set_result(func(texts, *args))
+        return future
+
+
+def test_cached_texts_skip_the_backend(db, corpus, monkeypatch):
+    backend = CountingBackend()
+    monkeypatch.setattr(sentiment_cache, "get_backend", lambda: backend)
+    monkeypatch.setattr(rescore, "get_backend", lambda: backend)
+
+    rescore_corpus(db, chunk_size=2, processes=1)
+    assert len(backend.scored) == 6
+
+    before = labels(db)
+    backend.scored.clear()
+    report = rescore_corpus(db, chunk_size=2, processes=1)
+
+    assert backend.scored == []
+    assert report["scored"] == {"post": 5, "comment": 1}
+    assert labels(db) == before
+
+
+def test_cached_texts_skip_the_pool(db, corpus, monkeypatch):
+    posts, _ = corpus
+    monkeypatch.setattr(rescore, "ProcessPoolExecutor", InlinePool)
+    monkeypatch.setattr(InlinePool, "submitted", [])
+    monkeypatch.setattr(rescore, "get_backend", LexiconBackend)
+    monkeypatch.setattr(sentiment_cache, "get_backend", LexiconBackend)
+
+    sentiment_cache.analyze_texts(db, [post.content for post in posts])
+    report = rescore_corpus(db, chunk_size=2, processes=2)
+
+    assert InlinePool.submitted == ["terrible and awful"]
+    assert report["drift"] == {"negative->positive": 3, "missing->negative": 1}
@@ -0,0 +1,164 @@
+import io
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from app.config import settings
+from app.database import SessionLocal
+from app.main import app
+from app.models import UploadSession
+from app.services.uploads import session_path, sweep_upload_sessions
+from app.utils.file_handler import file_handler
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def headers(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr("app.core.image_pool.image_processor.workers", 0)
+
+    name = f"up{uuid.uuid4().hex[:10]}"
+    response = client.post(
+        "/api/v1/auth/signup",
+        json={"username": name, "email": f"{name}@example.com", "password": "TestPass123!"}
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def start(headers, data: bytes, **fields):
+    payload = {
+        "purpose": "media",
+        "media_type": "video",
+        "filename": "clip.mp4",
+        "content_type": "video/mp4",
+        "total_size": len(data),
+        **fields
+    }
+    response = client.post("/api/v1/uploads", json=payload, headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def put(headers, upload_id, offset, body):
+    return client.put(f"/api/v1/uploads/{upload_id}?offset={offset}", content=body, headers=headers)
+
+
+def test_resume_after_interrupted_chunk(headers):
+    data = os.urandom(5000)
+    upload_id = start(headers, data, filename="clip.html", content_type="video/x-msvideo")
+
+    assert put(headers, upload_id, 0, data[:2000]).json()["offset"] == 2000
+
+    # A retry of an old chunk is told where to continue
+    response = put(headers, upload_id, 0, data[:2000])
+    assert (response.status_code, response.headers["Upload-Offset"]) == (409, "2000")
+    assert client.get(f"/api/v1/uploads/{upload_id}", headers=headers).json()["offset"] == 2000
+
+    # Completing early is refused
+    assert client.post(f"/api/v1/uploads/{upload_id}/complete", headers=headers).status_code == 409
+
+    assert put(headers, upload_id, 2000, data[2000:]).json()["complete"] is True
+
+    response = client.post(f"/api/v1/uploads/{upload_id}/complete", headers=headers)
+    assert response.status_code == 201
+    media = response.json()
+    assert media["file_type"] == "video"
+    assert media["file_url"].endswith(".avi")
+
+    path = os.path.join(settings.UPLOAD_DIR, media["file_url"].removeprefix("/uploads/"))
+    assert open(path, "rb").read() == data
+    assert not session_path(upload_id).exists()
+    assert client.get(f"/api/v1/uploads/{upload_id}", headers=headers).status_code == 404
+
+
+def test_chunk_past_declared_size_rejected(headers, monkeypatch):
+    upload_id = start(headers, b"x" * 100)
+
+    assert put(headers, upload_id, 0, b"x" * 101).status_code == 400
+    assert client.get(f"/api/v1/uploads/{upload_id}", headers=headers).json()["offset"] == 0
+
+    # Blocks written before a chunk failed are dropped
+    append_chunk = file_handler.append_chunk
+
+    async def fail_after_writing(*args):
+        await append_chunk(*args)
+        raise HTTPException(status_code=400, detail="Chunk runs past the declared upload size")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(file_handler, "append_chunk", fail_after_writing)
+        assert put(headers, upload_id, 0, b"x" * 60).status_code == 400
+    assert session_path(upload_id).stat().st_size == 0
+    assert put(headers, upload_id, 0, b"y" * 100).json()["complete"] is True
+
+
+def test_one_writer_per_offset(headers):
+    upload_id = start(headers, b"x" * 10)
+
+    def set_writer(updated_at):
+        db = SessionLocal()
+        try:
+            db.query(UploadSession).filter(UploadSession.id == upload_id).update(
+                {"writer": "in-flight", "updated_at": updated_at}
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    # Another request is writing this offset: nothing is written
+    set_writer(datetime.now(timezone.utc))
+    response = put(headers, upload_id, 0, b"x" * 10)
+    assert (response.status_code, response.headers["Upload-Offset"]) == (409, "0")
+    assert session_path(upload_id).stat().st_size == 0
+
+    # A claim whose writer went away is taken over
+    set_writer(datetime.now(timezone.utc) - timedelta(days=2))
+    assert put(headers, upload_id, 0, b"x" * 10).json()["complete"] is True
+
+
+def test_story_image_upload(headers):
+    output = io.BytesIO()
+    Image.new("RGB", (3000, 1000), (20, 40, 60)).save(output, "PNG")
+    data = output.getvalue()
+    upload_id = start(
+        headers, data,
+        purpose="story", media_type="image", filename="a.png", content_type="image/png"
+    )
+
+    put(headers, upload_id, 0, data[:len(data) // 2])
+    put(headers, upload_id, len(data) // 2, data[len(data) // 2:])
+    response = client.post(f"/api/v1/uploads/{upload_id}/complete", headers=headers)
+
+    assert response.status_code == 201
+    story = response.json()
+    assert story["media_url"].startswith("/uploads/media/") and story["is_expired"] is False
+    path = os.path.join(settings.UPLOAD_DIR, story["media_url"].removeprefix("/uploads/"))
+    assert Image.open(path).size == (2048, 683)
+
+
+def test_sweeper_drops_idle_sessions(headers):
+    idle = start(headers, b"x" * 10)
+    active = start(headers, b"x" * 10)
+
+    db = SessionLocal()
+    db.query(UploadSession).filter(UploadSession.id == idle).update(
+        {"updated_at": datetime.now(timezone.utc) - timedelta(days=2)}
+    )
+    db.commit()
+    stale = datetime.now().timestamp() - 2 * 86400
+    os.utime(session_path(idle), (stale, stale))
+
+    try:
+        assert sweep_upload_sessions(db) == 1
+    finally:
+        db.close()
+
+    assert not session_path(idle).exists()
+    assert session_path(active).exists()
+    assert client.get(f"/api/v1/uploads/{idle}", headers=headers).status_code == 404
+    assert client.get(f"/api/v1/uploads/{active}", headers=headers).status_code == 200
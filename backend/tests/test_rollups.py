@@ -0,0 +1,261 @@
+from contextlib import contextmanager
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models import (
+    User, Post, Comment, Reaction, DailyMetrics, DailyUserMetrics, TrendingPost
+)
+from app.services import engagement, rollups, trending
+from app.services.removal import delete_comment_thread, delete_post
+from app.services.sentiment_jobs import upsert_sentiments
+
+engine = create_engine(
+    "sqlite://",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+def make_user(db, name):
+    user = User(username=name, email=f"{name}@example.com", password_hash="x")
+    db.add(user)
+    db.flush()
+    rollups.bump(db=db, day=rollups.utc_today(), new_users=1)
+    return user
+
+
+def snapshot(db):
+    def rows(model, keys):
+        return {
+            tuple(getattr(row, key) for key in keys): {
+                column.name: getattr(row, column.name)
+                for column in model.__table__.columns
+                if column.name not in keys
+            }
+            for row in db.query(model)
+        }
+
+    # Rows that only ever had their counters cancelled out are equivalent
+    # to missing ones
+    return {
+        table: {key: counts for key, counts in data.items() if any(counts.values())}
+        for table, data in (
+            ("user", rows(DailyUserMetrics, ("user_id", "day"))),
+            ("global", rows(DailyMetrics, ("day",)))
+        )
+    }
+
+
+def test_incremental_matches_backfill(db):
+    author = make_user(db, "author")
+    fan = make_user(db, "fan")
+
+    posts = []
+    for i in range(3):
+        post = Post(user_id=author.id, content=f"post {i}")
+        db.add(post)
+        db.flush()
+        rollups.record_post(db=db, user_id=author.id)
+        posts.append(post)
+
+    upsert_sentiments(db, [
+        {"post_id": post.id, "label": label, "score": 0.5}
+        for post, label in zip(posts, ("positive", "negative", "positive"))
+    ], "post")
+    # Relabelling moves the count instead of adding one
+    upsert_sentiments(db, [{"post_id": posts[2].id, "label": "neutral", "score": 0.0}], "post")
+
+    comments = []
+    for post in posts[:2]:
+        comment = Comment(user_id=fan.id, post_id=post.id, content="nice")
+        db.add(comment)
+        db.flush()
+        rollups.record_comment(db=db, user_id=fan.id, post_author_id=author.id)
+        comments.append(comment)
+    upsert_sentiments(db, [
+        {"comment_id": comment.id, "label": "positive", "score": 0.4} for comment in comments
+    ], "comment")
+
+    reaction = Reaction(user_id=fan.id, post_id=posts[0].id, reaction_type="like")
+    db.add(reaction)
+    db.flush()
+    rollups.record_reaction(db=db, post_author_id=author.id)
+    db.add(Reaction(user_id=fan.id, post_id=posts[1].id, reaction_type="like"))
+    rollups.record_reaction(db=db, post_author_id=author.id)
+
+    # Removals
+    db.refresh(reaction)
+    rollups.record_reaction(
+        db=db, post_author_id=author.id, delta=-1, created_at=reaction.created_at
+    )
+    db.delete(reaction)
+    rollups.forget_comments(db=db, comment_ids=[comments[0].id], post_author_id=author.id)
+    db.query(Comment).filter(Comment.id == comments[0].id).delete(synchronize_session=False)
+    db.commit()
+
+    incremental = snapshot(db)
+    today = rollups.utc_today()
+
+    assert incremental["user"][(author.id, today)] == {
+        "posts": 3,
+        "comments": 0,
+        "reactions_received": 1,
+        "comments_received": 1,
+        "positive_posts": 1,
+        "negative_posts": 1,
+        "neutral_posts": 1
+    }
+    assert incremental["global"][(today,)] == {
+        "posts": 3,
+        "comments": 1,
+        "reactions": 1,
+        "new_users": 2,
+        "positive": 2,
+        "negative": 1,
+        "neutral": 1
+    }
+
+    assert rollups.backfill_rollups(db) == 3
+    assert snapshot(db) == incremental
+
+
+def test_removals_match_backfill(db):
+    author = make_user(db, "author")
+    fan = make_user(db, "fan")
+
+    def comment_on(post, parent=None):
+        comment = Comment(
+            user_id=fan.id, post_id=post.id, content="reply",
+            parent_id=parent.id if parent else None
+        )
+        db.add(comment)
+        db.flush()
+        rollups.record_comment(db=db, user_id=fan.id, post_author_id=author.id)
+        engagement.add_comments(db=db, post_id=post.id)
+        trending.record_engagement(db=db, post_id=post.id, weight=trending.COMMENT_WEIGHT)
+        return comment
+
+    kept, removed = Post(user_id=author.id, content="kept"), Post(user_id=author.id, content="removed")
+    db.add_all([kept, removed])
+    db.flush()
+    for post in (kept, removed):
+        rollups.record_post(db=db, user_id=author.id)
+        db.add(Reaction(user_id=fan.id, post_id=post.id, reaction_type="like"))
+        rollups.record_reaction(db=db, post_author_id=author.id)
+
+    upsert_sentiments(db, [
+        {"post_id": kept.id, "label": "positive", "score": 0.5},
+        {"post_id": removed.id, "label": "negative", "score": -0.5}
+    ], "post")
+
+    root = comment_on(kept)
+    reply = comment_on(kept, root)
+    comment_on(kept, reply)
+    comment_on(kept)
+    comment_on(removed, comment_on(removed))
+    upsert_sentiments(db, [
+        {"comment_id": comment.id, "label": "positive", "score": 0.4}
+        for comment in db.query(Comment)
+    ], "comment")
+    db.commit()
+
+    # The reply thread goes as a whole, the post takes everything with it
+    assert delete_comment_thread(db=db, comment=root) == 3
+    delete_post(db=db, post=removed)
+    db.commit()
+
+    db.refresh(kept)
+    assert kept.comments_count == 1
+    trending_rows = db.query(TrendingPost).all()
+    assert [row.post_id for row in trending_rows] == [kept.id]
+    assert trending_rows[0].score == pytest.approx(trending.COMMENT_WEIGHT, rel=1e-3)
+
+    incremental = snapshot(db)
+    today = rollups.utc_today()
+    assert incremental["global"][(today,)] == {
+        "posts": 1,
+        "comments": 1,
+        "reactions": 1,
+        "new_users": 2,
+        "positive": 2,
+        "negative": 0,
+        "neutral": 0
+    }
+
+    rollups.backfill_rollups(db)
+    assert snapshot(db) == incremental
+
+
+def test_backfill_range_and_series(db):
+    user = make_user(db, "writer")
+    today = rollups.utc_today()
+    old_day = today - timedelta(days=10)
+
+    db.add(DailyUserMetrics(user_id=user.id, day=old_day, posts=4))
+    db.add(DailyMetrics(day=old_day, posts=4))
+    db.add(Post(user_id=user.id, content="today"))
+    db.commit()
+
+    # Only today is recomputed; older rows are left alone
+    rollups.backfill_rollups(db, start=today, end=today)
+
+    series = rollups.user_series(db, user.id, old_day, today)
+    assert {day: row.posts for day, row in series.items()} == {old_day: 4, today: 1}
+    assert rollups.global_series(db, today, today)[today].new_users == 1
+    assert rollups.user_series(db, user.id, old_day + timedelta(days=1), today - timedelta(days=1)) == {}
+
+
+def test_backfill_corrects_drift_and_keeps_concurrent_bumps(db, monkeypatch):
+    user = make_user(db, "busy")
+    today = rollups.utc_today()
+    db.add(Post(user_id=user.id, content="counted"))
+    rollups.record_post(db=db, user_id=user.id)
+    # Drift: a lost decrement and a row whose sources are gone
+    rollups.bump(db=db, day=today, user_id=user.id, comments=3)
+    rollups.bump(db=db, day=today - timedelta(days=1), posts=2)
+    db.commit()
+
+    snapshot_of = rollups._snapshot
+
+    @contextmanager
+    def snapshot_then_post(session):
+        with snapshot_of(session) as reader:
+            yield reader
+        # Another request posts after the counts were read
+        other = TestingSessionLocal()
+        other.add(Post(user_id=user.id, content="concurrent"))
+        rollups.record_post(db=other, user_id=user.id)
+        other.commit()
+        other.close()
+
+    monkeypatch.setattr(rollups, "_snapshot", snapshot_then_post)
+    rollups.backfill_rollups(db, start=today - timedelta(days=1), end=today)
+    db.expire_all()
+
+    row = rollups.user_series(db, user.id, today, today)[today]
+    assert (row.posts, row.comments) == (2, 0)
+    assert rollups.global_series(db, today, today)[today].posts == 2
+    assert rollups.global_series(db, today - timedelta(days=1), today)[today - timedelta(days=1)].posts == 0
+
+    # The next run finds nothing to correct
+    monkeypatch.setattr(rollups, "_snapshot", snapshot_of)
+    before = snapshot(db)
+    rollups.refresh_recent_rollups(db)
+    assert snapshot(db) == before
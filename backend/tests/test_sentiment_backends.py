@@ -0,0 +1,95 @@
+import threading
+
+import pytest
+
+from app.core import sentiment as backends
+from app.utils.sentiment import sentiment_analyzer
+
+
+def test_lexicon_backend_matches_analyzer():
+    """The lexicon backend is the keyword analyzer"""
+    texts = ["I love it!", "worst day 😡", ""]
+    backend = backends.LexiconBackend()
+
+    assert backend.analyze_batch(texts) == [sentiment_analyzer.analyze(t) for t in texts]
+    assert backend.analyze(texts[0]) == sentiment_analyzer.analyze(texts[0])
+
+
+def test_micro_batcher_coalesces_concurrent_calls():
+    """Concurrent submissions share batched calls and get their own results"""
+    calls = []
+    release = threading.Event()
+
+    def score(texts):
+        release.wait(5)
+        calls.append(len(texts))
+        return [{"text": text} for text in texts]
+
+    batcher = backends.MicroBatcher(score, max_batch_size=8, max_wait_ms=50)
+    results = {}
+
+    def worker(i):
+        results[i] = batcher.submit(f"text {i}")
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == {i: {"text": f"text {i}"} for i in range(20)}
+    assert sum(calls) == 20
+    assert len(calls) < 20
+    assert max(calls) <= 8
+
+
+def test_micro_batcher_splits_batch_submissions():
+    """A multi-text submission is scored in batches, results in order"""
+    calls = []
+
+    def score(texts):
+        calls.append(len(texts))
+        return [{"text": text} for text in texts]
+
+    batcher = backends.MicroBatcher(score, max_batch_size=4, max_wait_ms=10)
+    texts = [f"text {i}" for i in range(10)]
+
+    assert batcher.submit_many(texts) == [{"text": text} for text in texts]
+    assert sum(calls) == 10 and max(calls) <= 4
+
+
+def test_backends_must_score_batches():
+    class Incomplete(backends.SentimentBackend):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_transformer_labels_from_model_config():
+    labels = backends.TransformerBackend.model_labels
+
+    assert labels({0: "LABEL_0", 1: "LABEL_1", 2: "LABEL_2"}) == ("negative", "neutral", "positive")
+    assert labels({0: "Positive", 1: "Negative", 2: "Neutral"}) == ("positive", "negative", "neutral")
+    with pytest.raises(RuntimeError):
+        labels({0: "joy", 1: "anger"})
+
+
+def test_unknown_backend(monkeypatch):
+    monkeypatch.setattr(backends, "_backend", None)
+    monkeypatch.setattr(backends.settings, "SENTIMENT_BACKEND", "nope")
+
+    with pytest.raises(ValueError):
+        backends.get_backend()
+
+
+def test_transformer_requires_optional_dependencies():
+    try:
+        import transformers  # noqa: F401
+        pytest.skip("transformers installed")
+    except ImportError:
+        pass
+
+    with pytest.raises(RuntimeError):
+        backends.TransformerBackend()
@@ -0,0 +1,42 @@
+import json
+from pathlib import Path
+
+from app.utils import sentiment
+from app.utils.sentiment import sentiment_analyzer, analyze_sentiment_batch
+
+GOLDEN = json.loads(
+    (Path(__file__).parent / "data" / "sentiment_golden.json").read_text(encoding="utf-8")
+)
+
+
+def test_batch_matches_golden_corpus():
+    """analyze_batch reproduces the golden results exactly"""
+    texts = [case["text"] for case in GOLDEN]
+    results = analyze_sentiment_batch(texts, processes=1)
+
+    for case, result in zip(GOLDEN, results):
+        assert result == case["expected"], case["text"]
+        assert result == sentiment_analyzer.analyze(case["text"]), case["text"]
+
+
+def test_batch_process_pool(monkeypatch):
+    """Large batches fanned out over processes keep order and results"""
+    monkeypatch.setattr(sentiment, "PARALLEL_BATCH_THRESHOLD", 10)
+    monkeypatch.setattr(sentiment, "PARALLEL_CHUNK_SIZE", 7)
+
+    texts = [case["text"] for case in GOLDEN]
+    results = analyze_sentiment_batch(texts, processes=2)
+
+    assert results == [case["expected"] for case in GOLDEN]
+
+
+def test_recompiled_lexicon():
+    """Lexicon changes take effect after compile_lexicons()"""
+    analyzer = sentiment.SentimentAnalyzer()
+    analyzer.positive_words.add("stellar")
+    analyzer.very_toxic_phrases.add("go away forever")
+    analyzer.compile_lexicons()
+
+    assert analyzer.analyze("stellar day")["raw_score"] == 0.15
+    assert analyzer.analyze("please go  away forever")["toxicity"] == "high"
+    assert analyzer.analyze("go away, forever")["toxicity"] == "none"
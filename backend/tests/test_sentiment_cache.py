@@ -0,0 +1,118 @@
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.config import settings
+from app.database import Base
+from app.models import User, Post, Sentiment, Job, SentimentCacheEntry
+from app.services import sentiment_cache, sentiment_jobs
+from app.utils.cache import LRUCache
+from app.utils.sentiment import sentiment_analyzer
+
+engine = create_engine(
+    "sqlite://",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+class CountingBackend:
+    version = "counting-1"
+
+    def __init__(self):
+        self.scored = []
+
+    def analyze_batch(self, texts):
+        self.scored.extend(texts)
+        return [sentiment_analyzer.analyze(text) for text in texts]
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    backend = CountingBackend()
+    monkeypatch.setattr(sentiment_cache, "get_backend", lambda: backend)
+    sentiment_cache.result_cache.clear()
+    yield backend
+    sentiment_cache.result_cache.clear()
+
+
+def test_lru_cache_eviction_and_ttl():
+    cache = LRUCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+    cache.set("d", 4, ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("d") is None
+
+    stats = cache.stats()
+    assert stats["evictions"] == 2
+    assert stats["hits"] == 3
+    assert stats["misses"] == 2
+
+
+def test_normalized_duplicates_scored_once(backend):
+    """Only distinct normalized texts reach the backend"""
+    texts = ["great post!", "  great   post! ", "great post!", "meh"]
+    results = sentiment_cache.analyze_texts(None, texts)
+
+    assert backend.scored == ["great post!", "meh"]
+    assert results[0] == results[1] == results[2] == sentiment_analyzer.analyze("great post!")
+
+    sentiment_cache.analyze_texts(None, ["great post!\n"])
+    assert len(backend.scored) == 2
+    assert sentiment_cache.cache_stats()["hits"] >= 1
+
+
+def test_persistent_tier_survives_restart(db, backend, monkeypatch):
+    monkeypatch.setattr(settings, "SENTIMENT_CACHE_PERSISTENT", True)
+
+    sentiment_cache.analyze_texts(db, ["love it"])
+    db.commit()
+    assert db.query(SentimentCacheEntry).count() == 1
+
+    sentiment_cache.result_cache.clear()
+    assert sentiment_cache.cached_result(db, "love  it") == sentiment_analyzer.analyze("love it")
+    assert backend.scored == ["love it"]
+
+
+def test_cache_hit_skips_the_queue(db, backend):
+    author = User(username="author", email="author@example.com", password_hash="x")
+    db.add(author)
+    db.flush()
+    first = Post(user_id=author.id, content="great post!")
+    second = Post(user_id=author.id, content="great post!")
+    db.add_all([first, second])
+    db.flush()
+
+    sentiment_jobs.score_or_enqueue(db=db, content=first.content, post_id=first.id)
+    db.commit()
+    sentiment_jobs.drain_sentiment_jobs(db)
+
+    sentiment_jobs.score_or_enqueue(db=db, content=second.content, post_id=second.id)
+    db.commit()
+
+    assert db.query(Job).count() == 1
+    assert db.query(Sentiment).filter(Sentiment.post_id == second.id).one().label == "positive"
+    assert backend.scored == ["great post!"]
@@ -0,0 +1,150 @@
+import uuid
+from datetime import timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.config import settings
+from app.database import Base, SessionLocal
+from app.main import app
+from app.models import User, Post, Comment, Sentiment, Job
+from app.services import sentiment_jobs
+
+engine = create_engine(
+    "sqlite://",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def post(db):
+    author = User(username="author", email="author@example.com", password_hash="x")
+    db.add(author)
+    db.flush()
+
+    post = Post(user_id=author.id, content="I love this, it is amazing!")
+    db.add(post)
+    db.commit()
+    return post
+
+
+def test_jobs_upsert_sentiments(db, post):
+    """Draining scores posts and comments and re-scores on edit"""
+    comment = Comment(post_id=post.id, user_id=post.user_id, content="terrible, awful, bad")
+    db.add(comment)
+    db.flush()
+    sentiment_jobs.enqueue_sentiment(db=db, post_id=post.id)
+    sentiment_jobs.enqueue_sentiment(db=db, comment_id=comment.id)
+    db.commit()
+
+    assert sentiment_jobs.queue_metrics(db)["pending"] == 2
+    assert sentiment_jobs.drain_sentiment_jobs(db) == 2
+
+    labels = {(s.target_type, s.label) for s in db.query(Sentiment)}
+    assert labels == {("post", "positive"), ("comment", "negative")}
+
+    post.content = "I hate this, worst ever"
+    sentiment_jobs.enqueue_sentiment(db=db, post_id=post.id)
+    db.commit()
+    sentiment_jobs.drain_sentiment_jobs(db)
+
+    post_sentiments = db.query(Sentiment).filter(Sentiment.post_id == post.id).all()
+    assert [s.label for s in post_sentiments] == ["negative"]
+
+    metrics = sentiment_jobs.queue_metrics(db)
+    assert metrics["pending"] == 0
+    assert metrics["done"] == 3
+    assert metrics["lag_seconds"] == 0.0
+
+
+def test_failed_jobs_retry_then_fail(db, post, monkeypatch):
+    """Scoring errors requeue the batch until attempts run out"""
+    def broken(db, texts):
+        raise RuntimeError("model unavailable")
+
+    monkeypatch.setattr(sentiment_jobs, "analyze_texts", broken)
+    monkeypatch.setattr(settings, "SENTIMENT_JOB_MAX_ATTEMPTS", 2)
+
+    sentiment_jobs.enqueue_sentiment(db=db, post_id=post.id)
+    db.commit()
+
+    assert sentiment_jobs.process_batch(db) == 0
+    assert db.query(Job).one().status == "pending"
+
+    sentiment_jobs.process_batch(db)
+    job = db.query(Job).one()
+    assert job.status == "failed"
+    assert job.attempts == 2
+    assert "model unavailable" in job.last_error
+    assert db.query(Sentiment).count() == 0
+
+
+def test_timed_out_jobs_fail_after_max_attempts(db, post, monkeypatch):
+    """A job whose worker keeps dying is not reclaimed forever"""
+    monkeypatch.setattr(settings, "SENTIMENT_JOB_MAX_ATTEMPTS", 2)
+    long_ago = sentiment_jobs._utcnow() - timedelta(
+        seconds=settings.SENTIMENT_JOB_TIMEOUT_SECONDS + 1
+    )
+
+    for attempts in (1, 2):
+        db.add(Job(
+            job_type=sentiment_jobs.JOB_TYPE, target_type="post", post_id=post.id,
+            status="processing", started_at=long_ago, attempts=attempts
+        ))
+    db.commit()
+
+    claimed = sentiment_jobs.claim_jobs(db, 10)
+
+    assert [job.attempts for job in claimed] == [2]
+    exhausted = db.query(Job).filter(Job.status == "failed").one()
+    assert exhausted.attempts == 2
+    assert exhausted.last_error == "timed out"
+
+
+def test_edited_post_reports_pending_until_rescored():
+    client = TestClient(app)
+    name = f"sj{uuid.uuid4().hex[:10]}"
+    response = client.post(
+        "/api/v1/auth/signup",
+        json={"username": name, "email": f"{name}@example.com", "password": "TestPass123!"}
+    )
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    def drain():
+        session = SessionLocal()
+        try:
+            sentiment_jobs.drain_sentiment_jobs(session)
+        finally:
+            session.close()
+
+    post = client.post(
+        "/api/v1/posts", json={"content": f"I love this, it is amazing! #{name}"}, headers=headers
+    ).json()
+    drain()
+    post = client.get(f"/api/v1/posts/{post['id']}", headers=headers).json()
+    assert (post["sentiment_status"], post["sentiment"]["label"]) == ("ready", "positive")
+
+    edited = client.put(
+        f"/api/v1/posts/{post['id']}", json={"content": f"I hate this, worst ever #{name}"}, headers=headers
+    ).json()
+    assert edited["sentiment_status"] == "pending"
+
+    drain()
+    post = client.get(f"/api/v1/posts/{post['id']}", headers=headers).json()
+    assert (post["sentiment_status"], post["sentiment"]["label"]) == ("ready", "negative")
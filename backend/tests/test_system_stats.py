@@ -0,0 +1,91 @@
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models import User, Post, Sentiment, StatsSnapshot, ModerationFlag
+from app.services import system_stats as stats_service
+from app.services.rollups import record_post
+
+engine = create_engine(
+    "sqlite://",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+def add_post(db, user, label):
+    post = Post(user_id=user.id, content=label)
+    db.add(post)
+    db.flush()
+    record_post(db=db, user_id=user.id)
+    db.add(Sentiment(post_id=post.id, label=label, score=0.5, target_type="post"))
+    if label == "negative":
+        db.add(ModerationFlag(
+            target_type="post", target_id=post.id, post_id=post.id, author_id=user.id,
+            sentiment_label=label, toxicity="medium", toxicity_score=0.5
+        ))
+    db.commit()
+
+
+def count_statements(db, func):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        result = func()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return result, statements
+
+
+def test_snapshot_served_until_stale(db):
+    user = User(username="writer", email="writer@example.com", password_hash="x")
+    banned = User(username="banned", email="banned@example.com", password_hash="x", is_active=False)
+    db.add_all([user, banned])
+    db.commit()
+    add_post(db, user, "negative")
+
+    first = stats_service.system_stats(db)
+    assert first["total_users"] == 2
+    assert first["total_posts"] == 1
+    assert first["flagged_content_count"] == 1
+    assert first["suspended_users_count"] == 1
+    assert first["active_users_today"] == 1
+    assert first["posts_today"] == 1
+
+    add_post(db, user, "positive")
+
+    # Fresh snapshot: totals are read back, not recounted
+    cached, statements = count_statements(db, lambda: stats_service.system_stats(db))
+    assert cached["total_posts"] == 1
+    assert cached["posts_today"] == 2
+    assert not any("count(" in s.lower() for s in statements)
+
+    assert stats_service.system_stats(db, exact=True)["total_posts"] == 2
+
+    # A snapshot older than the bound is recounted on read
+    add_post(db, user, "neutral")
+    db.query(StatsSnapshot).update({
+        StatsSnapshot.refreshed_at: stats_service._utcnow() - timedelta(hours=1)
+    })
+    db.commit()
+    assert stats_service.system_stats(db)["total_posts"] == 3
@@ -0,0 +1,181 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.config import settings
+from app.database import Base
+from app.models import User, Profile, Post, Follow
+from app.services import timeline
+
+engine = create_engine(
+    "sqlite://",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+START = datetime(2026, 1, 1, 12, 0, 0, 500000)
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(timeline, "SessionLocal", TestingSessionLocal)
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+def make_user(db, name):
+    user = User(username=name, email=f"{name}@example.com", password_hash="x")
+    db.add(user)
+    db.flush()
+    db.add(Profile(user_id=user.id, followers_count=0, following_count=0))
+    db.commit()
+    return user
+
+
+def follow(db, follower, following):
+    db.add(Follow(follower_id=follower.id, following_id=following.id))
+    timeline.adjust_follow_counts(
+        db=db, follower_id=follower.id, following_id=following.id, delta=1
+    )
+    db.commit()
+
+
+def publish(db, author, minutes):
+    post = Post(user_id=author.id, content="post", created_at=START + timedelta(minutes=minutes))
+    db.add(post)
+    db.commit()
+    timeline.fan_out_post(post.id)
+    return post
+
+
+def read_all(db, user, page_size=2):
+    seen, cursor = [], None
+    while True:
+        posts, cursor = timeline.read_timeline(db, user.id, cursor, page_size)
+        seen += [p.id for p in posts]
+        if cursor is None:
+            return seen
+
+
+def test_fan_out_and_unfollow(db):
+    """Posts reach followers' timelines and leave them on unfollow"""
+    reader = make_user(db, "reader")
+    author = make_user(db, "author")
+    follow(db, reader, author)
+
+    posts = [publish(db, author, m) for m in range(5)]
+    own = publish(db, reader, 10)
+
+    assert read_all(db, reader) == [own.id] + [p.id for p in reversed(posts)]
+
+    timeline.remove_author(db=db, user_id=reader.id, author_id=author.id)
+    db.commit()
+    assert read_all(db, reader) == [own.id]
+
+
+def test_backfill_on_follow(db):
+    """Following someone copies their recent posts in"""
+    reader = make_user(db, "reader")
+    author = make_user(db, "author")
+    timeline.read_timeline(db, reader.id, None, 10)
+
+    posts = [publish(db, author, m) for m in range(3)]
+    assert read_all(db, reader) == []
+
+    follow(db, reader, author)
+    timeline.backfill_follow(reader.id, author.id)
+    assert read_all(db, reader) == [p.id for p in reversed(posts)]
+
+
+def test_fan_out_before_first_read_keeps_history(db):
+    """Fan-out and follows before the first read don't skip the backfill"""
+    reader = make_user(db, "reader")
+    first = make_user(db, "first")
+    second = make_user(db, "second")
+
+    own = publish(db, reader, 0)
+    history = [publish(db, first, m) for m in (1, 2, 3)]
+    follow(db, reader, first)  # e.g. from before timelines were materialized
+    follow(db, reader, second)
+    timeline.backfill_follow(reader.id, second.id)
+    latest = publish(db, second, 4)
+
+    assert read_all(db, reader) == [latest.id] + [p.id for p in reversed(history)] + [own.id]
+
+
+def test_high_follower_merged_at_read(db, monkeypatch):
+    """Authors above the fan-out limit are merged in at read time"""
+    monkeypatch.setattr(settings, "FEED_FANOUT_MAX_FOLLOWERS", 1)
+    reader = make_user(db, "reader")
+    other = make_user(db, "other")
+    celebrity = make_user(db, "celebrity")
+    author = make_user(db, "author")
+    follow(db, reader, author)
+
+    early = publish(db, celebrity, 0)
+    follow(db, reader, celebrity)
+    follow(db, other, celebrity)
+
+    interleaved = []
+    for m in range(1, 7):
+        interleaved.append(publish(db, celebrity if m % 2 else author, m))
+
+    db.expire_all()
+    assert timeline.is_high_follower(db, celebrity.id)
+    expected = [p.id for p in reversed(interleaved)] + [early.id]
+    assert read_all(db, reader) == expected
+
+
+def test_first_read_builds_timeline(db, monkeypatch):
+    """A reader without a timeline gets the latest posts of each author"""
+    monkeypatch.setattr(settings, "FEED_FANOUT_MAX_FOLLOWERS", 1)
+    monkeypatch.setattr(settings, "FEED_BACKFILL_POSTS", 2)
+    reader = make_user(db, "reader")
+    other = make_user(db, "other")
+    author = make_user(db, "author")
+    celebrity = make_user(db, "celebrity")
+    follow(db, reader, author)
+    follow(db, reader, celebrity)
+    follow(db, other, celebrity)
+
+    def post(user, minutes):
+        row = Post(user_id=user.id, content="post", created_at=START + timedelta(minutes=minutes))
+        db.add(row)
+        db.commit()
+        return row.id
+
+    own = [post(reader, m) for m in (0, 5, 9)]
+    followed = [post(author, m) for m in (1, 2, 3)]
+    merged = [post(celebrity, m) for m in (4, 6, 7)]
+    post(other, 8)
+
+    reader_id = reader.id
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        timeline._build_feed(db, reader_id)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    # One posts query and one profiles query, however many authors
+    assert sum("FROM posts" in s for s in statements) == 1
+    assert sum("FROM profiles" in s for s in statements) == 1
+
+    # Two latest posts per fanned-out author; celebrity posts are merged
+    # at read time instead of copied
+    assert read_all(db, reader) == [
+        own[2], merged[2], merged[1], own[1], merged[0], followed[2], followed[1]
+    ]
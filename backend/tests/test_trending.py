@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Post, TrendingPost, User
+from app.services import trending
+
+
+@pytest.fixture
+def engine(tmp_path):
+    # A file database so a second connection can write mid-refresh
+    engine = create_engine(f"sqlite:///{tmp_path / 'trending.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def add_post(db, score, hours_ago=0.0, visibility="public") -> Post:
+    if not db.query(User).first():
+        db.add(User(username="author", email="author@example.com", password_hash="x"))
+        db.flush()
+
+    post = Post(user_id=db.query(User).first().id, content="hello", visibility=visibility)
+    db.add(post)
+    db.flush()
+    db.add(TrendingPost(
+        post_id=post.id,
+        score=score,
+        scored_at=datetime.now(timezone.utc) - timedelta(hours=hours_ago)
+    ))
+    db.commit()
+    return post
+
+
+def entry(db, post) -> TrendingPost:
+    db.expire_all()
+    return db.query(TrendingPost).filter(TrendingPost.post_id == post.id).one_or_none()
+
+
+def test_refresh_decays_and_drops_faded_posts(db):
+    half_life = trending.settings.TRENDING_HALF_LIFE_HOURS
+    hot = add_post(db, 8.0, hours_ago=2 * half_life)
+    faded = add_post(db, 0.1, hours_ago=4 * half_life)
+
+    trending.refresh_trending(db)
+
+    assert entry(db, hot).score == pytest.approx(2.0, rel=1e-3)
+    assert entry(db, faded) is None
+
+
+def test_refresh_ranks_public_posts_by_score(db):
+    low = add_post(db, 3.0)
+    high = add_post(db, 9.0)
+    private = add_post(db, 20.0, visibility="private")
+    middle = add_post(db, 5.0)
+
+    assert trending.refresh_trending(db) == 3
+
+    assert [entry(db, p).rank for p in (high, middle, low)] == [1, 2, 3]
+    assert entry(db, private).rank is None
+    assert entry(db, private).score == pytest.approx(20.0, rel=1e-3)
+
+
+def test_engagement_during_refresh_is_kept(engine, db):
+    post = add_post(db, 4.0, hours_ago=trending.settings.TRENDING_HALF_LIFE_HOURS)
+    other = sessionmaker(bind=engine)()
+
+    def engage(conn, cursor, statement, parameters, context, executemany):
+        # Another request commits a comment just as the decay runs
+        if statement.startswith("UPDATE trending_posts SET score") and not engaged:
+            engaged.append(True)
+            trending.record_engagement(db=other, post_id=post.id, weight=trending.COMMENT_WEIGHT)
+            other.commit()
+
+    engaged = []
+    event.listen(engine, "before_cursor_execute", engage)
+    try:
+        trending.refresh_trending(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", engage)
+        other.close()
+
+    assert engaged
+    assert entry(db, post).score == pytest.approx(2.0 + trending.COMMENT_WEIGHT, rel=1e-3)
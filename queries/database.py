@@ -10,9 +10,13 @@ DB_HOST = os.getenv("DB_HOST", "localhost")
 DB_PORT = os.getenv("DB_PORT", "3202")
 DB_NAME = os.getenv("DB_NAME", "sentiment")
 
+# The dashboard only reads: point it at a replica when one is available
+DB_READ_HOST = os.getenv("DB_READ_HOST", DB_HOST)
+DB_READ_PORT = os.getenv("DB_READ_PORT", DB_PORT)
+
 DATABASE_URL = (
     f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}"
-    f"@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+    f"@{DB_READ_HOST}:{DB_READ_PORT}/{DB_NAME}"
 )
 
 engine = create_engine(